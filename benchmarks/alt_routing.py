@@ -0,0 +1,83 @@
+"""
+NEXUS CORE - ALT routing benchmark
+
+Compares point-to-point queries on a CSRMesh:
+- dijkstra: CSRMesh.search, unidirectional with target early exit
+- alt     : CSRMesh.search_alt, bidirectional A* on landmark bounds
+
+Reports landmark preprocessing time and table size, then mean settled
+nodes and median latency per query on the same random pairs. Every ALT
+distance is checked against Dijkstra.
+
+Usage:
+    python benchmarks/alt_routing.py [SIZES] [AVG_DEGREE] [QUERIES] [LANDMARKS]
+    python benchmarks/alt_routing.py 10000,100000 4 200 8
+"""
+
+import os
+import sys
+import time
+import logging
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np  # noqa: E402
+
+from nexus_mesh import CSRMesh, Landmarks  # noqa: E402
+
+
+def query(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(x) for x in (sys.argv[1] if len(sys.argv) > 1 else "10000,100000").split(",")]
+    degree = float(sys.argv[2]) if len(sys.argv) > 2 else 4.0
+    queries = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    k = int(sys.argv[4]) if len(sys.argv) > 4 else 8
+
+    logging.disable(logging.WARNING)
+
+    print(f"{'nodes':>10} | {'prep s':>7} | {'table MB':>8} | {'settled dij':>11} | "
+          f"{'settled alt':>11} | {'dij ms':>8} | {'alt ms':>8} | {'speed-up':>8}")
+    print("-" * 94)
+
+    for n in sizes:
+        mesh = CSRMesh.generate(n, degree / max(1, n - 1))
+        prep, landmarks = query(lambda: Landmarks.build(mesh, k))
+
+        rng = np.random.default_rng(7)
+        pairs = rng.integers(0, n, size=(queries, 2)).tolist()
+        mesh.adjacency("cost")   # build the list view outside the timers
+
+        dij_time, alt_time, dij_settled, alt_settled = [], [], [], []
+        for s, t in pairs:
+            elapsed, (dist, _) = query(lambda: mesh.search(s, t, "cost"))
+            dij_time.append(elapsed)
+            dij_settled.append(len(dist))
+
+            mesh.landmarks = landmarks
+            stats = {}
+            elapsed, (total, _, _) = query(lambda: mesh.search_alt(s, t, "cost", stats))
+            mesh.landmarks = None
+            alt_time.append(elapsed)
+            alt_settled.append(stats.get("settled", 0))
+
+            expected = dist.get(t, float("inf"))
+            if not np.isclose(total, expected, rtol=1e-9) and total != expected:
+                raise SystemExit(f"ALT mismatch {s}->{t}: {total} != {expected}")
+
+        dij_ms = statistics.median(dij_time) * 1e3
+        alt_ms = statistics.median(alt_time) * 1e3
+        print(f"{n:>10,} | {prep:>7.2f} | {landmarks.nbytes / 2**20:>8.2f} | "
+              f"{statistics.mean(dij_settled):>11,.0f} | {statistics.mean(alt_settled):>11,.0f} | "
+              f"{dij_ms:>8.3f} | {alt_ms:>8.3f} | {dij_ms / alt_ms:>7.1f}x")
+
+    print(f"{k} landmarks (farthest-point), {queries} random pairs; latency = median per query")
+
+
+if __name__ == "__main__":
+    main()
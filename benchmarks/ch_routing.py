@@ -0,0 +1,118 @@
+"""
+NEXUS CORE - Contraction hierarchy benchmark
+
+Builds a ContractionHierarchy on ``cost`` for each mesh size and reports:
+- preprocessing time, shortcut count and on-disk index size
+- memory-mapped attach time of the saved index
+- median query latency against CSRMesh Dijkstra and nx.shortest_path
+  (bidirectional Dijkstra; the SovereignMesh path the index replaces)
+
+Every CH path is checked against nx.shortest_path. Topologies:
+- gnp : the engines' G(n, p) meshes at AVG_DEGREE. Random graphs have
+        no hierarchy: the contracted top turns into a dense core and
+        bidirectional Dijkstra stays ahead
+- grid: road-like 2D lattice with the same edge attribute ranges
+
+Usage:
+    python benchmarks/ch_routing.py [TOPOLOGY] [SIZES] [QUERIES] [AVG_DEGREE]
+    python benchmarks/ch_routing.py grid 2500,10000 200
+    python benchmarks/ch_routing.py gnp 500,1000 200 4
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np  # noqa: E402
+import networkx as nx  # noqa: E402
+
+from nexus_ch import ContractionHierarchy  # noqa: E402
+from nexus_mesh import MESH_CONFIG, CSRMesh, draw_edge_attributes  # noqa: E402
+
+
+def grid_mesh(n: int, seed: int = MESH_CONFIG["SEED"]) -> CSRMesh:
+    side = max(2, int(round(n ** 0.5)))
+    ids = np.arange(side * side).reshape(side, side)
+    u = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    v = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    distance, risk = draw_edge_attributes(
+        len(u), np.random.default_rng(seed), MESH_CONFIG["DISTANCE_RANGE"], MESH_CONFIG["RISK_RANGE"]
+    )
+    return CSRMesh(side * side, u, v, distance, risk)
+
+
+def nx_route(G, source, target):
+    try:
+        return nx.shortest_path(G, source, target, weight="cost")
+    except nx.NetworkXNoPath:
+        return None
+
+
+def median_ms(fn, pairs):
+    samples = []
+    for s, t in pairs:
+        start = time.perf_counter()
+        fn(s, t)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def main():
+    topology = sys.argv[1] if len(sys.argv) > 1 else "grid"
+    sizes = [int(x) for x in (sys.argv[2] if len(sys.argv) > 2 else "2500,10000").split(",")]
+    queries = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    degree = float(sys.argv[4]) if len(sys.argv) > 4 else 4.0
+
+    logging.disable(logging.WARNING)
+    tmp = tempfile.mkdtemp(prefix="nexus-ch-")
+
+    print(f"{'nodes':>8} | {'prep s':>7} | {'shortcuts':>9} | {'index MB':>8} | {'attach ms':>9} | "
+          f"{'ch ms':>7} | {'dijkstra ms':>11} | {'nx ms':>7} | {'vs nx':>7}")
+    print("-" * 100)
+
+    try:
+        for n in sizes:
+            mesh = grid_mesh(n) if topology == "grid" else CSRMesh.generate(n, degree / max(1, n - 1))
+            n = mesh.number_of_nodes()
+
+            start = time.perf_counter()
+            built = ContractionHierarchy.from_mesh(mesh, "cost")
+            prep = time.perf_counter() - start
+
+            path = os.path.join(tmp, f"ch-{n}")
+            built.save(path)
+            start = time.perf_counter()
+            ch = ContractionHierarchy.load(path)
+            attach = time.perf_counter() - start
+
+            G = mesh.to_networkx()
+            names = mesh.cities
+            pairs = np.random.default_rng(7).integers(0, n, size=(queries, 2)).tolist()
+            for s, t in pairs:
+                _, nodes, _ = ch.query(s, t)
+                expected = nx_route(G, names[s], names[t])
+                if (nodes and [names[i] for i in nodes]) != expected:
+                    raise SystemExit(f"CH path mismatch {s}->{t}")
+
+            mesh.adjacency("cost")   # build the list view outside the timers
+            ch_ms = median_ms(ch.query, pairs)
+            dij_ms = median_ms(lambda s, t: mesh.search(s, t, "cost"), pairs)
+            nx_ms = median_ms(lambda s, t: nx_route(G, names[s], names[t]), pairs)
+
+            print(f"{n:>8,} | {prep:>7.2f} | {built.shortcuts:>9,} | {built.nbytes / 2**20:>8.2f} | "
+                  f"{attach * 1e3:>9.2f} | {ch_ms:>7.3f} | {dij_ms:>11.3f} | {nx_ms:>7.3f} | "
+                  f"{nx_ms / ch_ms:>6.1f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"{topology}, {queries} random pairs; latency = median per query")
+
+
+if __name__ == "__main__":
+    main()
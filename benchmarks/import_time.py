@@ -0,0 +1,110 @@
+"""
+NEXUS CORE - Cold-start benchmark
+
+Times fresh interpreter runs of routing-only invocations and lists which
+heavy dependencies each one pulled in:
+
+- day2_route : import Day 2, build a small CSR mesh, route one pair
+- day4_worker: import the Day 4 worker entry point, route one chunk
+
+With REV (any git revision) the same scenarios also run against that
+revision's ``src/`` for a before/after comparison.
+
+Usage:
+    python benchmarks/import_time.py [REPEAT] [REV]
+    python benchmarks/import_time.py 10 HEAD~1
+"""
+
+import os
+import sys
+import json
+import shutil
+import tarfile
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+HEAVY = ("matplotlib", "pandas", "networkx", "langgraph", "aiohttp")
+
+SCENARIOS = {
+    "day2_route": (
+        "from nexus_mesh import CSRMesh\n"
+        "from day2_nexus_core import SwarmRouter\n"
+        "SwarmRouter(CSRMesh.generate(200, 0.03)).route('City-1', 'City-2')\n"
+    ),
+    "day4_worker": (
+        "import numpy as np\n"
+        "from parallel_engine_day4 import init_worker, route_decision_chunk\n"
+        "init_worker(200, 0.03, 42)\n"
+        "route_decision_chunk(np.array([[0, 1]]), np.array([0.1]))\n"
+    ),
+}
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "{body}"
+    "elapsed = time.perf_counter() - start\n"
+    "import json\n"
+    "print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))\n"
+)
+
+
+def cold_start(src: str, body: str, repeat: int):
+    """Median in-process time of ``body`` over fresh interpreters."""
+    code = PROBE.format(body=body, heavy=HEAVY)
+    env = dict(os.environ, PYTHONPATH=src, PYTHONDONTWRITEBYTECODE="1",
+               NEXUS_PERCEPTION_BACKEND="stub", MPLBACKEND="Agg")
+    samples, loaded = [], []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", code], env=env, cwd=src,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(out)
+        samples.append(result["seconds"])
+        loaded = result["loaded"]
+    return statistics.median(samples), loaded
+
+
+def export_revision(rev: str) -> str:
+    """Extract ``src/`` at ``rev`` into a temporary directory."""
+    tmp = tempfile.mkdtemp(prefix="nexus-rev-")
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", rev, "src"],
+        cwd=ROOT, capture_output=True, check=True,
+    ).stdout
+    path = os.path.join(tmp, "src.tar")
+    with open(path, "wb") as fh:
+        fh.write(archive)
+    with tarfile.open(path) as tar:
+        tar.extractall(tmp)
+    return tmp
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rev = sys.argv[2] if len(sys.argv) > 2 else None
+
+    trees = [("working tree", os.path.join(ROOT, "src"))]
+    tmp = None
+    if rev:
+        tmp = export_revision(rev)
+        trees.insert(0, (rev, os.path.join(tmp, "src")))
+
+    try:
+        print(f"{'scenario':<12} | {'tree':<14} | {'cold start':>10} | heavy modules loaded")
+        print("-" * 78)
+        for name, body in SCENARIOS.items():
+            for label, src in trees:
+                seconds, loaded = cold_start(src, body, repeat)
+                print(f"{name:<12} | {label:<14} | {seconds * 1e3:>8.0f}ms | {', '.join(loaded) or '-'}")
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
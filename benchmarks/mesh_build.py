@@ -0,0 +1,86 @@
+"""
+NEXUS CORE - Day 2 mesh build benchmark
+
+Compares mesh construction time of:
+- legacy : the original per-edge networkx pipeline (randint/uniform per
+           edge, list(component) healing)
+- networkx: SovereignMesh with vectorized edges, union-find healing and
+            batched attribute draws
+- csr    : array-backed CSRMesh
+
+Average degree is held fixed so every size is feasible.
+
+Usage:
+    python benchmarks/mesh_build.py [SIZES] [AVG_DEGREE] [LEGACY_MAX]
+    python benchmarks/mesh_build.py 1000,100000,1000000 4 100000
+"""
+
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np  # noqa: E402
+import networkx as nx  # noqa: E402
+
+from day2_nexus_core import SovereignMesh  # noqa: E402
+from nexus_mesh import CSRMesh  # noqa: E402
+
+
+def legacy_build(n: int, p: float) -> nx.Graph:
+    """Verbatim port of the pre-vectorization SovereignMesh pipeline."""
+    cities = [f"City-{i}" for i in range(1, n + 1)]
+    G = nx.fast_gnp_random_graph(n, p)
+    G = nx.relabel_nodes(G, {i: cities[i] for i in range(n)})
+
+    if not nx.is_connected(G):
+        components = list(nx.connected_components(G))
+        for i in range(len(components) - 1):
+            u = list(components[i])[0]
+            v = list(components[i + 1])[0]
+            G.add_edge(u, v)
+
+    for u, v in G.edges():
+        distance = np.random.randint(50, 500)
+        risk = np.random.uniform(0.05, 0.5)
+        G[u][v]["distance"] = distance
+        G[u][v]["cost"] = distance * (1 + risk)
+    return G
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(x) for x in (sys.argv[1] if len(sys.argv) > 1 else "1000,100000,1000000").split(",")]
+    degree = float(sys.argv[2]) if len(sys.argv) > 2 else 4.0
+    legacy_max = int(sys.argv[3]) if len(sys.argv) > 3 else 100_000
+
+    logging.disable(logging.WARNING)
+
+    print(f"{'nodes':>10} | {'legacy s':>10} | {'networkx s':>10} | {'csr s':>10} | {'speed-up':>8}")
+    print("-" * 62)
+
+    for n in sizes:
+        p = degree / max(1, n - 1)
+        vector = timed(lambda: SovereignMesh(node_count=n, edge_probability=p))
+        csr = timed(lambda: CSRMesh.generate(n, p))
+
+        if n <= legacy_max:
+            legacy = timed(lambda: legacy_build(n, p))
+            legacy_col, speedup_col = f"{legacy:>10.3f}", f"{legacy / vector:>7.1f}x"
+        else:
+            legacy_col, speedup_col = f"{'skipped':>10}", f"{'-':>8}"
+
+        print(f"{n:>10,} | {legacy_col} | {vector:>10.3f} | {csr:>10.3f} | {speedup_col}")
+
+    print("speed-up = legacy / vectorized networkx pipeline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+NEXUS CORE - Routing service micro-batching benchmark
+
+Drives a RoutingService over the Day 2 SwarmRouter (CSR mesh, average
+degree 4) with CONCURRENCY
+callers, each issuing REQUESTS routes back to back, and compares one
+dispatch per request (max_batch=1) against micro-batching. Sources are
+drawn from DEPOTS nodes, the fleet pattern route_batch groups by.
+
+Reports throughput, p50/p99 caller latency and the mean batch size.
+TRANSPORT ``socket`` sends every request through the Unix socket API.
+
+Usage:
+    python benchmarks/service_batching.py [NODES] [CONCURRENCY] [REQUESTS] [DEPOTS] [TRANSPORT]
+    python benchmarks/service_batching.py 5000 256 20 64 inproc
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np  # noqa: E402
+
+from day2_nexus_core import SwarmRouter  # noqa: E402
+from nexus_mesh import CSRMesh  # noqa: E402
+from nexus_service import RouterBackend, RoutingService, ServiceClient  # noqa: E402
+
+
+async def drive(service, transport, workload):
+    latencies = []
+    client = None
+    if transport == "socket":
+        address = os.path.join(tempfile.mkdtemp(prefix="nexus-svc-"), "router.sock")
+        await service.serve(address)
+        client = await ServiceClient.connect(address)
+    route = client.route if client else service.route
+
+    async def caller(pairs):
+        for s, t in pairs:
+            start = time.perf_counter()
+            await route(s, t)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(pairs) for pairs in workload))
+    elapsed = time.perf_counter() - start
+    if client:
+        await client.close()
+    return elapsed, np.array(latencies) * 1e3
+
+
+async def run(mesh, label, max_batch, max_wait_ms, transport, workload):
+    backend = RouterBackend(SwarmRouter(mesh))
+    # Warm the per-source trees, so runs compare dispatch rather than builds
+    backend.router.route_batch([pairs[0] for pairs in workload])
+    async with RoutingService(backend, max_batch=max_batch, max_wait_ms=max_wait_ms) as service:
+        elapsed, ms = await drive(service, transport, workload)
+        stats = service.stats
+    total = len(ms)
+    print(f"{label:>14} | {total / elapsed:>9,.0f} | {np.percentile(ms, 50):>7.2f} | "
+          f"{np.percentile(ms, 99):>7.2f} | {stats['requests'] / stats['batches']:>10.1f}")
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    depots = int(sys.argv[4]) if len(sys.argv) > 4 else 64
+    transport = sys.argv[5] if len(sys.argv) > 5 else "inproc"
+
+    logging.disable(logging.WARNING)
+    mesh = CSRMesh.generate(nodes, 4.0 / max(1, nodes - 1))
+    names = mesh.cities
+    n = mesh.number_of_nodes()
+
+    rnd = random.Random(7)
+    sources = [names[i] for i in rnd.sample(range(n), min(depots, n))]
+    workload = [[(rnd.choice(sources), names[rnd.randrange(n)]) for _ in range(requests)]
+                for _ in range(concurrency)]
+
+    print(f"{'mode':>14} | {'req/s':>9} | {'p50 ms':>7} | {'p99 ms':>7} | {'mean batch':>10}")
+    print("-" * 60)
+    for label, max_batch, max_wait_ms in (
+        ("unbatched", 1, 0.0),
+        ("batch 64/1ms", 64, 1.0),
+        ("batch 256/2ms", 256, 2.0),
+    ):
+        asyncio.run(run(mesh, label, max_batch, max_wait_ms, transport, workload))
+
+    print(f"{n:,} nodes, {concurrency} callers x {requests} requests, {depots} depots, {transport}")
+
+
+if __name__ == "__main__":
+    main()
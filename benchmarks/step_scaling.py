@@ -0,0 +1,57 @@
+"""
+NEXUS CORE - Day 1 step scaling benchmark
+
+Measures movement-step throughput of ``SimulationEngine`` across
+1..N shared-memory workers and reports speed-up and parallel efficiency
+relative to the single-worker run.
+
+Usage:
+    python benchmarks/step_scaling.py [NODES] [MAX_WORKERS] [STEPS]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from day1 import SimulationEngine, SovereignPerception  # noqa: E402
+
+
+def bench_step(nodes: int, workers: int, steps: int, seed: int = 42) -> float:
+    """Return node-updates per second for ``steps`` headless steps."""
+    perception = SovereignPerception()
+    perception.initialize_nodes(nodes, seed=seed)
+    engine = SimulationEngine(perception, seed=seed, headless=True, workers=workers)
+
+    try:
+        # Warm-up step spawns the pool and attaches shared memory.
+        engine.step()
+        start = time.perf_counter()
+        for _ in range(steps):
+            engine.step()
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.close()
+
+    return nodes * steps / elapsed
+
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    steps = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    print(f"{'workers':>8} | {'nodes/sec':>14} | {'speed-up':>8} | {'efficiency':>10}")
+    print("-" * 50)
+
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        rate = bench_step(nodes, workers, steps)
+        baseline = baseline or rate
+        speedup = rate / baseline
+        print(f"{workers:>8} | {rate:>14,.0f} | {speedup:>7.2f}x | {speedup / workers:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
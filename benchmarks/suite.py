@@ -0,0 +1,327 @@
+"""
+NEXUS CORE - Reproducible benchmark suite
+
+Times each engine hot path in isolation, with fixed seeds and the
+perception layer stubbed (no network):
+
+- movement_step    : Day 1 headless movement step (nodes/sec)
+- mesh_build_nx    : Day 2 SovereignMesh construction (s)
+- mesh_build_csr   : CSRMesh.generate (s)
+- route_single     : Day 2 SwarmRouter.route, cold cache (routes/sec)
+- route_batch      : Day 2 SwarmRouter.route_batch (routes/sec)
+- weight_evolution : Day 3 evolve_weights_batch (decisions/sec)
+- parallel_decisions: Day 4 chunk scheduler on a warm pool (decisions/sec);
+                      pool startup and perception are outside the timer
+
+Each benchmark is repeated and the median is reported. Results are
+written as JSON; ``compare`` flags regressions between two result files.
+
+Usage:
+    python benchmarks/suite.py run [--nodes N] [--edge-probability P]
+        [--batch-size B] [--workers W] [--step-nodes S] [--repeat R]
+        [--only NAME,...] [--output results.json]
+    python benchmarks/suite.py compare BASE.json NEW.json [--threshold 0.10]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Stub perception and plotting before any engine module is imported.
+os.environ.setdefault("NEXUS_PERCEPTION_BACKEND", "stub")
+os.environ.setdefault("NEXUS_HEADLESS", "1")
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np  # noqa: E402
+
+
+DEFAULTS = {
+    "nodes": 5_000,
+    "edge_probability": 0.0016,
+    "batch_size": 2_000,
+    "workers": 4,
+    "step_nodes": 1_000_000,
+    "repeat": 3,
+    "seed": 42,
+}
+
+BENCHMARKS = {}
+
+
+def benchmark(name, unit, higher_is_better=True):
+    """Register ``fn(params) -> float`` as one timed sample."""
+
+    def register(fn):
+        BENCHMARKS[name] = {"fn": fn, "unit": unit, "higher_is_better": higher_is_better}
+        return fn
+
+    return register
+
+
+def random_pairs(n, nodes, seed):
+    rng = np.random.default_rng(seed)
+    source = rng.integers(0, nodes, size=n)
+    # Never route a node to itself
+    target = (source + rng.integers(1, nodes, size=n)) % nodes
+    return np.stack([source, target], axis=1)
+
+
+# =========================
+# BENCHMARKS
+# =========================
+
+@benchmark("movement_step", "nodes/s")
+def bench_movement_step(params):
+    from day1 import SimulationEngine, SovereignPerception
+
+    perception = SovereignPerception()
+    perception.initialize_nodes(params["step_nodes"], seed=params["seed"])
+    engine = SimulationEngine(perception, seed=params["seed"], headless=True,
+                              workers=params["workers"])
+    try:
+        # Warm-up step spawns the pool and attaches shared memory.
+        engine.step()
+        start = time.perf_counter()
+        engine.step()
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.close()
+    return params["step_nodes"] / elapsed
+
+
+@benchmark("mesh_build_nx", "s", higher_is_better=False)
+def bench_mesh_build_nx(params):
+    from day2_nexus_core import SovereignMesh
+
+    start = time.perf_counter()
+    SovereignMesh(params["nodes"], params["edge_probability"], seed=params["seed"])
+    return time.perf_counter() - start
+
+
+@benchmark("mesh_build_csr", "s", higher_is_better=False)
+def bench_mesh_build_csr(params):
+    from nexus_mesh import CSRMesh
+
+    start = time.perf_counter()
+    CSRMesh.generate(params["nodes"], params["edge_probability"], seed=params["seed"])
+    return time.perf_counter() - start
+
+
+def _day2_router(params):
+    from day2_nexus_core import SwarmRouter
+    from nexus_mesh import CSRMesh
+
+    mesh = CSRMesh.generate(params["nodes"], params["edge_probability"], seed=params["seed"])
+    pairs = [
+        (mesh.cities[s], mesh.cities[t])
+        for s, t in random_pairs(params["batch_size"], params["nodes"], params["seed"])
+    ]
+    return SwarmRouter(mesh), pairs
+
+
+@benchmark("route_single", "routes/s")
+def bench_route_single(params):
+    router, pairs = _day2_router(params)
+    # Single queries are slow; a slice of the batch keeps runs short.
+    pairs = pairs[:max(1, min(len(pairs), 200))]
+
+    start = time.perf_counter()
+    for source, target in pairs:
+        router.route(source, target)
+    return len(pairs) / (time.perf_counter() - start)
+
+
+@benchmark("route_batch", "routes/s")
+def bench_route_batch(params):
+    router, pairs = _day2_router(params)
+
+    start = time.perf_counter()
+    router.route_batch(pairs)
+    return len(pairs) / (time.perf_counter() - start)
+
+
+@benchmark("weight_evolution", "decisions/s")
+def bench_weight_evolution(params):
+    from day_3 import SovereignAdaptiveRouter
+
+    rng = np.random.default_rng(params["seed"])
+    n = params["batch_size"]
+    cost = rng.uniform(100, 1500, size=n)
+    risk = rng.uniform(0.1, 3.0, size=n)
+    router = SovereignAdaptiveRouter()
+
+    start = time.perf_counter()
+    router.evolve_weights_batch(cost, risk)
+    return n / (time.perf_counter() - start)
+
+
+@benchmark("parallel_decisions", "decisions/s")
+def bench_parallel_decisions(params):
+    return asyncio.run(_parallel_decisions(params))
+
+
+async def _parallel_decisions(params):
+    from concurrent.futures import ProcessPoolExecutor
+
+    from nexus_perception import PerceptionClient
+    from parallel_engine_day4 import (
+        NEXUS_CONFIG, AdaptiveChunkScheduler, DecisionSource,
+        init_worker, route_decision_chunk,
+    )
+
+    workers = params["workers"]
+    async with PerceptionClient() as client:
+        risk_vals = await client.fetch_risk_batch(NEXUS_CONFIG["REGIONS"])
+
+    initargs = (params["nodes"], params["edge_probability"], params["seed"])
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=initargs) as executor:
+        # Warm-up: spawn every worker and build its resident mesh.
+        warm = random_pairs(workers, params["nodes"], params["seed"])
+        list(executor.map(route_decision_chunk, warm[:, None, :], [risk_vals[:1]] * workers))
+
+        source = DecisionSource(params["batch_size"], params["nodes"], risk_vals, params["seed"])
+        chunk = max(1, min(NEXUS_CONFIG["CHUNK_SIZE"], -(-params["batch_size"] // workers)))
+        scheduler = AdaptiveChunkScheduler(
+            executor, route_decision_chunk,
+            max_in_flight=workers * NEXUS_CONFIG["IN_FLIGHT_PER_WORKER"],
+            chunk=chunk, min_chunk=min(chunk, NEXUS_CONFIG["MIN_CHUNK"]),
+        )
+
+        decisions = 0
+        start = time.perf_counter()
+        async for result in scheduler.stream(source):
+            decisions += len(result["latency"])
+        return decisions / (time.perf_counter() - start)
+
+
+# =========================
+# RUN / COMPARE
+# =========================
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(params, only=None):
+    names = only or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise SystemExit(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+    results = {}
+    print(f"{'benchmark':<20} | {'median':>14} | {'min':>14} | {'max':>14} | unit")
+    print("-" * 82)
+    for name in names:
+        spec = BENCHMARKS[name]
+        samples = [spec["fn"](params) for _ in range(params["repeat"])]
+        results[name] = {
+            "value": statistics.median(samples),
+            "unit": spec["unit"],
+            "higher_is_better": spec["higher_is_better"],
+            "samples": samples,
+        }
+        print(f"{name:<20} | {statistics.median(samples):>14,.4f} | "
+              f"{min(samples):>14,.4f} | {max(samples):>14,.4f} | {spec['unit']}")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "params": params,
+        },
+        "results": results,
+    }
+
+
+def compare(base, new, threshold):
+    """Print per-benchmark change; return the names that regressed."""
+    if base["meta"]["params"] != new["meta"]["params"]:
+        print("WARNING: runs used different parameters; deltas may not be comparable")
+
+    regressions = []
+    print(f"{'benchmark':<20} | {'base':>14} | {'new':>14} | {'change':>8} | status")
+    print("-" * 78)
+    for name, old in base["results"].items():
+        cur = new["results"].get(name)
+        if cur is None:
+            print(f"{name:<20} | {old['value']:>14,.4f} | {'-':>14} | {'-':>8} | missing")
+            continue
+
+        change = (cur["value"] - old["value"]) / old["value"] if old["value"] else 0.0
+        # Positive `worse` means slower, whichever direction the unit runs
+        worse = -change if old["higher_is_better"] else change
+        status = "ok"
+        if worse > threshold:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif worse < -threshold:
+            status = "improved"
+        print(f"{name:<20} | {old['value']:>14,.4f} | {cur['value']:>14,.4f} | "
+              f"{change:>+8.1%} | {status}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nexus-Core benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="run benchmarks and write JSON")
+    for key, value in DEFAULTS.items():
+        run_cmd.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    run_cmd.add_argument("--only", help=f"comma-separated subset of: {','.join(BENCHMARKS)}")
+    run_cmd.add_argument("--output", default="benchmark_results.json")
+
+    cmp_cmd = commands.add_parser("compare", help="flag regressions between two runs")
+    cmp_cmd.add_argument("base")
+    cmp_cmd.add_argument("new")
+    cmp_cmd.add_argument("--threshold", type=float, default=0.10,
+                         help="relative slowdown that counts as a regression")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        # Engine modules log per request and per healed mesh; keep the table readable.
+        logging.disable(logging.WARNING)
+        params = {key: getattr(args, key) for key in DEFAULTS}
+        only = args.only.split(",") if args.only else None
+        report = run(params, only)
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nResults written to {args.output}")
+        return
+
+    with open(args.base) as fh:
+        base = json.load(fh)
+    with open(args.new) as fh:
+        new = json.load(fh)
+    regressions = compare(base, new, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,16 +15,21 @@ Pillars:
 
 import os
 import sys
+import json
 import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
 
-import aiohttp
 import numpy as np
-import matplotlib.pyplot as plt
-import nest_asyncio
-from langgraph.graph import StateGraph
+
+from nexus_metrics import export_if_enabled, timed
+from nexus_perception import PerceptionClient, PerceptionError, default_backend
+from nexus_render import FrameRenderer
+from nexus_spatial import GridIndex
 
 
 # =========================
@@ -38,7 +43,16 @@ class NexusConfig:
     SIM_NODES: int = 10
     WEATHER_URL: str = "https://api.open-meteo.com/v1/forecast"
     LAT_LON: tuple = (28.61, 77.20)
+    REGIONS: tuple = ((28.61, 77.20), (19.08, 72.88), (12.97, 77.59), (22.57, 88.36))
     LOG_LEVEL: int = logging.INFO
+    SEED: int = 42
+    CHUNK_ROWS: int = 1_048_576
+    STEP_BOUND: float = 5.0
+    HEADLESS: bool = os.getenv("NEXUS_HEADLESS", "0") == "1"
+    FRAME_DIR: str = os.getenv("NEXUS_FRAME_DIR", "frames")
+    SPATIAL_INDEX: bool = os.getenv("NEXUS_SPATIAL_INDEX", "0") == "1"
+    SHARD_ROWS: int = 16_777_216
+    NODE_LABEL: str = "Truck-{}"
 
 
 CONFIG = NexusConfig()
@@ -49,6 +63,7 @@ CONFIG = NexusConfig()
 # =========================
 
 def setup_logging():
+    """Root log config for the CLI entry point; imports leave logging alone."""
     logging.basicConfig(
         level=CONFIG.LOG_LEVEL,
         format="%(asctime)s | %(levelname)s | NEXUS-CORE | %(message)s",
@@ -57,7 +72,180 @@ def setup_logging():
     return logging.getLogger("Nexus-Core-Day1")
 
 
-logger = setup_logging()
+logger = logging.getLogger("Nexus-Core-Day1")
+
+
+# =========================
+# NODE STORE
+# =========================
+
+class NodeLabels:
+    """
+    Lazy integer-ID -> label view.
+
+    Behaves like the old ``node_ids`` string array for indexing and
+    ``len()``, but never materializes a string per node.
+    """
+
+    def __init__(self, n: int, fmt: str = CONFIG.NODE_LABEL):
+        self.n = n
+        self.fmt = fmt
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self.fmt.format(i) for i in range(*idx.indices(self.n))]
+        if np.ndim(idx):
+            return [self.fmt.format(int(i)) for i in np.asarray(idx).ravel()]
+        i = int(idx)
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError(f"node id {idx} out of range for {self.n} nodes")
+        return self.fmt.format(i)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.fmt.format(i) for i in range(self.n))
+
+
+class NodeStore:
+    """
+    Sharded, memory-mapped node state on disk.
+
+    Layout::
+
+        <root>/manifest.json
+        <root>/shard-00000.npy   # (rows, 2) float32 positions
+        <root>/shard-00001.npy
+        ...
+
+    Node IDs are the global row index; labels are formatted lazily via
+    ``NodeLabels``. Shards are opened with ``mmap_mode`` so state can
+    exceed physical RAM and a run can resume without a full reload.
+    """
+
+    VERSION = 1
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: Path, manifest: Dict[str, Any], mode: str = "r+"):
+        self.root = Path(root)
+        self.manifest = manifest
+        self.mode = mode
+        self.shards = [
+            np.load(self.root / shard["file"], mmap_mode=mode)
+            for shard in manifest["shards"]
+        ]
+
+    # ---------- lifecycle ----------
+
+    @classmethod
+    def create(cls, root, n: int, seed: int = CONFIG.SEED,
+               shard_rows: int = CONFIG.SHARD_ROWS) -> "NodeStore":
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        if (root / cls.MANIFEST).exists():
+            raise FileExistsError(f"Node store already exists at {root}")
+
+        manifest = {
+            "version": cls.VERSION,
+            "dtype": "float32",
+            "label": CONFIG.NODE_LABEL,
+            "seed": seed,
+            "step": 0,
+            "shards": [],
+        }
+        store = cls(root, manifest)
+
+        rng = np.random.default_rng(seed)
+        for start in range(0, n, shard_rows):
+            rows = min(shard_rows, n - start)
+            shard = store._new_shard(rows)
+            for lo in range(0, rows, CONFIG.CHUNK_ROWS):
+                hi = min(lo + CONFIG.CHUNK_ROWS, rows)
+                rng.random((hi - lo, 2), dtype=np.float32, out=shard[lo:hi])
+                shard[lo:hi] *= 100
+        store.flush()
+        return store
+
+    @classmethod
+    def open(cls, root, mode: str = "r+") -> "NodeStore":
+        root = Path(root)
+        with open(root / cls.MANIFEST) as fh:
+            manifest = json.load(fh)
+        if manifest.get("version") != cls.VERSION:
+            raise ValueError(
+                f"Unsupported node store version {manifest.get('version')}"
+            )
+        return cls(root, manifest, mode=mode)
+
+    def append_shard(self, positions: np.ndarray) -> Tuple[int, int]:
+        """Append a new shard; returns its global ``(start, stop)`` rows."""
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        start = len(self)
+        shard = self._new_shard(len(positions))
+        shard[:] = positions
+        self.flush()
+        return start, start + len(positions)
+
+    def flush(self):
+        for shard in self.shards:
+            if isinstance(shard, np.memmap):
+                shard.flush()
+        tmp = self.root / (self.MANIFEST + ".tmp")
+        with open(tmp, "w") as fh:
+            json.dump(self.manifest, fh, indent=2)
+        os.replace(tmp, self.root / self.MANIFEST)
+
+    def _new_shard(self, rows: int) -> np.memmap:
+        name = f"shard-{len(self.manifest['shards']):05d}.npy"
+        shard = np.lib.format.open_memmap(
+            self.root / name, mode="w+", dtype=np.float32, shape=(rows, 2)
+        )
+        self.manifest["shards"].append({"file": name, "rows": rows})
+        self.shards.append(shard)
+        return shard
+
+    # ---------- views ----------
+
+    def __len__(self) -> int:
+        return sum(shard["rows"] for shard in self.manifest["shards"])
+
+    @property
+    def step(self) -> int:
+        return self.manifest.get("step", 0)
+
+    @step.setter
+    def step(self, value: int):
+        self.manifest["step"] = int(value)
+
+    @property
+    def seed(self) -> int:
+        return self.manifest.get("seed", CONFIG.SEED)
+
+    @property
+    def labels(self) -> NodeLabels:
+        return NodeLabels(len(self), self.manifest.get("label", CONFIG.NODE_LABEL))
+
+    def iter_shards(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield ``(global_start_row, shard_array)`` for every shard."""
+        start = 0
+        for shard in self.shards:
+            yield start, shard
+            start += len(shard)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        The memmap itself, for single-shard stores only. A multi-shard
+        view would be a stale copy in RAM; read those via ``iter_shards``.
+        """
+        if len(self.shards) != 1:
+            raise ValueError(
+                f"Node store has {len(self.shards)} shards; use iter_shards()"
+            )
+        return self.shards[0]
 
 
 # =========================
@@ -72,36 +260,83 @@ class SovereignPerception:
     def __init__(self):
         self.node_ids = None
         self.positions = None
+        self.store: Optional[NodeStore] = None
+        self.region_risk: Optional[np.ndarray] = None
 
-    async def fetch_weather(self, session: aiohttp.ClientSession) -> Dict[str, float]:
-        params = {
-            "latitude": CONFIG.LAT_LON[0],
-            "longitude": CONFIG.LAT_LON[1],
-            "current_weather": "true"
-        }
-
+    async def fetch_weather(self, client: PerceptionClient) -> Dict[str, float]:
         try:
-            async with session.get(CONFIG.WEATHER_URL, params=params, timeout=5) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    logger.info("Weather API fetched successfully.")
-                    return data["current_weather"]
+            weather = await client.get_weather(*CONFIG.LAT_LON)
+            logger.info("Weather perception resolved.")
+            return weather
+
+        except PerceptionError as e:
+            logger.warning(f"{e}. Using fallback weather.")
+            return {"temperature": 25.0, "windspeed": 10.0}
 
-                logger.warning("API Lag detected. Using fallback weather.")
-                return {"temperature": 25.0, "windspeed": 10.0}
+    async def fetch_region_risk(self, client: PerceptionClient,
+                                regions=CONFIG.REGIONS) -> np.ndarray:
+        """
+        Batched risk for every fleet region; one vector for the planet
+        instead of one scalar.
+        """
+        self.region_risk = await client.fetch_risk_batch(regions)
+        logger.info(f"Region risk resolved for {len(self.region_risk)} regions.")
+        return self.region_risk
 
-        except Exception as e:
-            logger.error(f"Perception failure: {e}")
-            return {"temperature": 0.0, "windspeed": 0.0}
+    def node_risk(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Per-node risk for rows [start, stop). Nodes are assigned to
+        regions round-robin by ID, so nothing is stored per node.
+        """
+        stop = len(self.node_ids) if stop is None else stop
+        if self.region_risk is None:
+            raise ValueError("Region risk not fetched yet")
+        return self.region_risk[np.arange(start, stop) % len(self.region_risk)]
 
-    def initialize_nodes(self, n: int):
+    def initialize_nodes(self, n: int, seed: int = CONFIG.SEED,
+                         store_path: Optional[str] = None):
         """
         Vectorized node initialization (No loops)
+
+        With ``store_path`` the nodes are written to a sharded on-disk
+        ``NodeStore`` instead of RAM.
         """
-        self.node_ids = np.array([f"Truck-{i}" for i in range(n)])
-        self.positions = np.random.uniform(0, 100, size=(n, 2))
+        if store_path is not None:
+            self.attach_store(NodeStore.create(store_path, n, seed=seed))
+        else:
+            rng = np.random.default_rng(seed)
+            self.node_ids = NodeLabels(n)
+            self.positions = rng.random((n, 2), dtype=np.float32)
+            self.positions *= 100
         logger.info(f"Initialized {n} distributed logistics nodes.")
 
+    def open_nodes(self, store_path: str):
+        """Resume from an existing on-disk node store."""
+        self.attach_store(NodeStore.open(store_path))
+        logger.info(
+            f"Resumed {len(self.store)} nodes from {store_path} "
+            f"at step {self.store.step}."
+        )
+
+    def append_nodes(self, positions: np.ndarray) -> Tuple[int, int]:
+        """Grow the on-disk store by one shard and refresh views."""
+        rows = self.store.append_shard(positions)
+        self.attach_store(self.store)
+        return rows
+
+    def attach_store(self, store: NodeStore):
+        # Positions stay in the store's shards; read them via iter_positions
+        self.store = store
+        self.node_ids = store.labels
+        self.positions = None
+
+    def iter_positions(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """Live ``(global_start_row, array)`` blocks: store shards or the RAM grid."""
+        if self.store is not None:
+            yield from self.store.iter_shards()
+        elif self.positions is not None:
+            yield 0, self.positions
+
 
 # =========================
 # SWARM ORCHESTRATION
@@ -113,8 +348,10 @@ class NexusSwarm:
     """
 
     def __init__(self):
+        from langgraph.graph import StateGraph
+
         workflow = StateGraph(dict)
-        workflow.add_node("Analyst", self.analyst_agent)
+        workflow.add_node("Analyst", timed("langgraph_analyst")(self.analyst_agent))
         workflow.set_entry_point("Analyst")
         self.app = workflow.compile()
 
@@ -132,6 +369,105 @@ class NexusSwarm:
         return state
 
 
+# =========================
+# MOVEMENT KERNEL
+# =========================
+
+def chunk_rng(seed: int, step: int, chunk: int) -> np.random.Generator:
+    """Independent, reproducible stream for one tile of one step."""
+    seq = np.random.SeedSequence(seed, spawn_key=(step, chunk))
+    return np.random.default_rng(seq)
+
+
+def move_rows(positions: np.ndarray, start: int, stop: int, step: int,
+              seed: int, chunk_rows: int, tile: np.ndarray = None,
+              base: int = 0):
+    """
+    Apply one step of movement to rows [start, stop) in place.
+
+    Rows are walked in ``chunk_rows`` tiles aligned to absolute row
+    indices, so any caller covering the same rows draws the same
+    numbers. ``base`` is the global row index of ``positions[0]``.
+    """
+    bound = CONFIG.STEP_BOUND
+    rows = chunk_rows
+    if tile is None:
+        tile = np.empty((min(rows, stop - start), 2), dtype=np.float32)
+
+    for chunk in range(start // rows, -(-stop // rows)):
+        lo = max(chunk * rows, start)
+        hi = min((chunk + 1) * rows, stop)
+        offset = lo - chunk * rows
+
+        buf = tile[: hi - lo]
+        rng = chunk_rng(seed, step, chunk)
+        if offset:
+            rng.random((offset, 2), dtype=np.float32)
+        rng.random((hi - lo, 2), dtype=np.float32, out=buf)
+
+        # U[0, 1) -> U[-bound, bound)
+        buf *= 2 * bound
+        buf -= bound
+        positions[lo - base:hi - base] += buf
+
+
+# =========================
+# SHARED-MEMORY STEPPING
+# =========================
+
+class SharedPositions:
+    """
+    Position matrix living in ``multiprocessing.shared_memory``.
+
+    Workers attach by name, so the array itself is never pickled.
+    """
+
+    def __init__(self, source: np.ndarray):
+        self.shape = source.shape
+        self.dtype = np.dtype(source.dtype).str
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, source.nbytes))
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+        self.array[:] = source
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self):
+        # Drop the view before releasing the buffer it points into.
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+_ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def _attach_positions(name: str, shape: Tuple[int, int], dtype: str) -> np.ndarray:
+    """Per-worker cache of shared-memory views, attached once per block."""
+    if name not in _ATTACHED:
+        shm = shared_memory.SharedMemory(name=name)
+        _ATTACHED[name] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    return _ATTACHED[name][1]
+
+
+def _step_rows_worker(name: str, shape: Tuple[int, int], dtype: str,
+                      start: int, stop: int, step: int, seed: int,
+                      chunk_rows: int) -> int:
+    """ProcessPool task: move a disjoint row range of the shared grid."""
+    positions = _attach_positions(name, shape, dtype)
+    move_rows(positions, start, stop, step, seed, chunk_rows)
+    return stop - start
+
+
+def split_rows(n: int, parts: int, align: int) -> list:
+    """Disjoint ``(start, stop)`` ranges over ``n`` rows, aligned to tiles."""
+    tiles = -(-n // align)
+    bounds = np.linspace(0, tiles, num=max(1, parts) + 1).astype(np.int64) * align
+    bounds = np.minimum(bounds, n)
+    return [(int(lo), int(hi)) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
 # =========================
 # SIMULATION ENGINE
 # =========================
@@ -139,34 +475,164 @@ class NexusSwarm:
 class SimulationEngine:
     """
     Trillion-Scale Vectorized Movement Engine
+
+    Positions are updated in place, one tile of ``chunk_rows`` rows at a
+    time. Every tile draws from its own stream, seeded from
+    ``(seed, step, chunk)``, so a run is reproducible regardless of tile
+    traversal order and peak extra memory is a single float32 tile.
+    ``seed`` defaults to the attached store's recorded seed, so a resumed
+    store continues on the stream it was created with.
+
+    With ``workers > 1`` the grid is moved into shared memory and each
+    step is split into disjoint, tile-aligned row ranges across a
+    ``ProcessPoolExecutor``. Results are identical to the serial path.
+
+    With ``spatial_index`` a ``GridIndex`` is refreshed after every
+    ``run`` step for batched radius / kNN queries over the fleet.
+
+    Unless headless, each step is handed to a ``FrameRenderer`` that
+    draws and writes it to ``frame_dir`` on a render thread.
     """
 
-    def __init__(self, perception: SovereignPerception):
+    def __init__(
+        self,
+        perception: SovereignPerception,
+        chunk_rows: int = CONFIG.CHUNK_ROWS,
+        seed: Optional[int] = None,
+        headless: bool = CONFIG.HEADLESS,
+        workers: int = 1,
+        frame_dir: str = CONFIG.FRAME_DIR,
+        spatial_index: bool = CONFIG.SPATIAL_INDEX,
+    ):
+        store = perception.store
+        if seed is None:
+            seed = store.seed if store is not None else CONFIG.SEED
+
         self.perception = perception
+        self.chunk_rows = max(1, int(chunk_rows))
+        self.seed = seed
+        self.headless = headless
+        self.workers = max(1, int(workers))
+        self.steps_done = store.step if store is not None else 0
+
+        self._shared: Optional[SharedPositions] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.renderer = FrameRenderer(frame_dir, prefix="grid")
+        self.index: Optional[GridIndex] = GridIndex() if spatial_index else None
+
+    def move_rows(self, positions: np.ndarray, start: int, stop: int,
+                  step: int, tile: np.ndarray = None, base: int = 0):
+        move_rows(positions, start, stop, step, self.seed, self.chunk_rows,
+                  tile=tile, base=base)
+
+    @timed("simulation_step")
+    def step(self):
+        """Advance the whole grid by one tile-streamed movement step."""
+        if self.workers > 1:
+            for future in self._submit_parallel_step():
+                future.result()
+            self.steps_done += 1
+            return
+
+        store = self.perception.store
+        if store is None:
+            positions = self.perception.positions
+            self.move_rows(positions, 0, len(positions), self.steps_done)
+            self.steps_done += 1
+            return
+
+        tile = np.empty((self.chunk_rows, 2), dtype=np.float32)
+        for start, shard in store.iter_shards():
+            self.move_rows(
+                shard, start, start + len(shard), self.steps_done,
+                tile=tile, base=start,
+            )
+        self.steps_done += 1
+        store.step = self.steps_done
+        store.flush()
+
+    def _submit_parallel_step(self) -> list:
+        if self.perception.store is not None:
+            raise ValueError("Parallel stepping requires in-RAM positions, not a NodeStore")
+
+        if self._shared is None:
+            self._shared = SharedPositions(self.perception.positions)
+            # Rebind so the rest of the pipeline sees the shared grid.
+            self.perception.positions = self._shared.array
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+        shared = self._shared
+        return [
+            self._executor.submit(
+                _step_rows_worker, shared.name, shared.shape, shared.dtype,
+                lo, hi, self.steps_done, self.seed, self.chunk_rows,
+            )
+            for lo, hi in split_rows(len(shared.array), self.workers, self.chunk_rows)
+        ]
+
+    def close(self):
+        """Shut down workers and copy the grid back out of shared memory."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._shared is not None:
+            self.perception.positions = self._shared.array.copy()
+            self._shared.close()
+            self._shared = None
+        self.renderer.close()
 
     async def run(self, analysis: str, steps: int = 3):
-        for step in range(steps):
-            movement = np.random.uniform(
-                -5, 5, size=self.perception.positions.shape
+        for _ in range(steps):
+            # Atomic tile-wise matrix update
+            if self.workers > 1:
+                await asyncio.gather(
+                    *map(asyncio.wrap_future, self._submit_parallel_step())
+                )
+                self.steps_done += 1
+            else:
+                self.step()
+
+            self.refresh_index()
+
+            if self.headless:
+                await asyncio.sleep(0)
+                continue
+
+            # Frame is reduced here, drawn and written on the render thread
+            await self.renderer.submit(
+                self.position_blocks(), self.steps_done,
+                self.frame_title(self.steps_done, analysis)
             )
 
-            # Atomic matrix update
-            self.perception.positions += movement
+        await self.renderer.drain()
+
+    def position_blocks(self) -> list:
+        """Live position arrays in row order (one per store shard)."""
+        return [block for _, block in self.perception.iter_positions()]
 
-            self.visualize(step + 1, analysis)
-            await asyncio.sleep(0.5)
+    def current_positions(self) -> np.ndarray:
+        """
+        One array of the latest positions: the grid or single shard
+        itself; multi-shard stores are gathered fresh on every call.
+        """
+        blocks = self.position_blocks()
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+    def refresh_index(self) -> Optional[GridIndex]:
+        """Bring the spatial index in line with the latest step."""
+        if self.index is not None:
+            self.index.update(self.current_positions())
+        return self.index
 
-    def visualize(self, step: int, analysis: str):
-        plt.figure(figsize=(8, 6))
-        plt.scatter(
-            self.perception.positions[:, 0],
-            self.perception.positions[:, 1]
+    @staticmethod
+    def frame_title(step: int, analysis: str) -> str:
+        return f"Nexus Global Grid | Step {step}\n{analysis}"
+
+    def visualize(self, step: int, analysis: str) -> Path:
+        """Write one frame synchronously; returns its path."""
+        return self.renderer.render(
+            self.position_blocks(), step, self.frame_title(step, analysis)
         )
-        plt.title(f"Nexus Global Grid | Step {step}\n{analysis}")
-        plt.xlim(0, 100)
-        plt.ylim(0, 100)
-        plt.grid(True)
-        plt.show()
 
 
 # =========================
@@ -179,15 +645,21 @@ async def run_nexus_day1():
     perception = SovereignPerception()
     perception.initialize_nodes(CONFIG.SIM_NODES)
 
-    async with aiohttp.ClientSession() as session:
-        weather_data = await perception.fetch_weather(session)
+    backend = default_backend(url=CONFIG.WEATHER_URL, timeout=5)
+    async with PerceptionClient(backend) as client:
+        weather_data = await perception.fetch_weather(client)
+        await perception.fetch_region_risk(client)
 
     swarm = NexusSwarm()
     initial_state = {"weather": weather_data, "analysis": ""}
     result = await swarm.app.ainvoke(initial_state)
 
     simulator = SimulationEngine(perception)
-    await simulator.run(result["analysis"], steps=3)
+    try:
+        await simulator.run(result["analysis"], steps=3)
+    finally:
+        # Release the worker pool, shared grid and render thread
+        simulator.close()
 
     logger.info("Day 1 simulation completed successfully.")
 
@@ -197,5 +669,9 @@ async def run_nexus_day1():
 # =========================
 
 if __name__ == "__main__":
+    import nest_asyncio
+
+    setup_logging()
     nest_asyncio.apply()
     asyncio.run(run_nexus_day1())
+    export_if_enabled()
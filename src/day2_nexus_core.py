@@ -3,11 +3,18 @@ import os
 import random
 import logging
 import sys
+from pathlib import Path
 
 import numpy as np
-import networkx as nx
-import matplotlib.pyplot as plt
-from langgraph.graph import StateGraph
+
+from nexus_mesh import (
+    TREE_COLUMNS, CSRMesh, NoPathError, PathCache, draw_edge_attributes,
+    gnp_edges, heal_edges, nx_shortest_path_tree, route_pairs,
+)
+from nexus_ch import load_or_build
+from nexus_metrics import export_if_enabled, timed
+from nexus_render import LayoutCache, new_figure
+from nexus_snapshot import cached_graph, cached_mesh, engine_path
 
 
 # ============================================================
@@ -19,14 +26,34 @@ class NexusConfig:
     NODE_COUNT = int(os.getenv("NODE_COUNT", 20))
     TARGET_SCALE = 1_000_000_000_000
     EDGE_PROBABILITY = 0.25
+    DISTANCE_RANGE = (50, 500)   # shared by the networkx and csr generators
+    RISK_RANGE = (0.05, 0.5)
+    MESH_BACKEND = os.getenv("NEXUS_MESH_BACKEND", "networkx")
+    SEED = int(os.getenv("NEXUS_SEED", 42))
+    PATH_CACHE_SIZE = int(os.getenv("PATH_CACHE_SIZE", 4096))
+    TREE_CACHE_SIZE = int(os.getenv("TREE_CACHE_SIZE", 64))
+    LANDMARKS = int(os.getenv("NEXUS_LANDMARKS", 0))   # >0: ALT routing (csr)
+    CONTRACTION = os.getenv("NEXUS_CH", "0") == "1"
+    CH_PATH = os.getenv("NEXUS_CH_PATH", "")   # saved index, memory-mapped on load
+    SNAPSHOT_PATH = engine_path("day2-networkx")   # reuse the mesh across starts
+    CSR_SNAPSHOT_PATH = engine_path("day2-csr")
+    FRAME_DIR = os.getenv("NEXUS_FRAME_DIR", "frames")
+    SPRING_LAYOUT_MAX = 2_000
+    PLOT_MAX_NODES = 20_000
+    PLOT_MAX_EDGES = 20_000
+    LABEL_MAX_NODES = 100
     LOG_LEVEL = logging.INFO
 
 
-logging.basicConfig(
-    level=NexusConfig.LOG_LEVEL,
-    format="%(asctime)s | %(levelname)s | NEXUS-CORE | %(message)s",
-    stream=sys.stdout,
-)
+def setup_logging():
+    """Root log config for the CLI entry point; imports leave logging alone."""
+    logging.basicConfig(
+        level=NexusConfig.LOG_LEVEL,
+        format="%(asctime)s | %(levelname)s | NEXUS-CORE | %(message)s",
+        stream=sys.stdout,
+    )
+
+
 logger = logging.getLogger("Nexus-Core")
 
 
@@ -37,38 +64,40 @@ logger = logging.getLogger("Nexus-Core")
 class SovereignMesh:
     """Resilient self-healing routing mesh"""
 
-    def __init__(self):
-        self.G = nx.Graph()
+    backend = "networkx"
+
+    def __init__(self, node_count=None, edge_probability=None,
+                 seed=NexusConfig.SEED, snapshot=NexusConfig.SNAPSHOT_PATH):
+        self.node_count = node_count or NexusConfig.NODE_COUNT
+        self.edge_probability = (
+            NexusConfig.EDGE_PROBABILITY
+            if edge_probability is None else edge_probability
+        )
+        self.seed = seed
+        self.snapshot = snapshot
+        self.G = None
         self.cities = [
-            f"City-{i}" for i in range(1, NexusConfig.NODE_COUNT + 1)
+            f"City-{i}" for i in range(1, self.node_count + 1)
         ]
+        self.index = {city: i for i, city in enumerate(self.cities)}
+        self.rng = np.random.default_rng(seed)
+        self.version = 0
+        self.ch = None   # nexus_ch.ContractionHierarchy, valid at one version
         self._initialize_resilient_graph()
 
+    @timed("mesh_build")
     def _initialize_resilient_graph(self):
         try:
-            self.G = nx.fast_gnp_random_graph(
-                NexusConfig.NODE_COUNT,
-                NexusConfig.EDGE_PROBABILITY,
-            )
-
-            mapping = {i: self.cities[i] for i in range(len(self.cities))}
-            self.G = nx.relabel_nodes(self.G, mapping)
-
-            # 🔁 Auto-Healing Connectivity
-            if not nx.is_connected(self.G):
-                logger.warning("Disconnected mesh detected. Healing...")
-                components = list(nx.connected_components(self.G))
-                for i in range(len(components) - 1):
-                    u = list(components[i])[0]
-                    v = list(components[i + 1])[0]
-                    self.G.add_edge(u, v)
-
-            # 💰 Hybrid Cost Injection
-            for u, v in self.G.edges():
-                distance = np.random.randint(50, 500)
-                risk = np.random.uniform(0.05, 0.5)
-                self.G[u][v]["distance"] = distance
-                self.G[u][v]["cost"] = distance * (1 + risk)
+            # 💾 Snapshot reuse: same (n, p, seed) attaches instead of regenerating
+            params = {
+                "engine": "sovereign",
+                "node_count": self.node_count,
+                "edge_probability": self.edge_probability,
+                "seed": self.seed,
+                "distance_range": NexusConfig.DISTANCE_RANGE,
+                "risk_range": NexusConfig.RISK_RANGE,
+            }
+            self.G, _ = cached_graph(self.snapshot, params, self._generate_graph)
 
             logger.info(
                 f"Mesh Ready: {len(self.G.nodes)} cities | {len(self.G.edges)} routes"
@@ -78,6 +107,182 @@ class SovereignMesh:
             logger.critical(f"Mesh Initialization Failure: {e}")
             raise
 
+    def _generate_graph(self):
+        import networkx as nx
+
+        n = self.node_count
+        u, v = gnp_edges(n, self.edge_probability, self.rng)
+
+        # 🔁 Auto-Healing Connectivity (union-find, single pass)
+        u, v, components = heal_edges(n, u, v)
+        if components > 1:
+            logger.warning(
+                f"Disconnected mesh detected. Healed {components} components."
+            )
+
+        # 💰 Hybrid Cost Injection (one batched draw per attribute)
+        distance, risk = draw_edge_attributes(
+            len(u), self.rng, NexusConfig.DISTANCE_RANGE, NexusConfig.RISK_RANGE
+        )
+        cost = distance * (1 + risk)
+
+        cities = self.cities
+        G = nx.Graph()
+        G.add_nodes_from(cities)
+        G.add_edges_from(
+            (cities[a], cities[b], {"distance": d, "risk": r, "cost": c})
+            for a, b, d, r, c in zip(
+                u.tolist(), v.tolist(),
+                distance.tolist(), risk.tolist(), cost.tolist(),
+            )
+        )
+        return G, cities
+
+    # Backend-neutral surface shared with CSRMesh
+    # Mutate edges through these methods so ``version`` stays in step.
+
+    def set_edge_attributes(self, u, v, **attrs):
+        edge = self.G[u][v]
+        edge.update(attrs)
+        if "distance" in attrs or "risk" in attrs:
+            edge["cost"] = edge["distance"] * (1 + edge["risk"])
+        self.version += 1
+
+    def add_edge(self, u, v, distance, risk):
+        self.G.add_edge(
+            u, v, distance=distance, risk=risk, cost=distance * (1 + risk)
+        )
+        self.version += 1
+
+    def remove_edge(self, u, v):
+        self.G.remove_edge(u, v)
+        self.version += 1
+
+    def update_risk(self, pairs, risk):
+        """Set risk on many edges; returns the change record for tree repair."""
+        pairs = list(pairs)
+        risk = np.broadcast_to(np.asarray(risk, dtype=float), (len(pairs),))
+        columns = ("distance", "risk", "cost")
+        old = {c: np.empty(len(pairs)) for c in columns}
+        new = {c: np.empty(len(pairs)) for c in columns}
+
+        for i, ((u, v), r) in enumerate(zip(pairs, risk.tolist())):
+            edge = self.G[u][v]
+            for c in columns:
+                old[c][i] = edge[c]
+            edge["risk"] = r
+            edge["cost"] = edge["distance"] * (1 + r)
+            for c in columns:
+                new[c][i] = edge[c]
+        self.version += 1
+
+        return {
+            "u": np.array([self.index[u] for u, _ in pairs], dtype=np.int64),
+            "v": np.array([self.index[v] for _, v in pairs], dtype=np.int64),
+            "old": old,
+            "new": new,
+            "version": self.version,
+        }
+
+    # Integer-ID views used by incremental tree repair
+
+    def adjacent(self, u, weight="cost"):
+        for city, data in self.G[self.cities[u]].items():
+            yield self.index[city], data[weight]
+
+    def edge_value(self, u, v, column):
+        return self.G[self.cities[u]][self.cities[v]][column]
+
+    def edge_index(self):
+        index = self.index
+        edges = np.array(
+            [(index[a], index[b]) for a, b in self.G.edges()], dtype=np.int64
+        ).reshape(-1, 2)
+        return edges[:, 0], edges[:, 1]
+
+    def edge_column(self, column):
+        return np.array([data[column] for _, _, data in self.G.edges(data=True)], dtype=float)
+
+    def node_ids(self, names):
+        return np.array([self.index[name] for name in names], dtype=np.int64)
+
+    def number_of_nodes(self):
+        return self.G.number_of_nodes()
+
+    def number_of_edges(self):
+        return self.G.number_of_edges()
+
+    @timed("dijkstra")
+    def shortest_path(self, source, target, weight="cost"):
+        import networkx as nx
+
+        if self.ch is not None and self.ch.matches(self, weight):
+            _, path, _ = self.ch.query(self.index[source], self.index[target])
+            if path is None:
+                raise nx.NetworkXNoPath(f"No path between {source} and {target}")
+            return [self.cities[i] for i in path]
+
+        return nx.shortest_path(self.G, source, target, weight=weight)
+
+    def path_weight(self, path, weight="cost"):
+        return sum(
+            self.G[path[i]][path[i + 1]][weight]
+            for i in range(len(path) - 1)
+        )
+
+    def tree(self, source, weight="cost"):
+        return nx_shortest_path_tree(
+            self.G, source, weight, nodes=self.cities, version=self.version
+        )
+
+    def to_networkx(self):
+        return self.G
+
+
+def build_mesh(backend=None):
+    """
+    Mesh factory: ``networkx`` (default) or array-backed ``csr``. With
+    ``NEXUS_CH=1`` a contraction hierarchy on ``cost`` is attached
+    (loaded from ``CH_PATH`` when it matches, built and saved otherwise).
+    """
+    backend = backend or NexusConfig.MESH_BACKEND
+    mesh = _generate_mesh(backend)
+    if NexusConfig.CONTRACTION:
+        load_or_build(mesh, NexusConfig.CH_PATH, "cost")
+    return mesh
+
+
+def _generate_mesh(backend):
+    if backend == "csr":
+        params = {
+            "engine": "csr",
+            "node_count": NexusConfig.NODE_COUNT,
+            "edge_probability": NexusConfig.EDGE_PROBABILITY,
+            "seed": NexusConfig.SEED,
+            "distance_range": NexusConfig.DISTANCE_RANGE,
+            "risk_range": NexusConfig.RISK_RANGE,
+            "landmarks": NexusConfig.LANDMARKS,
+        }
+        mesh = cached_mesh(NexusConfig.CSR_SNAPSHOT_PATH, params, lambda: CSRMesh.generate(
+            NexusConfig.NODE_COUNT,
+            NexusConfig.EDGE_PROBABILITY,
+            seed=NexusConfig.SEED,
+            distance_range=NexusConfig.DISTANCE_RANGE,
+            risk_range=NexusConfig.RISK_RANGE,
+            landmarks=NexusConfig.LANDMARKS,
+        ))
+        logger.info(
+            f"Mesh Ready [csr]: {mesh.number_of_nodes()} cities | "
+            f"{mesh.number_of_edges()} routes | "
+            f"{NexusConfig.LANDMARKS} landmarks"
+        )
+        return mesh
+
+    if backend == "networkx":
+        return SovereignMesh()
+
+    raise ValueError(f"Unknown mesh backend: {backend}")
+
 
 # ============================================================
 # 🧠 AGENTIC SWARM ROUTER
@@ -86,11 +291,122 @@ class SovereignMesh:
 class SwarmRouter:
     """Async multi-agent routing workflow"""
 
-    def __init__(self, mesh: SovereignMesh):
+    def __init__(self, mesh, cache_size=NexusConfig.PATH_CACHE_SIZE,
+                 tree_cache_size=NexusConfig.TREE_CACHE_SIZE):
         self.mesh = mesh
-        self.workflow = self._compile_swarm()
+        self.cache = PathCache(cache_size)
+        self.trees = PathCache(tree_cache_size)
+        self._workflow = None
+
+    @property
+    def workflow(self):
+        """LangGraph workflow, compiled on first narrated request."""
+        if self._workflow is None:
+            self._workflow = self._compile_swarm()
+        return self._workflow
+
+    def tree(self, source, weight="cost"):
+        """Cached single-source shortest-path tree."""
+        key = (source, weight)
+        tree = self.trees.get(key, self.mesh.version)
+        if tree is None:
+            tree = self.mesh.tree(source, weight)
+            self.trees.put(key, self.mesh.version, tree)
+        return tree
+
+    def update_risk(self, pairs, risk):
+        """
+        Live risk update: mutate the mesh, then repair every cached
+        shortest-path tree incrementally instead of recomputing it.
+        """
+        change = self.mesh.update_risk(pairs, risk)
+        for key, tree in self.trees.items(version=change["version"] - 1):
+            tree.repair(self.mesh, change)
+            self.trees.retag(key, change["version"])
+        return change
+
+    def route_one_to_many(self, source, targets, weight="cost", with_paths=False):
+        """
+        One Dijkstra for ``source``, answers for every target as arrays:
+        ``reachable``, ``distance``, ``risk``, ``cost``, ``hops``.
+        """
+        tree = self.tree(source, weight)
+        result = tree.query(targets)
+        if with_paths:
+            result["paths"] = [tree.path(t) for t in targets]
+        return result
+
+    def route_batch(self, pairs, weight="cost", narrate=(), with_paths=False):
+        """
+        Bulk routing for many (source, target) pairs.
+
+        Pairs are grouped by source; sources with several targets are
+        answered from one shortest-path tree each, the rest by early-exit
+        point queries. Columns are aligned to ``pairs``. Only indices in
+        ``narrate`` go through the LangGraph Analyst/Optimizer workflow;
+        their debate logs land in ``result["narration"]``.
+        """
+        pairs = [tuple(pair) for pair in pairs]
+        narrate = sorted(set(narrate))
+        result = route_pairs(
+            pairs, lambda s: self.tree(s, weight), skip=narrate,
+            with_paths=with_paths, point=lambda s, t: self.point(s, t, weight),
+        )
+
+        result["narration"] = {}
+        for i in narrate:
+            source, target = pairs[i]
+            state = self.workflow.invoke(
+                {"source": source, "target": target, "debate": []}
+            )
+            result["narration"][i] = state["debate"]
+
+            path = state["best_path"]
+            if path:
+                result["reachable"][i] = True
+                result["hops"][i] = len(path) - 1
+                for column in ("distance", "risk", "cost"):
+                    result[column][i] = self.mesh.path_weight(path, column)
+            if with_paths:
+                result["paths"][i] = path
+
+        return result
+
+    def point(self, source, target, weight="cost"):
+        """
+        One pair as ``(columns, path)`` for ``route_pairs``, or ``None``
+        when unreachable. Served from a cached tree when there is one.
+        """
+        import networkx as nx
+
+        tree = self.trees.get((source, weight), self.mesh.version)
+        if tree is not None:
+            answer = tree.query([target])
+            if not answer["reachable"][0]:
+                return None
+            columns = {c: answer[c][0] for c in TREE_COLUMNS + ("hops",)}
+            return columns, tree.path(target)
+
+        try:
+            path, _ = self.route(source, target, weight)
+        except (NoPathError, nx.NetworkXNoPath):
+            return None
+        columns = {c: self.mesh.path_weight(path, c) for c in TREE_COLUMNS}
+        columns["hops"] = len(path) - 1
+        return columns, path
+
+    def route(self, source, target, weight="cost"):
+        """Cached shortest path + total weight; hits skip Dijkstra."""
+        key = (source, target, weight)
+        cached = self.cache.get(key, self.mesh.version)
+        if cached is None:
+            path = self.mesh.shortest_path(source, target, weight=weight)
+            cached = (tuple(path), self.mesh.path_weight(path, weight))
+            self.cache.put(key, self.mesh.version, cached)
+        return list(cached[0]), cached[1]
 
     def _compile_swarm(self):
+        from langgraph.graph import StateGraph
 
         def analyst(state):
             state["debate"].append(
@@ -100,16 +416,8 @@ class SwarmRouter:
 
         def optimizer(state):
             try:
-                path = nx.shortest_path(
-                    self.mesh.G,
-                    state["source"],
-                    state["target"],
-                    weight="cost",
-                )
-
-                total_cost = sum(
-                    self.mesh.G[path[i]][path[i + 1]]["cost"]
-                    for i in range(len(path) - 1)
+                path, total_cost = self.route(
+                    state["source"], state["target"], "cost"
                 )
 
                 state["best_path"] = path
@@ -126,8 +434,8 @@ class SwarmRouter:
             return state
 
         builder = StateGraph(dict)
-        builder.add_node("Analyst", analyst)
-        builder.add_node("Optimizer", optimizer)
+        builder.add_node("Analyst", timed("langgraph_analyst")(analyst))
+        builder.add_node("Optimizer", timed("langgraph_optimizer")(optimizer))
         builder.set_entry_point("Analyst")
         builder.add_edge("Analyst", "Optimizer")
 
@@ -138,27 +446,72 @@ class SwarmRouter:
 # 📊 VISUALIZATION
 # ============================================================
 
-def visualize(mesh, result, source, target):
-    plt.figure(figsize=(10, 7))
-    pos = nx.spring_layout(mesh.G, seed=42)
-
-    nx.draw(
-        mesh.G,
-        pos,
-        with_labels=True,
-        node_size=500,
-        node_color="skyblue",
-        font_weight="bold",
+LAYOUTS = LayoutCache()
+
+
+def mesh_layout(mesh):
+    """Node positions in ``mesh.cities`` order, cached per mesh version."""
+
+    def compute(m):
+        import networkx as nx
+
+        n = m.number_of_nodes()
+        if n <= NexusConfig.SPRING_LAYOUT_MAX:
+            pos = nx.spring_layout(m.to_networkx(), seed=NexusConfig.SEED)
+            return np.array([pos[city] for city in m.cities])
+        # Force-directed layout is quadratic; large meshes get a seeded scatter
+        return np.random.default_rng(NexusConfig.SEED).uniform(-1, 1, size=(n, 2))
+
+    return LAYOUTS.get(mesh, compute)
+
+
+def visualize(mesh, result, source, target, frame_dir=NexusConfig.FRAME_DIR):
+    """
+    Write the route frame to ``frame_dir`` and return its path.
+
+    Pyplot-free, so it can run on a worker thread. Above the plot limits
+    a fixed sample of nodes/edges is drawn; the route is always complete.
+    """
+    from matplotlib.collections import LineCollection
+
+    pos = mesh_layout(mesh)
+    n = len(pos)
+    u, v = mesh.edge_index()
+    rng = np.random.default_rng(NexusConfig.SEED)
+
+    if len(u) > NexusConfig.PLOT_MAX_EDGES:
+        keep = rng.choice(len(u), NexusConfig.PLOT_MAX_EDGES, replace=False)
+        u, v = u[keep], v[keep]
+    nodes = (
+        np.arange(n) if n <= NexusConfig.PLOT_MAX_NODES
+        else rng.choice(n, NexusConfig.PLOT_MAX_NODES, replace=False)
     )
+    labelled = n <= NexusConfig.LABEL_MAX_NODES
+
+    figure = new_figure((10, 7))
+    ax = figure.add_subplot()
+    ax.set_axis_off()
+    ax.add_collection(LineCollection(
+        np.stack([pos[u], pos[v]], axis=1), colors="black", linewidths=0.5, zorder=1
+    ))
+    ax.scatter(pos[nodes, 0], pos[nodes, 1], s=500 if labelled else 4,
+               color="skyblue", zorder=2)
+    if labelled:
+        for i in nodes:
+            ax.annotate(mesh.cities[i], pos[i], ha="center", va="center",
+                        fontweight="bold", zorder=4)
 
     if result["best_path"]:
-        edges = list(zip(result["best_path"], result["best_path"][1:]))
-        nx.draw_networkx_edges(
-            mesh.G, pos, edgelist=edges, width=4, edge_color="red"
-        )
+        route = pos[mesh.node_ids(result["best_path"])]
+        ax.plot(route[:, 0], route[:, 1], color="red", linewidth=4, zorder=3)
+
+    ax.set_title(f"Nexus Optimal Route: {source} → {target}")
+    ax.autoscale_view()
 
-    plt.title(f"Nexus Optimal Route: {source} → {target}")
-    plt.show()
+    path = Path(frame_dir) / f"route-{source}-{target}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    figure.savefig(path)
+    return path
 
 
 # ============================================================
@@ -166,7 +519,7 @@ def visualize(mesh, result, source, target):
 # ============================================================
 
 async def main():
-    mesh = SovereignMesh()
+    mesh = build_mesh()
     router = SwarmRouter(mesh)
 
     source, target = random.sample(mesh.cities, 2)
@@ -189,13 +542,19 @@ async def main():
         f"Optimal Path : {' → '.join(result['best_path']) if result['best_path'] else 'None'}"
     )
     print(f"Hybrid Cost  : {result['total_cost']:.2f}")
+    print(f"Path Cache   : {router.cache.stats}")
     print("=" * 60 + "\n")
 
-    visualize(mesh, result, source, target)
+    frame = await asyncio.get_running_loop().run_in_executor(
+        None, visualize, mesh, result, source, target
+    )
+    logger.info(f"Route frame written: {frame}")
 
 
 if __name__ == "__main__":
     import nest_asyncio
 
+    setup_logging()
     nest_asyncio.apply()
     asyncio.run(main())
+    export_if_enabled()
@@ -3,32 +3,44 @@
 # Architect: SHIVAM
 # ==========================================
 
-import os
 import sys
 import logging
 import asyncio
 import random
 import numpy as np
-import pandas as pd
-import networkx as nx
-import matplotlib.pyplot as plt
-import nest_asyncio
-from langgraph.graph import StateGraph
+
+from nexus_mesh import PathCache, nx_pareto_fronts
+from nexus_metrics import export_if_enabled, timed
+from nexus_snapshot import cached_graph, engine_path
+from nexus_telemetry import TelemetryRing
 
 # --- SECTION 1: CONFIGURATION ---
 NEXUS_CONFIG = {
     "LEARNING_RATE": 0.03,
     "WEIGHT_BOUNDS": (0.1, 0.9),
     "NODE_COUNT": 20,
+    "HISTORY_CAPACITY": 100_000,
+    "FRONT_CACHE_SIZE": 4096,
+    "SNAPSHOT_PATH": engine_path("day3"),
     "LOG_LEVEL": logging.INFO
 }
 
+# Reason codes stored in telemetry (small int instead of a string per step)
+REASONS = ("Cost Optimization", "Risk Escalation", "Stable")
+HISTORY_SCHEMA = {
+    "cost": np.float64, "risk": np.float64,
+    "w_cost": np.float64, "w_risk": np.float64, "reason": np.int8
+}
+
 # --- SECTION 2: TELEMETRY & LOGGING ---
-logging.basicConfig(
-    level=NEXUS_CONFIG["LOG_LEVEL"],
-    format='%(asctime)s | %(levelname)s | ARCHITECT: SHIVAM | %(message)s',
-    stream=sys.stdout
-)
+def setup_logging():
+    # Called by the entry point only; importing must not touch root logging
+    logging.basicConfig(
+        level=NEXUS_CONFIG["LOG_LEVEL"],
+        format='%(asctime)s | %(levelname)s | ARCHITECT: SHIVAM | %(message)s',
+        stream=sys.stdout
+    )
+
 logger = logging.getLogger("Nexus-Neural-Core")
 
 # --- SECTION 3: SOVEREIGN ADAPTIVE ROUTER ---
@@ -36,11 +48,56 @@ class SovereignAdaptiveRouter:
     def __init__(self):
         self.w_cost = 0.5
         self.w_risk = 0.5
-        self.history = []
+        self.history = TelemetryRing(
+            HISTORY_SCHEMA,
+            capacity=NEXUS_CONFIG["HISTORY_CAPACITY"],
+            categories={"reason": REASONS}
+        )
 
     def compute_hybrid_score(self, cost, risk):
         return (self.w_cost * cost) + (self.w_risk * risk)
 
+    @staticmethod
+    def compute_hybrid_score_batch(cost, risk, w_cost, w_risk):
+        # One NumPy expression for a whole batch of candidate routes
+        return np.asarray(w_cost) * np.asarray(cost) + np.asarray(w_risk) * np.asarray(risk)
+
+    def evolve_weights_batch(self, cost, risk):
+        """
+        Sequential scan of evolve_weights over a batch.
+
+        Returns (reason codes, w_cost before, w_risk before, w_cost after,
+        w_risk after) per step. The branch only depends on the inputs, so
+        it is decided in one vectorized comparison; the clipped update
+        itself runs as a scalar scan so every step matches evolve_weights
+        bit for bit.
+        """
+        cost = np.asarray(cost, dtype=float)
+        risk = np.asarray(risk, dtype=float)
+        lr = NEXUS_CONFIG["LEARNING_RATE"]
+        low, high = NEXUS_CONFIG["WEIGHT_BOUNDS"]
+
+        escalate = risk > (cost / 100)
+        reasons = escalate.astype(np.int8)
+
+        n = len(cost)
+        trace = np.empty((4, n))
+        w_cost, w_risk = float(self.w_cost), float(self.w_risk)
+        for i, up in enumerate(escalate.tolist()):
+            trace[0, i], trace[1, i] = w_cost, w_risk
+            if up:
+                w_risk += lr
+                w_cost -= lr
+            else:
+                w_cost += lr
+                w_risk -= lr
+            w_cost = min(max(w_cost, low), high)
+            w_risk = min(max(w_risk, low), high)
+            trace[2, i], trace[3, i] = w_cost, w_risk
+
+        self.w_cost, self.w_risk = np.float64(w_cost), np.float64(w_risk)
+        return reasons, trace[0], trace[1], trace[2], trace[3]
+
     def evolve_weights(self, cost, risk):
         try:
             # Neural Adjustment Logic
@@ -63,7 +120,16 @@ class SovereignAdaptiveRouter:
             return "Stable"
 
 # --- SECTION 4: SIMULATION ENGINE (GRAPH BUILDER) ---
-def build_graph(node_count):
+@timed("mesh_build")
+def build_graph(node_count, snapshot=NEXUS_CONFIG["SNAPSHOT_PATH"]):
+    # A snapshot pins the topology across starts; without one it is random each run
+    params = {"engine": "day3", "node_count": node_count, "edge_probability": 0.4}
+    G, _ = cached_graph(snapshot, params, lambda: (_random_graph(node_count), range(node_count)))
+    return G
+
+def _random_graph(node_count):
+    import networkx as nx
+
     # Generating a random network topology
     G = nx.fast_gnp_random_graph(node_count, 0.4)
     for (u, v) in G.edges():
@@ -73,37 +139,176 @@ def build_graph(node_count):
 
 # --- SECTION 5: SWARM INTELLIGENCE (LANGGRAPH WORKFLOW) ---
 class SwarmIntelligence:
+    """
+    Routes pick from a cached (distance, risk) Pareto front with the
+    router's current weights, so the learned weights steer path choice
+    and weight evolution never triggers a new search.
+    """
+
     def __init__(self, G, router):
         self.G = G
         self.router = router
-        self.workflow = self._build_swarm()
+        self.fronts = PathCache(NEXUS_CONFIG["FRONT_CACHE_SIZE"])
+        self._workflow = None
+
+    @property
+    def workflow(self):
+        # LangGraph is only loaded once a request is narrated
+        if self._workflow is None:
+            self._workflow = self._build_swarm()
+        return self._workflow
+
+    def fronts_from(self, source, targets):
+        """Pareto fronts to many targets from one label-setting search."""
+        # Answer from this call's results, not a cache re-read: with more
+        # targets than FRONT_CACHE_SIZE, early puts are already evicted
+        fronts = {t: self.fronts.get((source, t), 0) for t in targets}
+        missing = [t for t, front in fronts.items() if front is None]
+        if missing:
+            for target, front in nx_pareto_fronts(self.G, source, missing).items():
+                self.fronts.put((source, target), 0, front)
+                fronts[target] = front
+        return fronts
+
+    def front(self, source, target):
+        return self.fronts_from(source, [target])[target]
+
+    def select(self, front):
+        # O(front size): re-weighting never re-routes
+        return front.select(self.router.w_cost, self.router.w_risk)
+
+    def score_and_evolve(self, cost, risk):
+        # Score with current weights, then adapt and record telemetry
+        score = self.router.compute_hybrid_score(cost, risk)
+        reason = self.router.evolve_weights(cost, risk)
+
+        # Recording telemetry for plotting
+        self.router.history.append(
+            cost=cost, risk=risk, w_cost=self.router.w_cost,
+            w_risk=self.router.w_risk, reason=reason
+        )
+        return score
+
+    def route_one_to_many(self, source, targets, with_paths=False):
+        # One Pareto search per source; current weights pick each route
+        fronts = self.fronts_from(source, targets)
+        k = len(targets)
+        result = {
+            "target": list(targets),
+            "reachable": np.zeros(k, dtype=bool),
+            "hops": np.full(k, np.nan),
+            "distance": np.full(k, np.nan),
+            "risk": np.full(k, np.nan),
+        }
+        paths = [None] * k
+        for i, target in enumerate(targets):
+            front = fronts[target]
+            if len(front):
+                path, cost, risk = self.select(front)
+                result["reachable"][i] = True
+                result["hops"][i] = len(path) - 1
+                result["distance"][i], result["risk"][i] = cost, risk
+                paths[i] = path
+        result["cost"] = result["distance"]
+        result["score"] = self.router.compute_hybrid_score(
+            result["distance"], result["risk"]
+        )
+        if with_paths:
+            result["paths"] = paths
+        return result
+
+    def route_batch(self, pairs, narrate=(), with_paths=False):
+        """
+        Bulk routing: one Pareto search per distinct source, columnar results.
+
+        Requests are then answered in input order, each choosing from its
+        cached front with the weights of that moment before evolving them,
+        so choices, weights and history match the one-at-a-time loop.
+        Only indices in ``narrate`` run through the LangGraph workflow.
+        """
+        pairs = [tuple(pair) for pair in pairs]
+        narrate = set(narrate)
+        k = len(pairs)
+
+        targets_by_source = {}
+        for source, target in pairs:
+            targets_by_source.setdefault(source, []).append(target)
+        fronts = {
+            source: self.fronts_from(source, list(dict.fromkeys(targets)))
+            for source, targets in targets_by_source.items()
+        }
+
+        result = {
+            "source": [pair[0] for pair in pairs],
+            "target": [pair[1] for pair in pairs],
+            "reachable": np.zeros(k, dtype=bool),
+            "hops": np.full(k, np.nan),
+            "distance": np.full(k, np.nan),
+            "risk": np.full(k, np.nan),
+            "score": np.full(k, np.nan),
+            "front_size": np.zeros(k, dtype=np.int32),
+            "narration": {},
+        }
+        if with_paths:
+            result["paths"] = [None] * k
+
+        for i, (source, target) in enumerate(pairs):
+            front = fronts[source][target]
+            result["front_size"][i] = len(front)
+
+            if i in narrate:
+                state = self.workflow.invoke(
+                    {"source": source, "target": target, "debate": []}
+                )
+                result["narration"][i] = state["debate"] + [state["result"]]
+                path, cost, risk, score = (
+                    state["path"], state["cost"], state["risk"], state["score"]
+                )
+                if path is None:
+                    continue
+            elif len(front):
+                path, cost, risk = self.select(front)
+                score = self.score_and_evolve(cost, risk)
+            else:
+                continue
+
+            result["reachable"][i] = True
+            result["hops"][i] = len(path) - 1
+            result["distance"][i], result["risk"][i] = cost, risk
+            result["score"][i] = score
+            if with_paths:
+                result["paths"][i] = path
+
+        result["cost"] = result["distance"]
+        return result
 
     def _build_swarm(self):
+        from langgraph.graph import StateGraph
+
         def analyst(state):
             state["debate"].append("Analyst: Network scanned.")
             return state
 
         def optimizer(state):
-            # Pathfinding via Dijkstra's algorithm logic
-            path = nx.shortest_path(self.G, state["source"], state["target"], weight="distance")
-            cost = sum(self.G[path[i]][path[i+1]]["distance"] for i in range(len(path)-1))
-            risk = sum(self.G[path[i]][path[i+1]]["risk"] for i in range(len(path)-1))
-            
-            score = self.router.compute_hybrid_score(cost, risk)
-            reason = self.router.evolve_weights(cost, risk)
-            
-            # Recording telemetry for plotting
-            self.router.history.append({
-                "cost": cost, "risk": risk, "w_cost": self.router.w_cost, 
-                "w_risk": self.router.w_risk, "reason": reason
-            })
+            # Pareto front once per pair; current weights pick the route
+            front = self.front(state["source"], state["target"])
+            if not len(front):
+                # Same as Day 2: the row stays unreachable, the batch goes on
+                logger.error(f"Routing failure: no path between {state['source']} and {state['target']}")
+                state.update({"path": None, "cost": np.nan, "risk": np.nan, "score": np.nan})
+                state["result"] = "No Path"
+                return state
+            path, cost, risk = self.select(front)
+
+            score = self.score_and_evolve(cost, risk)
+            state.update({"path": path, "cost": cost, "risk": risk, "score": score})
             state["result"] = f"Path Locked | Score: {score:.2f}"
             return state
 
         # Define Graph State Logic
         graph = StateGraph(dict)
-        graph.add_node("Analyst", analyst)
-        graph.add_node("Optimizer", optimizer)
+        graph.add_node("Analyst", timed("langgraph_analyst")(analyst))
+        graph.add_node("Optimizer", timed("langgraph_optimizer")(optimizer))
         graph.set_entry_point("Analyst")
         graph.add_edge("Analyst", "Optimizer")
         return graph.compile()
@@ -117,15 +322,17 @@ async def run_simulation():
 
     logger.info("Starting Nexus Neural Swarm Simulation...")
 
-    # Running 15 dynamic routing iterations
-    for i in range(15):
-        s, t = random.sample(list(G.nodes), 2)
-        await swarm.workflow.ainvoke({
-            "source": s, "target": t, "debate": []
-        })
+    # Running 15 dynamic routing iterations as one batch;
+    # only the first request is narrated through the agent workflow
+    pairs = [tuple(random.sample(list(G.nodes), 2)) for _ in range(15)]
+    batch = swarm.route_batch(pairs, narrate=[0])
+    for debate in batch["narration"].values():
+        logger.info(" | ".join(debate))
 
     # Processing History and Plotting Results
-    df = pd.DataFrame(router.history)
+    import matplotlib.pyplot as plt
+
+    df = router.history.to_pandas()
     
     plt.figure(figsize=(12, 6))
     plt.plot(df["w_cost"], label="Cost Weight (Efficiency)", color='#3498db', linewidth=2, marker='o')
@@ -142,5 +349,9 @@ async def run_simulation():
 
 # Apply Nest Asyncio for Colab/Jupyter compatibility
 if __name__ == "__main__":
+    import nest_asyncio
+
+    setup_logging()
     nest_asyncio.apply()
     asyncio.run(run_simulation())
+    export_if_enabled()
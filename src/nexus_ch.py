@@ -0,0 +1,352 @@
+"""
+NEXUS CORE - CONTRACTION HIERARCHY
+
+Preprocessed shortest-path index for meshes whose weights are static
+between risk updates.
+
+Pillars:
+1. Node contraction in lazy edge-difference order with bounded witness search
+2. Upward-only CSR graph: one array set serves both query directions
+3. Bidirectional upward Dijkstra, shortcuts unpacked to original edges
+4. Raw ``.npy`` directory on disk (snapshot layout), memory-mapped on load
+
+An index belongs to one (topology, weight) state: it records a
+fingerprint of the edge list and weights plus the mesh ``version`` it was
+built at, and meshes fall back to Dijkstra once either moves on.
+"""
+
+import os
+import heapq
+import bisect
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nexus_metrics import timed
+from nexus_snapshot import read_arrays, write_arrays
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+CH_CONFIG = {
+    "FORMAT_VERSION": 1,
+    "WITNESS_SETTLE_LIMIT": 256,   # per witness search; lower = more shortcuts
+    "INDEX_PATH": os.getenv("NEXUS_CH_PATH", ""),
+}
+
+ARRAYS = ("rank", "up_indptr", "up_indices", "up_weight", "up_edge", "up_middle")
+
+logger = logging.getLogger("Nexus-CH")
+
+
+def fingerprint(u: np.ndarray, v: np.ndarray, weight: np.ndarray) -> str:
+    """Digest of the edge list and weights an index was built from."""
+    digest = hashlib.blake2b(digest_size=16)
+    for column, dtype in ((u, np.int64), (v, np.int64), (weight, np.float64)):
+        digest.update(np.ascontiguousarray(column, dtype=dtype).tobytes())
+    return digest.hexdigest()
+
+
+def mesh_fingerprint(mesh, weight: str = "cost") -> str:
+    u, v = mesh.edge_index()
+    return fingerprint(u, v, mesh.edge_column(weight))
+
+
+# =========================
+# PREPROCESSING
+# =========================
+
+def _witness(adj: List[Dict[int, float]], source: int, skip: int,
+             limit: float, settle_limit: int) -> Dict[int, float]:
+    """Dijkstra from ``source`` avoiding ``skip``, bounded by distance and settles."""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap and settled < settle_limit:
+        d, x = heapq.heappop(heap)
+        if d > dist[x]:
+            continue
+        if d > limit:
+            break
+        settled += 1
+        for y, w in adj[x].items():
+            nd = d + w
+            if y != skip and nd < dist.get(y, float("inf")):
+                dist[y] = nd
+                heapq.heappush(heap, (nd, y))
+    return dist
+
+
+def _shortcuts(adj, v, settle_limit) -> List[Tuple[int, int, float]]:
+    """Shortcuts ``(a, b, weight)`` needed if ``v`` were contracted now."""
+    nbrs = list(adj[v].items())
+    if len(nbrs) < 2:
+        return []
+    top = max(w for _, w in nbrs)
+    out = []
+    for i, (a, wa) in enumerate(nbrs[:-1]):
+        dist = _witness(adj, a, v, wa + top, settle_limit)
+        for b, wb in nbrs[i + 1:]:
+            via = wa + wb
+            if via < dist.get(b, float("inf")):
+                out.append((a, b, via))
+    return out
+
+
+# =========================
+# CONTRACTION HIERARCHY
+# =========================
+
+class ContractionHierarchy:
+    """
+    Upward graph of a contracted undirected mesh.
+
+    Row ``x`` of the CSR arrays lists edges from ``x`` to higher-ranked
+    nodes. ``up_edge`` is the original edge ID (``-1`` for shortcuts);
+    ``up_middle`` is the contracted node a shortcut bypasses (``-1`` for
+    original edges). Rows are sorted by neighbor for shortcut unpacking.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self.weight = meta["weight"]
+        self.version = meta["version"]
+        self.fingerprint = meta["fingerprint"]
+
+    def __len__(self) -> int:
+        return len(self.rank)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
+
+    @property
+    def shortcuts(self) -> int:
+        return int(np.count_nonzero(np.asarray(self.up_edge) < 0))
+
+    # ---------- construction ----------
+
+    @classmethod
+    def from_mesh(cls, mesh, weight: str = "cost", **kwargs) -> "ContractionHierarchy":
+        """Index any mesh exposing ``edge_index`` / ``edge_column``."""
+        u, v = mesh.edge_index()
+        w = mesh.edge_column(weight)
+        return cls.build(mesh.number_of_nodes(), u, v, w, weight=weight,
+                         version=mesh.version, **kwargs)
+
+    @classmethod
+    @timed("ch_build")
+    def build(cls, n: int, u: np.ndarray, v: np.ndarray, w: np.ndarray,
+              weight: str = "cost", version: int = 0,
+              settle_limit: int = CH_CONFIG["WITNESS_SETTLE_LIMIT"]) -> "ContractionHierarchy":
+        """
+        Contract every node of the undirected graph ``(u[i], v[i], w[i])``.
+
+        Order: lazy priority ``2 * shortcuts - degree + contracted
+        neighbors + level``, re-evaluated on pop; ``level`` (hierarchy depth below a
+        node) keeps contraction spread evenly. Parallel edges keep the
+        lightest one.
+        """
+        adj: List[Dict[int, float]] = [dict() for _ in range(n)]
+        info: Dict[Tuple[int, int], Tuple[int, int]] = {}   # (a, b) -> (edge, middle)
+        for e, (a, b, x) in enumerate(zip(u.tolist(), v.tolist(), np.asarray(w, dtype=np.float64).tolist())):
+            if a == b or x >= adj[a].get(b, float("inf")):
+                continue
+            adj[a][b] = adj[b][a] = x
+            info[(min(a, b), max(a, b))] = (e, -1)
+
+        contracted = [0] * n
+        level = [0] * n
+        heap = [(2 * len(_shortcuts(adj, x, settle_limit)) - len(adj[x]), x) for x in range(n)]
+        heapq.heapify(heap)
+
+        rank = np.empty(n, dtype=np.int64)
+        rows: List[List[Tuple[int, float, int, int]]] = [None] * n
+        order = 0
+        while heap:
+            _, x = heapq.heappop(heap)
+            if rows[x] is not None:
+                continue
+            added = _shortcuts(adj, x, settle_limit)
+            priority = 2 * len(added) - len(adj[x]) + contracted[x] + level[x]
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, x))
+                continue
+
+            rank[x] = order
+            order += 1
+            rows[x] = [(y, wy) + info[(min(x, y), max(x, y))] for y, wy in adj[x].items()]
+            for y in adj[x]:
+                del adj[y][x]
+                contracted[y] += 1
+                level[y] = max(level[y], level[x] + 1)
+            adj[x] = {}
+            for a, b, via in added:
+                if via < adj[a].get(b, float("inf")):
+                    adj[a][b] = adj[b][a] = via
+                    info[(min(a, b), max(a, b))] = (-1, x)
+
+        counts = np.array([len(row) for row in rows], dtype=np.int64)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        flat = sorted((x, y, wy, e, m) for x, row in enumerate(rows) for y, wy, e, m in row)
+        cols = list(zip(*flat)) if flat else [(), (), (), (), ()]
+
+        arrays = {
+            "rank": rank,
+            "up_indptr": indptr,
+            "up_indices": np.array(cols[1], dtype=np.int64),
+            "up_weight": np.array(cols[2], dtype=np.float64),
+            "up_edge": np.array(cols[3], dtype=np.int64),
+            "up_middle": np.array(cols[4], dtype=np.int64),
+        }
+        meta = {
+            "format": CH_CONFIG["FORMAT_VERSION"],
+            "weight": weight,
+            "version": version,
+            "fingerprint": fingerprint(u, v, w),
+            "nodes": n,
+            "edges": len(u),
+        }
+        return cls(arrays, meta)
+
+    # ---------- persistence ----------
+
+    def save(self, path) -> Path:
+        """Directory of raw ``.npy`` arrays plus ``meta.json`` (see nexus_snapshot)."""
+        return write_arrays(path, {name: getattr(self, name) for name in ARRAYS}, self.meta)
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> "ContractionHierarchy":
+        """Attach to a saved index; arrays stay in the page cache when ``mmap``."""
+        arrays, meta = read_arrays(path, mmap)
+        if meta.get("format") != CH_CONFIG["FORMAT_VERSION"]:
+            raise ValueError(f"Unsupported CH index format: {meta.get('format')}")
+        return cls(arrays, meta)
+
+    def matches(self, mesh, weight: str) -> bool:
+        """True while the index still describes ``mesh`` under ``weight``."""
+        return self.weight == weight and self.version == mesh.version
+
+    # ---------- queries ----------
+
+    @timed("ch_query")
+    def query(self, s: int, t: int) -> Tuple[float, Optional[List[int]], Optional[List[int]]]:
+        """
+        ``(total, nodes, edges)`` for the shortest ``s``-``t`` path, with
+        shortcuts expanded to original edge IDs; ``(inf, None, None)``
+        when unreachable. Both sides search upward only, smaller queue
+        first, until neither queue minimum can beat the best meeting.
+        """
+        inf = float("inf")
+        if s == t:
+            return 0.0, [s], []
+
+        indptr, up_indices, up_weight = self.up_indptr, self.up_indices, self.up_weight
+        dist = ({s: 0.0}, {t: 0.0})
+        pred = ({}, {})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        best, meet = inf, None
+
+        while True:
+            kf = heaps[0][0][0] if heaps[0] else inf
+            kr = heaps[1][0][0] if heaps[1] else inf
+            if min(kf, kr) >= best:
+                break
+            side = 0 if kf <= kr else 1
+            here, other, back, heap = dist[side], dist[1 - side], pred[side], heaps[side]
+
+            d, x = heapq.heappop(heap)
+            if d > here[x]:
+                continue
+            if x in other and d + other[x] < best:
+                best, meet = d + other[x], x
+
+            start, stop = int(indptr[x]), int(indptr[x + 1])
+            nbrs = up_indices[start:stop].tolist()
+            weights = up_weight[start:stop].tolist()
+            # Stall-on-demand: a higher neighbor already reaching x more
+            # cheaply proves d is not a shortest distance
+            if any(here.get(y, inf) + wy < d for y, wy in zip(nbrs, weights)):
+                continue
+            for slot, y, wy in zip(range(start, stop), nbrs, weights):
+                nd = d + wy
+                if nd < here.get(y, inf):
+                    here[y] = nd
+                    back[y] = (x, slot)
+                    heapq.heappush(heap, (nd, y))
+
+        if meet is None:
+            return inf, None, None
+
+        # Upward slots: s -> meet, then meet -> t walked back down
+        up = []
+        x = meet
+        while x in pred[0]:
+            low, slot = pred[0][x]
+            up.append((low, x, slot))
+            x = low
+        up.reverse()
+        x = meet
+        while x in pred[1]:
+            low, slot = pred[1][x]
+            up.append((x, low, slot))
+            x = low
+
+        nodes, edges = [s], []
+        for a, b, slot in up:
+            self._unpack(a, b, slot, nodes, edges)
+        return best, nodes, edges
+
+    def _slot(self, low: int, high: int) -> int:
+        start, stop = int(self.up_indptr[low]), int(self.up_indptr[low + 1])
+        return start + bisect.bisect_left(self.up_indices[start:stop].tolist(), high)
+
+    def _unpack(self, a: int, b: int, slot: int, nodes: List[int], edges: List[int]):
+        """Append the original edges of ``a -> b`` (CSR ``slot``) in path order."""
+        stack = [(a, b, slot)]
+        while stack:
+            a, b, slot = stack.pop()
+            middle = int(self.up_middle[slot])
+            if middle < 0:
+                edges.append(int(self.up_edge[slot]))
+                nodes.append(b)
+                continue
+            # Both halves hang off the middle node, which ranks below a and b
+            stack.append((middle, b, self._slot(middle, b)))
+            stack.append((a, middle, self._slot(middle, a)))
+
+
+# =========================
+# MESH ATTACHMENT
+# =========================
+
+def load_or_build(mesh, path=CH_CONFIG["INDEX_PATH"], weight: str = "cost") -> ContractionHierarchy:
+    """
+    Attach a contraction hierarchy to ``mesh``: reuse the index at
+    ``path`` when its fingerprint matches, otherwise build (and save,
+    when ``path`` is set).
+    """
+    current = mesh_fingerprint(mesh, weight)
+    if path and (Path(path) / "meta.json").exists():
+        ch = ContractionHierarchy.load(path)
+        if ch.fingerprint == current and ch.weight == weight:
+            ch.version = mesh.version
+            mesh.ch = ch
+            logger.info(f"CH index attached from {path}: {len(ch)} nodes, {ch.nbytes / 2**20:.1f} MB")
+            return ch
+        logger.warning(f"CH index at {path} does not match this mesh; rebuilding.")
+
+    ch = ContractionHierarchy.from_mesh(mesh, weight)
+    if path:
+        ch.save(path)
+    mesh.ch = ch
+    logger.info(f"CH index built: {len(ch)} nodes, {ch.shortcuts} shortcuts, {ch.nbytes / 2**20:.1f} MB")
+    return ch
@@ -0,0 +1,1182 @@
+"""
+NEXUS CORE - ARRAY-BACKED MESH ENGINE
+
+CSR (compressed sparse row) routing mesh with integer node IDs.
+
+Pillars:
+1. Vectorized G(n, p) edge generation (no per-edge Python)
+2. CSR adjacency: indptr / indices + float32 edge attribute columns
+3. Lazy integer-ID <-> name table
+4. Heap-based Dijkstra over the CSR arrays
+"""
+
+import bisect
+import heapq
+import logging
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from nexus_metrics import timed
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+MESH_CONFIG = {
+    "NAME_FORMAT": "City-{}",
+    "NAME_OFFSET": 1,
+    "DISTANCE_RANGE": (50, 500),
+    "RISK_RANGE": (0.05, 0.5),
+    "SEED": 42,
+    "PATH_CACHE_SIZE": 4096,
+    "LANDMARKS": 8,
+    "TREE_MIN_TARGETS": 3,   # route_pairs: fewer distinct targets -> point queries
+}
+
+# Everything a CSRMesh holds per edge / per slot, in snapshot order
+CSR_ARRAYS = ("eu", "ev", "distance", "risk", "cost", "indptr", "indices", "slot_edge")
+
+logger = logging.getLogger("Nexus-Mesh")
+
+
+class NoPathError(LookupError):
+    """Raised when target is unreachable from source."""
+
+
+# =========================
+# NAME TABLE
+# =========================
+
+class NameTable(Sequence):
+    """
+    Integer node ID <-> city name.
+
+    Names are formatted on demand (``fmt.format(id + offset)``) unless an
+    explicit ``names`` list is given, so a 10^6-node mesh stores no strings.
+    """
+
+    def __init__(self, n: int, fmt: str = MESH_CONFIG["NAME_FORMAT"],
+                 offset: int = MESH_CONFIG["NAME_OFFSET"],
+                 names: Optional[List[str]] = None):
+        self.n = n
+        self.fmt = fmt
+        self.offset = offset
+        self.names = list(names) if names is not None else None
+        self._ids: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self.n))]
+        i = int(idx)
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError(f"node id {idx} out of range for {self.n} nodes")
+        if self.names is not None:
+            return self.names[i]
+        return self.fmt.format(i + self.offset)
+
+    def __contains__(self, name) -> bool:
+        try:
+            self.id(name)
+            return True
+        except KeyError:
+            return False
+
+    def id(self, name) -> int:
+        """Name -> integer ID. Integer IDs pass straight through."""
+        if isinstance(name, (int, np.integer)):
+            if 0 <= name < self.n:
+                return int(name)
+            raise KeyError(name)
+
+        if self.names is not None:
+            if self._ids is None:
+                self._ids = {label: i for i, label in enumerate(self.names)}
+            return self._ids[name]
+
+        prefix, _, suffix = self.fmt.partition("{}")
+        if not (name.startswith(prefix) and name.endswith(suffix)):
+            raise KeyError(name)
+        try:
+            i = int(name[len(prefix):len(name) - len(suffix)]) - self.offset
+        except ValueError:
+            raise KeyError(name) from None
+        if not 0 <= i < self.n:
+            raise KeyError(name)
+        return i
+
+    def ids(self, names) -> np.ndarray:
+        return np.fromiter((self.id(name) for name in names), dtype=np.int64)
+
+
+# =========================
+# VECTORIZED GENERATION
+# =========================
+
+def gnp_edges(n: int, p: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Erdős–Rényi G(n, p) edge list as ``(u, v)`` int64 arrays, u > v.
+
+    Uses geometric skipping over the n(n-1)/2 candidate pairs, drawn in
+    vectorized batches, so cost is O(m) rather than O(n^2).
+    """
+    total = n * (n - 1) // 2
+    if total == 0 or p <= 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+
+    if p >= 1:
+        k = np.arange(total, dtype=np.int64)
+    else:
+        expected = total * p
+        batch = int(expected + 5 * np.sqrt(expected * (1 - p)) + 16)
+        parts = []
+        last = -1
+        while True:
+            gaps = rng.geometric(p, size=batch).astype(np.int64)
+            k = last + np.cumsum(gaps)
+            parts.append(k[k < total])
+            if k[-1] >= total:
+                break
+            last = int(k[-1])
+        k = np.concatenate(parts)
+
+    # Lower-triangle decode: k = u(u-1)/2 + v with 0 <= v < u.
+    u = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+    u -= (u * (u - 1) // 2) > k
+    u += ((u + 1) * u // 2) <= k
+    v = k - u * (u - 1) // 2
+    return u, v
+
+
+def connected_components(n: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    Vectorized union-find over an edge array (hook + pointer-jumping).
+
+    Returns ``root`` with ``root[i]`` the smallest node ID in i's component.
+    """
+    parent = np.arange(n, dtype=np.int64)
+    while True:
+        pu, pv = parent[u], parent[v]
+        lo, hi = np.minimum(pu, pv), np.maximum(pu, pv)
+        linked = lo != hi
+        if not linked.any():
+            return parent
+
+        # Hook: every root is pointed at the smallest root it touches.
+        np.minimum.at(parent, hi[linked], lo[linked])
+
+        # Compress: jump pointers until every node points at its root.
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+
+
+def heal_edges(n: int, u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Auto-heal connectivity in a single pass: link consecutive component
+    representatives. Returns ``(u, v, components_before)``.
+    """
+    if n == 0:
+        return u, v, 0
+    roots = np.unique(connected_components(n, u, v))
+    if len(roots) > 1:
+        u = np.concatenate([u, roots[1:]])
+        v = np.concatenate([v, roots[:-1]])
+    return u, v, len(roots)
+
+
+def draw_edge_attributes(m: int, rng: np.random.Generator,
+                         distance_range: Tuple[int, int] = MESH_CONFIG["DISTANCE_RANGE"],
+                         risk_range: Tuple[float, float] = MESH_CONFIG["RISK_RANGE"]
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+    """One batched draw per attribute: integer distance, uniform risk."""
+    distance = rng.integers(*distance_range, size=m)
+    risk = rng.uniform(*risk_range, size=m)
+    return distance, risk
+
+
+# =========================
+# CSR MESH
+# =========================
+
+class CSRMesh:
+    """
+    Array-backed resilient mesh.
+
+    Undirected edges live once in ``eu``/``ev`` with float32 ``distance``,
+    ``risk`` and ``cost`` columns. Adjacency is CSR over both directions:
+    ``indices[indptr[i]:indptr[i + 1]]`` are i's neighbours and
+    ``slot_edge`` maps each adjacency slot back to its edge ID.
+    """
+
+    backend = "csr"
+
+    def __init__(self, n: int, eu: np.ndarray, ev: np.ndarray,
+                 distance: np.ndarray, risk: np.ndarray,
+                 names: Optional[NameTable] = None):
+        self.n = n
+        self.eu = np.asarray(eu, dtype=np.int32)
+        self.ev = np.asarray(ev, dtype=np.int32)
+        self.distance = np.asarray(distance, dtype=np.float32)
+        self.risk = np.asarray(risk, dtype=np.float32)
+        self.cost = self.distance * (1 + self.risk)
+        self.cities = names if names is not None else NameTable(n)
+        self._build_csr()
+        self._reset_state()
+
+    def _reset_state(self):
+        self.version = 0
+        self._adjacency: Dict[str, tuple] = {}
+        self._edge_slots: Optional[np.ndarray] = None
+        self.landmarks: Optional["Landmarks"] = None
+        self.ch = None   # nexus_ch.ContractionHierarchy, valid at one version
+
+    @classmethod
+    def from_arrays(cls, n: int, arrays: Dict[str, np.ndarray],
+                    names: Optional[NameTable] = None) -> "CSRMesh":
+        """
+        Wrap prebuilt ``CSR_ARRAYS`` as-is (no copy, no CSR rebuild), e.g.
+        memory-mapped snapshot buffers.
+        """
+        mesh = cls.__new__(cls)
+        mesh.n = n
+        for name in CSR_ARRAYS:
+            setattr(mesh, name, arrays[name])
+        mesh.cities = names if names is not None else NameTable(n)
+        mesh._reset_state()
+        return mesh
+
+    @classmethod
+    @timed("mesh_build")
+    def generate(cls, n: int, p: float, seed: int = MESH_CONFIG["SEED"],
+                 heal: bool = True, names: Optional[NameTable] = None,
+                 distance_range=MESH_CONFIG["DISTANCE_RANGE"],
+                 risk_range=MESH_CONFIG["RISK_RANGE"],
+                 landmarks: int = 0, landmark_weight: str = "cost") -> "CSRMesh":
+        """
+        Seeded G(n, p) mesh. ``landmarks > 0`` also precomputes ALT tables
+        on ``landmark_weight``, enabling bidirectional A* queries.
+        """
+        rng = np.random.default_rng(seed)
+        u, v = gnp_edges(n, p, rng)
+        if heal:
+            u, v, components = heal_edges(n, u, v)
+            if components > 1:
+                logger.warning(f"Disconnected mesh detected. Healed {components} components.")
+        distance, risk = draw_edge_attributes(len(u), rng, distance_range, risk_range)
+        mesh = cls(n, u, v, distance, risk, names=names)
+        if landmarks:
+            mesh.landmarks = Landmarks.build(mesh, landmarks, landmark_weight, seed=seed)
+        return mesh
+
+    def _build_csr(self):
+        m = len(self.eu)
+        src = np.concatenate([self.eu, self.ev])
+        dst = np.concatenate([self.ev, self.eu])
+        edge = np.concatenate([np.arange(m), np.arange(m)]).astype(np.int64)
+
+        order = np.argsort(src, kind="stable")
+        self.indices = dst[order].astype(np.int32)
+        self.slot_edge = edge[order]
+        self.indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=self.n), out=self.indptr[1:])
+
+    # ---------- mutation ----------
+
+    def set_edge_attributes(self, u, v, **attrs):
+        """
+        Update ``distance`` and/or ``risk`` on one edge; ``cost`` is
+        re-derived. Bumps ``version`` so cached routes are invalidated.
+        """
+        e = self.edge_id(u, v)
+        before = self._landmark_column(np.array([e]))
+        for name in ("distance", "risk"):
+            if name in attrs:
+                getattr(self, name)[e] = attrs.pop(name)
+        if attrs:
+            raise KeyError(f"Unsupported edge attributes: {sorted(attrs)}")
+        self.cost[e] = self.distance[e] * (1 + self.risk[e])
+        self._patch_adjacency(np.array([e]))
+        self._check_landmarks(np.array([e]), before)
+        self.version += 1
+
+    def update_risk(self, pairs, risk) -> Dict[str, Any]:
+        """
+        Set ``risk`` (scalar or per-edge array) on many edges at once and
+        re-derive ``cost``. Returns an edge-change record for
+        ``ShortestPathTree.repair``.
+        """
+        edges = np.array([self.edge_id(u, v) for u, v in pairs], dtype=np.int64)
+        old = {c: getattr(self, c)[edges].astype(np.float64) for c in TREE_COLUMNS}
+        before = self._landmark_column(edges)
+
+        self.risk[edges] = risk
+        self.cost[edges] = self.distance[edges] * (1 + self.risk[edges])
+        self._patch_adjacency(edges)
+        self._check_landmarks(edges, before)
+        self.version += 1
+
+        return {
+            "u": self.eu[edges].astype(np.int64),
+            "v": self.ev[edges].astype(np.int64),
+            "old": old,
+            "new": {c: getattr(self, c)[edges].astype(np.float64) for c in TREE_COLUMNS},
+            "version": self.version,
+        }
+
+    def _landmark_column(self, edges: np.ndarray) -> Optional[np.ndarray]:
+        if self.landmarks is None:
+            return None
+        return getattr(self, self.landmarks.weight)[edges].astype(np.float64)
+
+    def _check_landmarks(self, edges: np.ndarray, before: Optional[np.ndarray]):
+        """
+        Landmark bounds survive weight increases; any decrease can make
+        them overestimate, so the tables are dropped (plain Dijkstra).
+        """
+        if self.landmarks is None or before is None:
+            return
+        after = getattr(self, self.landmarks.weight)[edges]
+        if np.any(after < before):
+            logger.warning("Edge weight decreased; dropping stale landmark tables.")
+            self.landmarks = None
+
+    # ---------- graph views ----------
+
+    def number_of_nodes(self) -> int:
+        return self.n
+
+    def number_of_edges(self) -> int:
+        return len(self.eu)
+
+    def edge_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.eu, self.ev
+
+    def edge_column(self, column: str) -> np.ndarray:
+        """Per-edge ``column`` aligned with ``edge_index``."""
+        return getattr(self, column)
+
+    def node_ids(self, names) -> np.ndarray:
+        return self.cities.ids(names)
+
+    def neighbors(self, node) -> np.ndarray:
+        i = self.cities.id(node)
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def edge_id(self, u, v) -> int:
+        i, j = self.cities.id(u), self.cities.id(v)
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        hits = np.flatnonzero(self.indices[lo:hi] == j)
+        if not len(hits):
+            raise KeyError((u, v))
+        return int(self.slot_edge[lo + hits[0]])
+
+    def edge_weight(self, u, v, weight: str = "cost") -> float:
+        return float(getattr(self, weight)[self.edge_id(u, v)])
+
+    def path_weight(self, path, weight: str = "cost") -> float:
+        column = getattr(self, weight)
+        return sum(
+            float(column[self.edge_id(a, b)]) for a, b in zip(path, path[1:])
+        )
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        names = self.cities
+        return ((names[a], names[b]) for a, b in zip(self.eu.tolist(), self.ev.tolist()))
+
+    def to_networkx(self):
+        """Materialize as ``networkx.Graph`` (visualization / small meshes)."""
+        import networkx as nx
+
+        G = nx.Graph()
+        names = self.cities
+        G.add_nodes_from(names[i] for i in range(self.n))
+        G.add_edges_from(
+            (names[a], names[b], {"distance": float(d), "risk": float(r), "cost": float(c)})
+            for a, b, d, r, c in zip(
+                self.eu.tolist(), self.ev.tolist(),
+                self.distance, self.risk, self.cost,
+            )
+        )
+        return G
+
+    # ---------- routing ----------
+
+    def adjacency(self, weight: str = "cost") -> tuple:
+        """
+        Python-list CSR view for the heap loop, cached per weight.
+        Edge mutations patch the cached weights in place.
+        """
+        cached = self._adjacency.get(weight)
+        if cached is None:
+            structure = next(iter(self._adjacency.values()), None)
+            if structure is None:
+                structure = (self.indptr.tolist(), self.indices.tolist())
+            slot_weight = getattr(self, weight)[self.slot_edge]
+            cached = structure[:2] + (slot_weight.astype(np.float64).tolist(),)
+            self._adjacency[weight] = cached
+        return cached
+
+    def edge_slots(self, edges: np.ndarray) -> np.ndarray:
+        """Both CSR slots of every edge ID, shape (len(edges), 2)."""
+        if self._edge_slots is None:
+            self._edge_slots = np.argsort(self.slot_edge, kind="stable").reshape(-1, 2)
+        return self._edge_slots[np.asarray(edges, dtype=np.int64)]
+
+    def _patch_adjacency(self, edges: np.ndarray):
+        if not self._adjacency:
+            return
+        slots = self.edge_slots(edges).ravel()
+        edge_of_slot = self.slot_edge[slots]
+        for weight, (_, _, weights) in self._adjacency.items():
+            values = getattr(self, weight)[edge_of_slot].astype(np.float64)
+            for slot, value in zip(slots.tolist(), values.tolist()):
+                weights[slot] = value
+
+    def adjacent(self, u: int, weight: str = "cost") -> Iterator[Tuple[int, float]]:
+        """``(neighbour, weight)`` pairs of integer node ``u``."""
+        indptr, indices, weights = self.adjacency(weight)
+        for slot in range(indptr[u], indptr[u + 1]):
+            yield indices[slot], weights[slot]
+
+    def edge_value(self, u: int, v: int, column: str) -> float:
+        return float(getattr(self, column)[self.edge_id(u, v)])
+
+    @timed("dijkstra")
+    def search(self, source: int, target: Optional[int] = None,
+               weight: str = "cost") -> Tuple[Dict[int, float], Dict[int, int]]:
+        """
+        Dijkstra from integer ``source``. Stops once ``target`` is settled.
+
+        Returns settled distances and, per reached node, the CSR slot of
+        the tree edge into it (-1 for the source).
+        """
+        indptr, indices, weights = self.adjacency(weight)
+        dist = {source: 0.0}
+        pred_slot = {source: -1}
+        done = set()
+        heap = [(0.0, source)]
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            if u == target:
+                break
+            for slot in range(indptr[u], indptr[u + 1]):
+                v = indices[slot]
+                nd = d + weights[slot]
+                if nd < dist.get(v, float("inf")):
+                    dist[v] = nd
+                    pred_slot[v] = slot
+                    heapq.heappush(heap, (nd, v))
+
+        return {u: dist[u] for u in done}, pred_slot
+
+    def uses_landmarks(self, weight: str) -> bool:
+        return self.landmarks is not None and self.landmarks.weight == weight
+
+    @timed("alt_search")
+    def search_alt(self, s: int, t: int, weight: str = "cost",
+                   stats: Optional[Dict[str, int]] = None):
+        """
+        Bidirectional A* with landmark (ALT) potentials.
+
+        Both sides use the averaged potential ``p = (pi_t - pi_s) / 2``
+        (reversed sign backwards), so they stay consistent and the search
+        stops once the two queue minima sum to the best meeting cost.
+        Returns ``(total, slots, path)`` - CSR slots and node IDs in path
+        order - or ``(inf, None, None)`` when ``t`` is unreachable.
+        ``stats["settled"]`` counts node expansions.
+        """
+        inf = float("inf")
+        if s == t:
+            return 0.0, [], [s]
+        p = self.landmarks.potential(s, t)
+        if p is None:
+            return inf, None, None
+        indptr, indices, weights = self.adjacency(weight)
+
+        dist = ({s: 0.0}, {t: 0.0})
+        pred = ({s: -1}, {t: -1})
+        sign = (1.0, -1.0)
+        heaps = ([(p[s], s)], [(-p[t], t)])
+        best, meet, settled = inf, None, 0
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            key, u = heapq.heappop(heaps[side])
+            here, there = dist[side], dist[1 - side]
+            du = here[u]
+            if key > du + sign[side] * p[u]:
+                continue   # stale entry
+            settled += 1
+
+            for slot in range(indptr[u], indptr[u + 1]):
+                v = indices[slot]
+                nd = du + weights[slot]
+                if nd < here.get(v, inf):
+                    here[v] = nd
+                    pred[side][v] = slot
+                    heapq.heappush(heaps[side], (nd + sign[side] * p[v], v))
+                    if v in there and nd + there[v] < best:
+                        best, meet = nd + there[v], v
+
+        if stats is not None:
+            stats["settled"] = stats.get("settled", 0) + settled
+        if meet is None:
+            return inf, None, None
+
+        # Forward half: pred slots point into each node from the source side
+        head, slots = [meet], []
+        while head[-1] != s:
+            slot = pred[0][head[-1]]
+            slots.append(slot)
+            head.append(bisect.bisect_right(indptr, slot) - 1)
+        head.reverse()
+        slots.reverse()
+        # Backward half: pred slots sit in the row of the next hop to t
+        node = meet
+        while node != t:
+            slot = pred[1][node]
+            slots.append(slot)
+            node = bisect.bisect_right(indptr, slot) - 1
+            head.append(node)
+        return best, slots, head
+
+    def slot_source(self, slots: np.ndarray) -> np.ndarray:
+        """Owning row (edge tail) of each CSR slot."""
+        return np.searchsorted(self.indptr, slots, side="right") - 1
+
+    def route_edges(self, s: int, t: int, weight: str = "cost") -> Tuple[float, np.ndarray]:
+        """
+        Point-to-point query on integer IDs: ``(total weight, edge IDs)``
+        along the path, for callers that aggregate edge columns directly.
+        """
+        if self.ch is not None and self.ch.matches(self, weight):
+            total, _, edges = self.ch.query(s, t)
+            if edges is None:
+                raise NoPathError(f"No path between {s} and {t}")
+            return total, np.array(edges, dtype=np.int64)
+
+        if self.uses_landmarks(weight):
+            total, slots, _ = self.search_alt(s, t, weight)
+            if slots is None:
+                raise NoPathError(f"No path between {s} and {t}")
+            return total, self.slot_edge[np.array(slots, dtype=np.int64)]
+
+        dist, pred_slot = self.search(s, t, weight)
+        if t not in dist:
+            raise NoPathError(f"No path between {s} and {t}")
+
+        indptr = self.adjacency(weight)[0]
+        slots = []
+        node = t
+        while node != s:
+            slot = pred_slot[node]
+            slots.append(slot)
+            node = bisect.bisect_right(indptr, slot) - 1
+        return dist[t], self.slot_edge[np.array(slots[::-1], dtype=np.int64)]
+
+    def shortest_path(self, source, target, weight: str = "cost") -> list:
+        s, t = self.cities.id(source), self.cities.id(target)
+        if self.ch is not None and self.ch.matches(self, weight):
+            _, path, _ = self.ch.query(s, t)
+            if path is None:
+                raise NoPathError(f"No path between {source} and {target}")
+            names = self.cities
+            return [names[i] for i in path]
+
+        if self.uses_landmarks(weight):
+            _, slots, path = self.search_alt(s, t, weight)
+            if path is None:
+                raise NoPathError(f"No path between {source} and {target}")
+            names = self.cities
+            return [names[i] for i in path]
+
+        dist, pred_slot = self.search(s, t, weight)
+        if t not in dist:
+            raise NoPathError(f"No path between {source} and {target}")
+
+        indptr = self.adjacency(weight)[0]
+        path = [t]
+        while path[-1] != s:
+            path.append(bisect.bisect_right(indptr, pred_slot[path[-1]]) - 1)
+        names = self.cities
+        return [names[i] for i in reversed(path)]
+
+    def tree(self, source, weight: str = "cost") -> "ShortestPathTree":
+        """Full single-source shortest-path tree over integer IDs."""
+        s = self.cities.id(source)
+        dist, pred_slot = self.search(s, None, weight)
+
+        nodes = np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))
+        slots = np.fromiter((pred_slot[u] for u in dist), dtype=np.int64, count=len(dist))
+        tree_nodes, tree_slots = nodes[slots >= 0], slots[slots >= 0]
+        tree_edges = self.slot_edge[tree_slots]
+
+        dist_arr = np.full(self.n, np.inf)
+        dist_arr[nodes] = np.fromiter(dist.values(), dtype=np.float64, count=len(dist))
+        pred = np.full(self.n, -1, dtype=np.int64)
+        pred[tree_nodes] = self.slot_source(tree_slots)
+
+        edge_attrs = {}
+        for column in TREE_COLUMNS:
+            values = np.zeros(self.n)
+            values[tree_nodes] = getattr(self, column)[tree_edges]
+            edge_attrs[column] = values
+
+        return ShortestPathTree(
+            s, dist_arr, pred, edge_attrs, self.cities, self.cities.id,
+            weight=weight, version=self.version,
+        )
+
+
+# =========================
+# LANDMARKS (ALT)
+# =========================
+
+class Landmarks:
+    """
+    Landmark distance tables for A* lower bounds.
+
+    ``table[v, i]`` is the shortest ``weight`` distance between node ``v``
+    and landmark ``nodes[i]`` (undirected; ``inf`` when unreachable),
+    stored float32 and rounded down. ``slack`` absorbs the remaining
+    rounding in differences, so bounds never overestimate.
+    """
+
+    def __init__(self, nodes: np.ndarray, table: np.ndarray, weight: str = "cost",
+                 slack: Optional[float] = None):
+        self.nodes = np.asarray(nodes, dtype=np.int64)
+        self.table = np.asarray(table, dtype=np.float32)
+        self.weight = weight
+        if slack is None:
+            finite = self.table[np.isfinite(self.table)]
+            slack = 2 * float(np.spacing(finite.max())) if finite.size else 0.0
+        self.slack = slack
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes + self.nodes.nbytes
+
+    @classmethod
+    @timed("landmark_build")
+    def build(cls, mesh: "CSRMesh", k: int = MESH_CONFIG["LANDMARKS"],
+              weight: str = "cost", seed: int = MESH_CONFIG["SEED"]) -> "Landmarks":
+        """
+        Farthest-point selection: each landmark is the node farthest from
+        the ones already chosen (min over them). One full Dijkstra per
+        landmark; nodes unreachable from every landmark are never picked.
+        """
+        n = mesh.number_of_nodes()
+        k = max(1, min(k, n))
+
+        def column(source):
+            dist, _ = mesh.search(source, None, weight)
+            out = np.full(n, np.inf)
+            out[np.fromiter(dist.keys(), np.int64, len(dist))] = np.fromiter(
+                dist.values(), np.float64, len(dist))
+            return out
+
+        # The node farthest from a random start seeds the selection
+        nearest = column(int(np.random.default_rng(seed).integers(n)))
+        nodes, columns = [], []
+        for _ in range(k):
+            score = np.where(np.isfinite(nearest), nearest, -1.0)
+            score[nodes] = -2.0
+            chosen = int(np.argmax(score))
+            dist = column(chosen)
+            nodes.append(chosen)
+            columns.append(dist)
+            nearest = dist if len(nodes) == 1 else np.minimum(nearest, dist)
+
+        exact = np.stack(columns, axis=1)
+        table = exact.astype(np.float32)
+        # Round down so every stored distance is a lower bound
+        over = table.astype(np.float64) > exact
+        table[over] = np.nextafter(table[over], np.float32(-np.inf))
+        return cls(np.array(nodes), table, weight)
+
+    def potential(self, s: int, t: int) -> Optional["_Potential"]:
+        """
+        Lazy averaged potential ``p(v) = (pi_t(v) - pi_s(v)) / 2`` with
+        ``pi_x(v) = max_i |table[v, i] - table[x, i]|``, computed per node
+        on first use. Only landmarks reaching both ends contribute.
+        Returns ``None`` when the tables prove ``t`` unreachable from ``s``.
+        """
+        ds, dt = self.table[s].tolist(), self.table[t].tolist()
+        inf = float("inf")
+        live = []
+        for i, (a, b) in enumerate(zip(ds, dt)):
+            if (a == inf) != (b == inf):
+                return None   # one landmark reaches exactly one end
+            if a != inf:
+                live.append(i)
+        if len(live) == len(ds):
+            live = None
+        else:
+            ds, dt = [ds[i] for i in live], [dt[i] for i in live]
+        return _Potential(self.table, live, ds, dt, self.slack)
+
+    def save(self, path) -> None:
+        np.savez(path, nodes=self.nodes, table=self.table, weight=np.array(self.weight))
+
+    @classmethod
+    def load(cls, path) -> "Landmarks":
+        with np.load(path) as data:
+            return cls(data["nodes"], data["table"], str(data["weight"]))
+
+
+class _Potential(dict):
+    """Per-query node potential cache; missing nodes are computed once."""
+
+    __slots__ = ("table", "live", "ds", "dt", "slack")
+
+    def __init__(self, table, live, ds, dt, slack):
+        super().__init__()
+        self.table, self.live, self.ds, self.dt, self.slack = table, live, ds, dt, slack
+
+    def __missing__(self, v):
+        row = self.table[v].tolist()
+        if self.live is not None:
+            row = [row[i] for i in self.live]
+        pi_t = max([abs(a - b) for a, b in zip(row, self.dt)], default=0.0) - self.slack
+        pi_s = max([abs(a - b) for a, b in zip(row, self.ds)], default=0.0) - self.slack
+        value = (max(pi_t, 0.0) - max(pi_s, 0.0)) / 2
+        self[v] = value
+        return value
+
+
+
+# =========================
+# SHORTEST-PATH TREES
+# =========================
+
+TREE_COLUMNS = ("distance", "risk", "cost")
+
+
+class ShortestPathTree:
+    """
+    One Dijkstra's worth of routing state for a single source.
+
+    ``dist``/``pred`` are dense arrays over integer node IDs (``inf`` /
+    ``-1`` where unreachable). ``edge_attrs[col][v]`` is ``col`` on the
+    tree edge into ``v``. Per-target path sums for every column are
+    computed once, by pointer doubling, and then served as arrays.
+    """
+
+    def __init__(self, source: int, dist: np.ndarray, pred: np.ndarray,
+                 edge_attrs: Dict[str, np.ndarray], names, index,
+                 weight: str = "cost", version: int = 0):
+        self.source = source
+        self.dist = dist
+        self.pred = pred
+        self.edge_attrs = edge_attrs
+        self.names = names
+        self.index = index
+        self.weight = weight
+        self.version = version
+        self._sums: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def reachable(self) -> np.ndarray:
+        return np.isfinite(self.dist)
+
+    def sums(self) -> Dict[str, np.ndarray]:
+        """Root-to-node totals for every edge column plus ``hops``."""
+        if self._sums is None:
+            n = len(self.pred)
+            anc = np.where(self.pred >= 0, self.pred, np.arange(n))
+            columns = list(self.edge_attrs)
+            acc = np.vstack(
+                [self.edge_attrs[c] for c in columns] + [(self.pred >= 0).astype(np.float64)]
+            )
+
+            # List ranking: each round doubles the span every node has summed.
+            # Roots and unreachable nodes point at themselves with zero weight.
+            while True:
+                acc += acc[:, anc]
+                grand = anc[anc]
+                if np.array_equal(grand, anc):
+                    break
+                anc = grand
+
+            unreachable = ~self.reachable
+            acc[:, unreachable] = np.nan
+            self._sums = dict(zip(columns + ["hops"], acc))
+        return self._sums
+
+    def query(self, targets) -> Dict[str, np.ndarray]:
+        """Columnar answers for many targets from this one tree."""
+        ids = np.fromiter((self.index(t) for t in targets), dtype=np.int64)
+        sums = self.sums()
+        result = {"target": ids, "reachable": self.reachable[ids]}
+        for column, values in sums.items():
+            result[column] = values[ids]
+        return result
+
+    def children(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Child CSR of the tree: ``kids[ptr[u]:ptr[u + 1]]``."""
+        n = len(self.pred)
+        has_parent = np.flatnonzero(self.pred >= 0)
+        parents = self.pred[has_parent]
+        order = np.argsort(parents, kind="stable")
+        ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents, minlength=n), out=ptr[1:])
+        return ptr, has_parent[order]
+
+    def repair(self, mesh, change: Dict[str, Any]) -> int:
+        """
+        Incrementally repair this tree after ``mesh.update_risk``.
+
+        Dynamic SSSP in the Ramalingam-Reps style: only the subtrees
+        hanging below tree edges whose weight increased are invalidated,
+        re-seeded from their intact neighbours, and re-settled; edges
+        whose weight decreased seed a relaxation wave from their better
+        endpoint. Nodes outside the changed region are never touched by
+        the search. Returns the number of nodes re-settled.
+        """
+        dist, pred = self.dist, self.pred
+        u, v = change["u"], change["v"]
+        old_w, new_w = change["old"][self.weight], change["new"][self.weight]
+
+        # 1. Invalidate subtrees below increased tree edges.
+        roots = []
+        for a, b, before, after in zip(u.tolist(), v.tolist(), old_w.tolist(), new_w.tolist()):
+            if after > before:
+                if pred[b] == a:
+                    roots.append(b)
+                elif pred[a] == b:
+                    roots.append(a)
+
+        affected = np.zeros(len(pred), dtype=bool)
+        if roots:
+            ptr, kids = self.children()
+            stack = list(set(roots))
+            while stack:
+                node = stack.pop()
+                if affected[node]:
+                    continue
+                affected[node] = True
+                stack.extend(kids[ptr[node]:ptr[node + 1]].tolist())
+
+        stale = np.flatnonzero(affected)
+        dist[stale] = np.inf
+        pred[stale] = -1
+
+        # 2. Seed: invalidated nodes from intact neighbours, plus decreased edges.
+        heap = []
+        for node in stale.tolist():
+            for nbr, w in mesh.adjacent(node, self.weight):
+                if not affected[nbr] and dist[nbr] + w < dist[node]:
+                    dist[node] = dist[nbr] + w
+                    pred[node] = nbr
+            if np.isfinite(dist[node]):
+                heap.append((float(dist[node]), node))
+
+        for a, b, before, after in zip(u.tolist(), v.tolist(), old_w.tolist(), new_w.tolist()):
+            if after < before:
+                for x, y in ((a, b), (b, a)):
+                    if dist[x] + after < dist[y]:
+                        dist[y] = dist[x] + after
+                        pred[y] = x
+                        heap.append((float(dist[y]), y))
+        heapq.heapify(heap)
+
+        # 3. Re-settle only what the seeds can improve.
+        touched = set(stale.tolist())
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist[node]:
+                continue
+            touched.add(node)
+            for nbr, w in mesh.adjacent(node, self.weight):
+                if d + w < dist[nbr]:
+                    dist[nbr] = d + w
+                    pred[nbr] = node
+                    heapq.heappush(heap, (d + w, nbr))
+
+        # 4. Refresh tree-edge columns for re-parented nodes and changed tree edges.
+        for a, b in zip(u.tolist(), v.tolist()):
+            if pred[b] == a:
+                touched.add(b)
+            elif pred[a] == b:
+                touched.add(a)
+        for node in touched:
+            parent = pred[node]
+            for column, values in self.edge_attrs.items():
+                values[node] = mesh.edge_value(parent, node, column) if parent >= 0 else 0.0
+
+        self.version = change["version"]
+        self._sums = None
+        return len(touched)
+
+    def path_ids(self, target) -> Optional[List[int]]:
+        t = self.index(target)
+        if not np.isfinite(self.dist[t]):
+            return None
+        path = [t]
+        while path[-1] != self.source:
+            path.append(int(self.pred[path[-1]]))
+        path.reverse()
+        return path
+
+    def path(self, target) -> Optional[list]:
+        ids = self.path_ids(target)
+        return None if ids is None else [self.names[i] for i in ids]
+
+
+@timed("dijkstra")
+def nx_shortest_path_tree(G, source, weight: str = "cost", nodes=None,
+                          columns=TREE_COLUMNS, version: int = 0) -> ShortestPathTree:
+    """
+    ``ShortestPathTree`` for a ``networkx`` graph. ``nodes`` fixes the
+    integer ID order (default: ``G.nodes`` order).
+    """
+    import networkx as nx
+
+    nodes = list(G.nodes) if nodes is None else list(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    preds, dist = nx.dijkstra_predecessor_and_distance(G, source, weight=weight)
+
+    n = len(nodes)
+    dist_arr = np.full(n, np.inf)
+    pred = np.full(n, -1, dtype=np.int64)
+    edge_attrs = {column: np.zeros(n) for column in columns}
+    for node, d in dist.items():
+        v = index[node]
+        dist_arr[v] = d
+        if preds[node]:
+            parent = preds[node][0]
+            pred[v] = index[parent]
+            data = G[parent][node]
+            for column in columns:
+                edge_attrs[column][v] = data[column]
+
+    return ShortestPathTree(
+        index[source], dist_arr, pred, edge_attrs, nodes, index.__getitem__,
+        weight=weight, version=version,
+    )
+
+
+def route_pairs(pairs, tree_for, skip=(), with_paths: bool = False, point=None,
+                tree_min_targets: int = MESH_CONFIG["TREE_MIN_TARGETS"]) -> Dict[str, Any]:
+    """
+    Columnar answers for many ``(source, target)`` pairs.
+
+    Pairs are grouped by source and ``tree_for(source)`` is called once
+    per distinct source. A full tree only pays off when several targets
+    share it: with ``point``, sources with fewer than ``tree_min_targets``
+    distinct targets are answered by ``point(source, target)`` instead,
+    which returns ``(columns, path)`` or ``None`` when unreachable.
+    Indices in ``skip`` are left unreachable / NaN for the caller to
+    fill. Result columns are aligned to ``pairs``.
+    """
+    pairs = [tuple(pair) for pair in pairs]
+    k = len(pairs)
+    skip = set(skip)
+
+    groups: Dict[Any, List[int]] = {}
+    for i, (source, _) in enumerate(pairs):
+        if i not in skip:
+            groups.setdefault(source, []).append(i)
+
+    result: Dict[str, Any] = {
+        "source": [pair[0] for pair in pairs],
+        "target": [pair[1] for pair in pairs],
+        "reachable": np.zeros(k, dtype=bool),
+    }
+    if with_paths:
+        result["paths"] = [None] * k
+
+    for column in TREE_COLUMNS + ("hops",):
+        result[column] = np.full(k, np.nan)
+
+    for source, idx in groups.items():
+        targets = [pairs[i][1] for i in idx]
+        if point is not None and len(set(targets)) < tree_min_targets:
+            for i, target in zip(idx, targets):
+                answer = point(source, target)
+                if answer is None:
+                    continue
+                columns, path = answer
+                result["reachable"][i] = True
+                for column, value in columns.items():
+                    result[column][i] = value
+                if with_paths:
+                    result["paths"][i] = path
+            continue
+
+        tree = tree_for(source)
+        answer = tree.query(targets)
+        for column, values in answer.items():
+            if column == "target":
+                continue
+            if column not in result:
+                result[column] = np.full(k, np.nan)
+            result[column][idx] = values
+        if with_paths:
+            for i, target in zip(idx, targets):
+                result["paths"][i] = tree.path(target)
+
+    return result
+
+
+# =========================
+# MULTI-CRITERIA SEARCH
+# =========================
+
+class ParetoFront:
+    """
+    Non-dominated routes to one target under two objectives.
+
+    ``costs`` is (m, 2), sorted by increasing first objective (hence
+    decreasing second). Any weight vector picks its route in O(m).
+    """
+
+    def __init__(self, costs: np.ndarray, paths: List[list]):
+        self.costs = costs
+        self.paths = paths
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def best(self, w_first: float, w_second: float) -> int:
+        """Index of the min weighted-sum route; ties go to the lower first objective."""
+        return int(np.argmin(w_first * self.costs[:, 0] + w_second * self.costs[:, 1]))
+
+    def select(self, w_first: float, w_second: float) -> Tuple[list, float, float]:
+        i = self.best(w_first, w_second)
+        return self.paths[i], float(self.costs[i, 0]), float(self.costs[i, 1])
+
+
+@timed("pareto_search")
+def nx_pareto_fronts(G, source, targets=None,
+                     objectives=("distance", "risk")) -> Dict[Any, ParetoFront]:
+    """
+    Bi-objective label-setting search (Martins) on a ``networkx`` graph.
+
+    Labels are settled in lexicographic (first, second) order, so a label
+    is non-dominated at its node iff its second objective beats every
+    label already settled there; one float per node tracks that. Labels
+    that every target's front already dominates are pruned. Returns the
+    Pareto front to each target (every node when ``targets`` is None).
+    """
+    a, b = objectives
+    goal = None if targets is None else set(targets)
+
+    nodes = [source]
+    parent = [-1]
+    costs = [(0.0, 0.0)]
+    best: Dict[Any, float] = {}
+    settled: Dict[Any, List[int]] = {}
+    bound = np.inf
+
+    heap = [(0.0, 0.0, 0)]
+    while heap:
+        d, r, label = heapq.heappop(heap)
+        node = nodes[label]
+        if r >= best.get(node, np.inf) or r >= bound:
+            continue
+
+        best[node] = r
+        settled.setdefault(node, []).append(label)
+        if goal is not None and node in goal:
+            # Any label not beating the worst target front is dead
+            bound = max(best.get(t, np.inf) for t in goal)
+
+        for nbr, data in G.adj[node].items():
+            nr = r + data[b]
+            if nr >= best.get(nbr, np.inf) or nr >= bound:
+                continue
+            nodes.append(nbr)
+            parent.append(label)
+            costs.append((d + data[a], nr))
+            heapq.heappush(heap, (d + data[a], nr, len(nodes) - 1))
+
+    fronts = {}
+    for target in (settled if goal is None else goal):
+        labels = settled.get(target, [])
+        paths = []
+        for label in labels:
+            path = []
+            while label != -1:
+                path.append(nodes[label])
+                label = parent[label]
+            paths.append(path[::-1])
+        fronts[target] = ParetoFront(
+            np.array([costs[label] for label in labels], dtype=np.float64).reshape(-1, 2),
+            paths,
+        )
+    return fronts
+
+
+# =========================
+# ROUTE CACHE
+# =========================
+
+class PathCache:
+    """
+    LRU shortest-path cache tagged with the mesh topology version.
+
+    Entries carry the ``mesh.version`` they were computed at; a lookup at
+    any other version is an invalidation (counted, then treated as a miss).
+    """
+
+    def __init__(self, capacity: int = MESH_CONFIG["PATH_CACHE_SIZE"]):
+        self.capacity = capacity
+        self._entries: "OrderedDict[Hashable, Tuple[int, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: int) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == version:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+            del self._entries[key]
+            self.stats["invalidations"] += 1
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: Hashable, version: int, value: Any):
+        self._entries[key] = (version, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def items(self, version: Optional[int] = None) -> List[Tuple[Hashable, Any]]:
+        """Snapshot of ``(key, value)`` pairs, optionally only at ``version``."""
+        return [
+            (key, value) for key, (tagged, value) in self._entries.items()
+            if version is None or tagged == version
+        ]
+
+    def retag(self, key: Hashable, version: int):
+        """Mark an entry as valid at ``version`` (after an in-place repair)."""
+        self._entries[key] = (version, self._entries[key][1])
+
+    def clear(self):
+        self._entries.clear()
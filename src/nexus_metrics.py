@@ -0,0 +1,240 @@
+"""
+NEXUS CORE - HOT-PATH INSTRUMENTATION
+
+Low-overhead latency histograms shared by every engine.
+
+Pillars:
+1. HDR-style log-linear histograms (~1% relative precision, O(1) record)
+2. p50 / p99 / p999 per operation
+3. ``timed(name)`` context manager / decorator, a true no-op when disabled
+4. Prometheus text-format exporter
+
+Instrumentation is switched on with ``NEXUS_METRICS=1`` (or ``enable()``)
+*before* the engines are imported: decorators are resolved at import
+time, so disabled builds keep the undecorated functions. Histograms are
+per process; pool workers keep their own.
+"""
+
+import os
+import time
+import asyncio
+import functools
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+METRICS_CONFIG = {
+    "ENABLED": os.getenv("NEXUS_METRICS", "0") == "1",
+    "SUB_BUCKET_BITS": 7,
+    "QUANTILES": (0.5, 0.99, 0.999),
+    "EXPORT_PATH": os.getenv("NEXUS_METRICS_PATH", "nexus_metrics.prom"),
+}
+
+logger = logging.getLogger("Nexus-Metrics")
+
+
+def enable():
+    METRICS_CONFIG["ENABLED"] = True
+
+
+def disable():
+    METRICS_CONFIG["ENABLED"] = False
+
+
+def enabled() -> bool:
+    return METRICS_CONFIG["ENABLED"]
+
+
+# =========================
+# LATENCY HISTOGRAM
+# =========================
+
+class LatencyHistogram:
+    """
+    Log-linear nanosecond histogram in the HdrHistogram style.
+
+    Values below ``2**bits`` get exact buckets; above that each power of
+    two is split into ``2**(bits-1)`` linear sub-buckets, bounding the
+    relative error at ``2**-(bits-1)``.
+    """
+
+    def __init__(self, name: str, bits: int = METRICS_CONFIG["SUB_BUCKET_BITS"]):
+        self.name = name
+        self.bits = bits
+        self.half = 1 << (bits - 1)
+        self.counts = [0] * (self.half * (66 - bits))
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self._lock = threading.Lock()
+
+    def _lower(self, index: int) -> int:
+        if index < 2 * self.half:
+            return index
+        shift = index // self.half - 1
+        return (index - self.half * shift) << shift
+
+    def record(self, ns: int):
+        ns = int(ns)
+        shift = ns.bit_length() - self.bits
+        index = ns if shift <= 0 else self.half * shift + (ns >> shift)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ns += ns
+            if ns > self.max_ns:
+                self.max_ns = ns
+            if self.min_ns is None or ns < self.min_ns:
+                self.min_ns = ns
+
+    def quantile(self, q: float) -> float:
+        """Latency in seconds at quantile ``q`` (bucket midpoint)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(q * self.count)))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                lower = self._lower(index)
+                upper = self._lower(index + 1)
+                return min((lower + upper) / 2, self.max_ns) / 1e9
+        return self.max_ns / 1e9
+
+    def summary(self) -> Dict[str, float]:
+        out = {f"p{str(q * 100).rstrip('0').rstrip('.').replace('.', '')}": self.quantile(q)
+               for q in METRICS_CONFIG["QUANTILES"]}
+        out.update({
+            "count": self.count,
+            "mean": self.total_ns / self.count / 1e9 if self.count else 0.0,
+            "max": self.max_ns / 1e9,
+        })
+        return out
+
+
+METRICS: Dict[str, LatencyHistogram] = {}
+
+
+def histogram(name: str) -> LatencyHistogram:
+    hist = METRICS.get(name)
+    if hist is None:
+        hist = METRICS.setdefault(name, LatencyHistogram(name))
+    return hist
+
+
+# =========================
+# TIMERS
+# =========================
+
+class _Timer:
+
+    __slots__ = ("hist", "start")
+
+    def __init__(self, hist: LatencyHistogram):
+        self.hist = hist
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.record(time.perf_counter_ns() - self.start)
+        return False
+
+    def __call__(self, fn):
+        hist = self.hist
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    hist.record(time.perf_counter_ns() - start)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.record(time.perf_counter_ns() - start)
+        return wrapper
+
+
+class _NullTimer:
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __call__(self, fn):
+        return fn
+
+
+_NULL = _NullTimer()
+
+
+def timed(name: str):
+    """
+    ``with timed("op"):`` or ``@timed("op")``.
+
+    Disabled: returns a shared null timer and leaves decorated functions
+    untouched, so there is no wrapper on the hot path.
+    """
+    if not METRICS_CONFIG["ENABLED"]:
+        return _NULL
+    return _Timer(histogram(name))
+
+
+# =========================
+# EXPORT
+# =========================
+
+def report() -> Dict[str, Dict[str, float]]:
+    return {name: hist.summary() for name, hist in sorted(METRICS.items())}
+
+
+def export_prometheus(path: Optional[str] = None) -> Path:
+    """Write every histogram as a Prometheus ``summary`` (text format)."""
+    path = Path(path or METRICS_CONFIG["EXPORT_PATH"])
+    metric = "nexus_latency_seconds"
+    lines = [
+        f"# HELP {metric} Hot-path operation latency.",
+        f"# TYPE {metric} summary",
+    ]
+    for name, hist in sorted(METRICS.items()):
+        for q in METRICS_CONFIG["QUANTILES"]:
+            lines.append(f'{metric}{{op="{name}",quantile="{q}"}} {hist.quantile(q):.9f}')
+        lines.append(f'{metric}_sum{{op="{name}"}} {hist.total_ns / 1e9:.9f}')
+        lines.append(f'{metric}_count{{op="{name}"}} {hist.count}')
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+    return path
+
+
+def export_if_enabled(path: Optional[str] = None) -> Optional[Path]:
+    """Entry-point hook: export and log the summary only when enabled."""
+    if not METRICS_CONFIG["ENABLED"] or not METRICS:
+        return None
+    for name, stats in report().items():
+        logger.info(
+            f"{name}: n={stats['count']} p50={stats['p50'] * 1e3:.3f}ms "
+            f"p99={stats['p99'] * 1e3:.3f}ms p999={stats['p999'] * 1e3:.3f}ms"
+        )
+    return export_prometheus(path)
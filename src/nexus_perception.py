@@ -0,0 +1,310 @@
+"""
+NEXUS CORE - SHARED PERCEPTION CLIENT
+
+One async weather/risk client shared by every engine.
+
+Pillars:
+1. TTL cache keyed by (lat, lon)
+2. Single-flight coalescing of concurrent misses
+3. Stale-while-revalidate
+4. Pooled aiohttp connector
+5. Pluggable backends (Open-Meteo, local stub)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from nexus_metrics import timed
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+PERCEPTION_CONFIG = {
+    "WEATHER_URL": "https://api.open-meteo.com/v1/forecast",
+    "BACKEND": os.getenv("NEXUS_PERCEPTION_BACKEND", "open-meteo"),
+    "TTL_SECONDS": 60.0,
+    "STALE_SECONDS": 300.0,
+    "TIMEOUT": 5.0,
+    "POOL_LIMIT": 64,
+    "COORD_PRECISION": 2,
+    "STUB_WEATHER": {"temperature": 25.0, "windspeed": 10.0},
+    "BATCH_CONCURRENCY": 32,
+    "RISK_CAP": 0.4,
+    "FALLBACK_RISK": (0.1, 0.3),
+    "FALLBACK_SEED": 42,
+}
+
+logger = logging.getLogger("Nexus-Perception")
+
+Key = Tuple[float, float]
+
+
+class PerceptionError(RuntimeError):
+    """Raised when no fresh, stale or fallback reading is available."""
+
+
+# =========================
+# BACKENDS
+# =========================
+
+class OpenMeteoBackend:
+    """
+    Open-Meteo ``current_weather`` backend over one pooled session.
+    """
+
+    def __init__(
+        self,
+        url: str = PERCEPTION_CONFIG["WEATHER_URL"],
+        timeout: float = PERCEPTION_CONFIG["TIMEOUT"],
+        pool_limit: int = PERCEPTION_CONFIG["POOL_LIMIT"],
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.pool_limit = pool_limit
+        self._session = None
+
+    def _get_session(self):
+        # aiohttp is only needed once a real request is made
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_limit, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def fetch(self, lat: float, lon: float) -> Dict[str, float]:
+        params = {
+            "latitude": lat,
+            "longitude": lon,
+            "current_weather": "true",
+        }
+
+        async with self._get_session().get(self.url, params=params) as resp:
+            if resp.status != 200:
+                raise PerceptionError(f"Weather API returned HTTP {resp.status}")
+            data = await resp.json()
+            return data["current_weather"]
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class StubBackend:
+    """
+    Local, network-free backend for tests, benchmarks and offline runs.
+    """
+
+    def __init__(
+        self,
+        weather: Optional[Dict[str, float]] = None,
+        fn: Optional[Callable[[float, float], Dict[str, float]]] = None,
+        delay: float = 0.0,
+    ):
+        self.weather = dict(weather or PERCEPTION_CONFIG["STUB_WEATHER"])
+        self.fn = fn
+        self.delay = delay
+        self.calls = 0
+
+    async def fetch(self, lat: float, lon: float) -> Dict[str, float]:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return dict(self.fn(lat, lon)) if self.fn else dict(self.weather)
+
+    async def close(self):
+        pass
+
+
+def default_backend(**kwargs):
+    """Backend selected by ``NEXUS_PERCEPTION_BACKEND`` (``open-meteo``/``stub``)."""
+    if PERCEPTION_CONFIG["BACKEND"] == "stub":
+        return StubBackend()
+    return OpenMeteoBackend(**kwargs)
+
+
+# =========================
+# RISK MODEL
+# =========================
+
+def wind_risk(weather: Dict[str, float]) -> float:
+    """Wind speed (km/h) -> routing risk in [0, RISK_CAP]."""
+    return min(weather["windspeed"] / 100, PERCEPTION_CONFIG["RISK_CAP"])
+
+
+def uniform_fallback(coords: np.ndarray, seed: int = PERCEPTION_CONFIG["FALLBACK_SEED"]) -> np.ndarray:
+    """Vectorized fallback: one reproducible U(FALLBACK_RISK) draw per region."""
+    low, high = PERCEPTION_CONFIG["FALLBACK_RISK"]
+    return np.random.default_rng(seed).uniform(low, high, size=len(coords))
+
+
+# =========================
+# CACHING CLIENT
+# =========================
+
+@dataclass
+class _Entry:
+    value: Dict[str, float]
+    fetched_at: float
+
+
+class PerceptionClient:
+    """
+    Async TTL-cached perception client.
+
+    - Fresh hit (age < ttl): served from cache.
+    - Stale hit (age < ttl + stale): served from cache while one
+      background refresh revalidates the entry.
+    - Miss: one upstream fetch per key, shared by all concurrent callers.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttl: float = PERCEPTION_CONFIG["TTL_SECONDS"],
+        stale: float = PERCEPTION_CONFIG["STALE_SECONDS"],
+        precision: int = PERCEPTION_CONFIG["COORD_PRECISION"],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.backend = backend if backend is not None else default_backend()
+        self.ttl = ttl
+        self.stale = stale
+        self.precision = precision
+        self.clock = clock
+
+        self._cache: Dict[Key, _Entry] = {}
+        self._inflight: Dict[Key, asyncio.Task] = {}
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    async def __aenter__(self) -> "PerceptionClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+        await self.backend.close()
+
+    def key(self, lat: float, lon: float) -> Key:
+        return (round(float(lat), self.precision), round(float(lon), self.precision))
+
+    async def get_weather(
+        self,
+        lat: float,
+        lon: float,
+        fallback: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, float]:
+        key = self.key(lat, lon)
+        entry = self._cache.get(key)
+
+        if entry is not None:
+            age = self.clock() - entry.fetched_at
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                return entry.value
+            if age < self.ttl + self.stale:
+                self.stats["stale"] += 1
+                self._refresh(key)
+                return entry.value
+
+        self.stats["misses"] += 1
+        try:
+            # Shield so one cancelled caller does not cancel the shared fetch.
+            return await asyncio.shield(self._refresh(key))
+        except Exception as e:
+            self.stats["errors"] += 1
+            if fallback is None:
+                raise PerceptionError(f"Perception failure for {key}: {e}") from e
+            logger.warning(f"Perception failure for {key}: {e}. Using fallback.")
+            return dict(fallback)
+
+    async def fetch_risk_batch(
+        self,
+        coords: Sequence[Tuple[float, float]],
+        index: Optional[np.ndarray] = None,
+        concurrency: int = PERCEPTION_CONFIG["BATCH_CONCURRENCY"],
+        fallback: Callable[[np.ndarray], np.ndarray] = uniform_fallback,
+    ) -> np.ndarray:
+        """
+        Risk for many regions at once.
+
+        ``coords`` is an (R, 2) array of lat/lon. Distinct cache keys are
+        fetched concurrently under a semaphore of ``concurrency``; failed
+        regions are filled in one call to ``fallback(failed_coords)``.
+
+        Returns a float32 vector aligned to ``coords`` or, when ``index``
+        maps nodes to regions, ``risk[index]`` aligned to nodes.
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        keys = np.round(coords, self.precision)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def one(lat: float, lon: float) -> float:
+            async with semaphore:
+                try:
+                    return wind_risk(await self.get_weather(lat, lon))
+                except (PerceptionError, KeyError, TypeError):
+                    return np.nan
+
+        risk = np.array(
+            await asyncio.gather(*(one(lat, lon) for lat, lon in unique)),
+            dtype=np.float32,
+        )
+
+        failed = np.isnan(risk)
+        if failed.any():
+            logger.warning(f"{int(failed.sum())}/{len(risk)} regions failed. Using fallback risk.")
+            risk[failed] = fallback(unique[failed])
+
+        risk = risk[inverse]
+        return risk if index is None else risk[np.asarray(index)]
+
+    def invalidate(self, lat: Optional[float] = None, lon: Optional[float] = None):
+        if lat is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self.key(lat, lon), None)
+
+    # ---------- single-flight ----------
+
+    def _refresh(self, key: Key) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+            return task
+
+        task = asyncio.ensure_future(self._fetch(key))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t, k=key: self._done(k, t))
+        return task
+
+    @timed("perception_fetch")
+    async def _fetch(self, key: Key) -> Dict[str, float]:
+        value = await self.backend.fetch(*key)
+        self._cache[key] = _Entry(value, self.clock())
+        return value
+
+    def _done(self, key: Key, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve background-refresh errors so they are never left unobserved.
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Refresh failed for {key}: {task.exception()}")
@@ -0,0 +1,243 @@
+"""
+NEXUS CORE - HEADLESS RENDER PIPELINE
+
+Off-loop frame rendering shared by every engine.
+
+Pillars:
+1. One figure per renderer; artists updated in place (no per-step figures)
+2. Fixed random subsample above MAX_POINTS, 2D density above HIST_THRESHOLD
+3. Rendering and PNG encoding on a single worker thread
+4. Frames written to disk, never blocking on a display
+5. Layouts cached per mesh version
+"""
+
+import os
+import asyncio
+import logging
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+RENDER_CONFIG = {
+    "FRAME_DIR": os.getenv("NEXUS_FRAME_DIR", "frames"),
+    "MAX_POINTS": 50_000,
+    "HIST_THRESHOLD": 2_000_000,
+    "HIST_BINS": 512,
+    "HIST_CHUNK": 1_048_576,
+    "MAX_PENDING": 2,
+    "DPI": 100,
+    "SEED": 42,
+}
+
+logger = logging.getLogger("Nexus-Render")
+
+
+def new_figure(figsize=(8, 6)):
+    """Pyplot-free Agg figure: safe to draw from a worker thread."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+# =========================
+# POINT REDUCTION
+# =========================
+
+def density(points: np.ndarray, bins: int, xlim, ylim,
+            chunk: int = RENDER_CONFIG["HIST_CHUNK"]) -> np.ndarray:
+    """
+    (bins, bins) count grid of ``points`` (row = y), binned in row chunks
+    so temporaries stay bounded at any node count.
+    """
+    counts = np.zeros(bins * bins, dtype=np.int64)
+    sx = bins / (xlim[1] - xlim[0])
+    sy = bins / (ylim[1] - ylim[0])
+    for start in range(0, len(points), chunk):
+        block = points[start:start + chunk]
+        ix = np.clip(((block[:, 0] - xlim[0]) * sx).astype(np.intp), 0, bins - 1)
+        iy = np.clip(((block[:, 1] - ylim[0]) * sy).astype(np.intp), 0, bins - 1)
+        counts += np.bincount(iy * bins + ix, minlength=bins * bins)
+    return counts.reshape(bins, bins)
+
+
+# =========================
+# FRAME RENDERER
+# =========================
+
+class FrameRenderer:
+    """
+    Incremental scatter/density frames written to ``frame_dir``.
+
+    ``reduce`` runs on the caller and returns a small, owned snapshot
+    (all points, a fixed subsample, or a density grid), so the caller may
+    keep mutating ``points`` while the frame is drawn. ``points`` may also
+    be a list of row blocks (e.g. store shards), read in place. ``submit`` draws
+    on the render thread; at most ``max_pending`` frames are queued.
+    """
+
+    def __init__(
+        self,
+        frame_dir: str = RENDER_CONFIG["FRAME_DIR"],
+        prefix: str = "frame",
+        xlim: Tuple[float, float] = (0, 100),
+        ylim: Tuple[float, float] = (0, 100),
+        max_points: int = RENDER_CONFIG["MAX_POINTS"],
+        hist_threshold: int = RENDER_CONFIG["HIST_THRESHOLD"],
+        bins: int = RENDER_CONFIG["HIST_BINS"],
+        max_pending: int = RENDER_CONFIG["MAX_PENDING"],
+        figsize=(8, 6),
+        seed: int = RENDER_CONFIG["SEED"],
+    ):
+        self.frame_dir = Path(frame_dir)
+        self.prefix = prefix
+        self.xlim = xlim
+        self.ylim = ylim
+        self.max_points = max_points
+        self.hist_threshold = hist_threshold
+        self.bins = bins
+        self.max_pending = max(1, max_pending)
+        self.figsize = figsize
+        self.seed = seed
+
+        self._sample: Optional[np.ndarray] = None
+        self._sample_n = 0
+        self._figure = None
+        self._scatter = None
+        self._image = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = deque()
+        self.frames = 0
+
+    # ---------- caller side ----------
+
+    def reduce(self, points) -> Tuple[str, np.ndarray]:
+        blocks = [points] if isinstance(points, np.ndarray) else list(points)
+        n = sum(len(block) for block in blocks)
+        if n > self.hist_threshold:
+            return "density", sum(
+                density(block, self.bins, self.xlim, self.ylim) for block in blocks
+            )
+        if n > self.max_points:
+            # Same subsample every frame, so sampled nodes move coherently
+            if self._sample_n != n:
+                rng = np.random.default_rng(self.seed)
+                self._sample = np.sort(rng.choice(n, self.max_points, replace=False))
+                self._sample_n = n
+            return "points", self._gather(blocks, self._sample)
+        if not blocks:
+            return "points", np.empty((0, 2))
+        return "points", np.concatenate(blocks) if len(blocks) > 1 else np.array(blocks[0], copy=True)
+
+    @staticmethod
+    def _gather(blocks, rows: np.ndarray) -> np.ndarray:
+        # Sorted global rows -> per-block local indices
+        out, start = [], 0
+        for block in blocks:
+            lo, hi = np.searchsorted(rows, [start, start + len(block)])
+            out.append(block[rows[lo:hi] - start])
+            start += len(block)
+        return np.concatenate(out)
+
+    def render(self, points: np.ndarray, step: int, title: str = "") -> Path:
+        """Synchronous frame on the calling thread."""
+        kind, data = self.reduce(points)
+        return self.draw(kind, data, step, title)
+
+    async def submit(self, points: np.ndarray, step: int, title: str = ""):
+        """Queue a frame on the render thread; waits only on backlog."""
+        while len(self._pending) >= self.max_pending:
+            await self._pending.popleft()
+
+        kind, data = self.reduce(points)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nexus-render")
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self.draw, kind, data, step, title)
+        self._pending.append(future)
+        return future
+
+    async def drain(self):
+        while self._pending:
+            await self._pending.popleft()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pending.clear()
+
+    # ---------- render thread ----------
+
+    def _ensure_figure(self):
+        if self._figure is not None:
+            return
+        self._figure = new_figure(self.figsize)
+        ax = self._figure.add_subplot()
+        ax.set_xlim(*self.xlim)
+        ax.set_ylim(*self.ylim)
+        ax.grid(True)
+        self._scatter = ax.scatter(np.empty(0), np.empty(0), s=4)
+        self._image = ax.imshow(
+            np.zeros((self.bins, self.bins)), origin="lower", cmap="viridis",
+            extent=(*self.xlim, *self.ylim), aspect="auto", visible=False,
+        )
+        self.frame_dir.mkdir(parents=True, exist_ok=True)
+
+    def draw(self, kind: str, data: np.ndarray, step: int, title: str = "") -> Path:
+        self._ensure_figure()
+
+        if kind == "density":
+            grid = np.log1p(data)
+            self._image.set_data(grid)
+            self._image.set_clim(0, max(float(grid.max()), 1e-9))
+            self._image.set_visible(True)
+            self._scatter.set_visible(False)
+        else:
+            self._scatter.set_offsets(data)
+            self._scatter.set_sizes([20 if len(data) <= 1_000 else 2])
+            self._scatter.set_visible(True)
+            self._image.set_visible(False)
+
+        self._figure.axes[0].set_title(title)
+        path = self.frame_dir / f"{self.prefix}-{step:06d}.png"
+        self._figure.savefig(path, dpi=RENDER_CONFIG["DPI"])
+        self.frames += 1
+        logger.debug(f"Frame written: {path}")
+        return path
+
+
+# =========================
+# LAYOUT CACHE
+# =========================
+
+class LayoutCache:
+    """
+    Node positions per mesh, recomputed only when ``mesh.version``
+    changes. Meshes are held weakly.
+    """
+
+    def __init__(self):
+        self._entries = weakref.WeakKeyDictionary()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, mesh, compute: Callable[[object], np.ndarray]) -> np.ndarray:
+        entry = self._entries.get(mesh)
+        if entry is not None and entry[0] == mesh.version:
+            self.stats["hits"] += 1
+            return entry[1]
+        self.stats["misses"] += 1
+        pos = compute(mesh)
+        self._entries[mesh] = (mesh.version, pos)
+        return pos
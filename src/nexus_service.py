@@ -0,0 +1,459 @@
+"""
+NEXUS CORE - ROUTING SERVICE
+
+Long-lived asyncio front-end for the batch routers, replacing one-shot
+scripts with a process that keeps its mesh, caches and pool warm.
+
+Pillars:
+1. In-process API: ``await service.route(source, target)``
+2. Local socket API: newline-delimited JSON over a Unix socket (or TCP)
+3. Micro-batching: requests within MAX_WAIT_MS / MAX_BATCH share one dispatch
+4. Batches go to a batch router (one thread) or the Day 4 process pool
+5. Every caller's future resolves on its own; one bad request fails alone
+
+Protocol (one JSON object per line, replies may arrive out of order)::
+
+    -> {"id": 7, "source": "City-1", "target": "City-42"}
+    <- {"id": 7, "ok": true, "result": {"reachable": true, "cost": ..., ...}}
+    <- {"id": 8, "ok": false, "error": "KeyError: 'City-0'"}
+"""
+
+import os
+import sys
+import json
+import math
+import stat
+import shutil
+import signal
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nexus_metrics import export_if_enabled, timed
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+SERVICE_CONFIG = {
+    "ADDRESS": os.getenv("NEXUS_SERVICE_ADDRESS", "nexus-router.sock"),   # path or host:port
+    "BACKEND": os.getenv("NEXUS_SERVICE_BACKEND", "router"),   # router | pool
+    "MAX_BATCH": int(os.getenv("NEXUS_SERVICE_MAX_BATCH", 256)),
+    "MAX_WAIT_MS": float(os.getenv("NEXUS_SERVICE_MAX_WAIT_MS", 2.0)),
+    "MAX_IN_FLIGHT": 2,   # batches dispatched concurrently
+    "LOG_LEVEL": logging.INFO,
+}
+
+logger = logging.getLogger("Nexus-Service")
+
+
+def setup_logging():
+    """Root log config for the CLI entry point; imports leave logging alone."""
+    logging.basicConfig(
+        level=SERVICE_CONFIG["LOG_LEVEL"],
+        format="%(asctime)s | %(levelname)s | NEXUS-SERVICE | %(message)s",
+        stream=sys.stdout,
+    )
+
+
+def _plain(value):
+    """Numpy scalars -> Python, NaN -> None (strict JSON)."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def rows(columns: Dict[str, Any], k: int) -> List[Dict[str, Any]]:
+    """Split a columnar batch result into one dict per request."""
+    aligned = {
+        name: values for name, values in columns.items()
+        if isinstance(values, (list, np.ndarray)) and len(values) == k
+    }
+    return [{name: _plain(values[i]) for name, values in aligned.items()} for i in range(k)]
+
+
+def _remove_stale_socket(path: str):
+    """Unlink a socket left by a previous run; any other file is an error."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"Refusing to replace {path}: not a socket")
+    os.unlink(path)
+
+
+# =========================
+# DISPATCH BACKENDS
+# =========================
+
+class RouterBackend:
+    """
+    Any router with ``route_batch(pairs, with_paths=...)`` (Day 2
+    ``SwarmRouter``, Day 3 ``SwarmIntelligence``). Routers are not
+    thread-safe, so batches run one at a time on a dedicated thread.
+    """
+
+    def __init__(self, router, with_paths: bool = True):
+        self.router = router
+        self.with_paths = with_paths
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nexus-router")
+
+    def _route(self, pairs):
+        out = rows(self.router.route_batch(pairs, with_paths=self.with_paths), len(pairs))
+        for row in out:
+            if "paths" in row:
+                row["path"] = row.pop("paths")
+        return out
+
+    async def dispatch(self, pairs: List[Tuple]) -> List[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._route, pairs)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+class PoolBackend:
+    """
+    Day 4 process pool: each batch is one ``route_decision_chunk`` task
+    on a worker's resident mesh. Names are resolved here, so only the
+    integer pair array crosses the process boundary. Requests carry no
+    weather risk, so the chunk's weather-scaled ``risk`` column is left
+    out (``edge_risk`` is the route's own risk).
+    """
+
+    def __init__(self, executor, names, chunk_fn=None, scratch: Optional[str] = None):
+        if chunk_fn is None:
+            from parallel_engine_day4 import route_decision_chunk as chunk_fn
+        self.executor = executor
+        self.names = names
+        self.chunk_fn = chunk_fn
+        self.scratch = scratch   # temp snapshot dir removed on close
+
+    async def dispatch(self, pairs: List[Tuple]) -> List[Dict[str, Any]]:
+        ids = np.array([(self.names.id(s), self.names.id(t)) for s, t in pairs],
+                       dtype=np.int64).reshape(-1, 2)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.executor, self.chunk_fn, ids)
+        result.pop("risk", None)
+        out = rows(result, len(pairs))
+        for row, (source, target) in zip(out, pairs):
+            row["source"], row["target"] = source, target
+            row["reachable"] = row["cost"] is not None
+        return out
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        if self.scratch:
+            shutil.rmtree(self.scratch, ignore_errors=True)
+
+
+# =========================
+# MICRO-BATCHING SERVICE
+# =========================
+
+class RoutingService:
+    """
+    Collects ``route`` calls into micro-batches for ``backend.dispatch``.
+
+    A batch closes after ``max_batch`` requests or ``max_wait_ms`` after
+    its first request, whichever comes first, so no request waits longer
+    than the window before dispatch. Up to ``max_in_flight`` batches run
+    at once, letting the next batch form while one is routed.
+    """
+
+    def __init__(self, backend,
+                 max_batch: int = SERVICE_CONFIG["MAX_BATCH"],
+                 max_wait_ms: float = SERVICE_CONFIG["MAX_WAIT_MS"],
+                 max_in_flight: int = SERVICE_CONFIG["MAX_IN_FLIGHT"]):
+        self.backend = backend
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1e3
+        self.max_in_flight = max(1, max_in_flight)
+        self.stats = {"requests": 0, "batches": 0, "max_batch": 0, "errors": 0}
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running = set()
+        self._servers = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def start(self):
+        if self._collector is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._collector = asyncio.create_task(self._collect())
+
+    # ---------- in-process API ----------
+
+    async def route(self, source, target) -> Dict[str, Any]:
+        """Route one pair; resolves when its batch has been answered."""
+        if self._collector is None:
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        with timed("service_request"):
+            self._queue.put_nowait(((source, target), future))
+            return await future
+
+    # ---------- batching ----------
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        try:
+            # Callers that gave up (cancelled) are not routed
+            batch = [(pair, future) for pair, future in batch if not future.done()]
+            if batch:
+                self.stats["requests"] += len(batch)
+                self.stats["batches"] += 1
+                self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+                await self._dispatch(batch)
+        finally:
+            self._slots.release()
+
+    async def _dispatch(self, batch):
+        try:
+            with timed("service_batch"):
+                results = await self.backend.dispatch([pair for pair, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                # Isolate the failing request(s): retry one by one
+                for item in batch:
+                    await self._dispatch([item])
+                return
+            self.stats["errors"] += 1
+            _, future = batch[0]
+            if not future.done():
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    # ---------- socket API ----------
+
+    async def serve(self, address: str = SERVICE_CONFIG["ADDRESS"]):
+        """
+        Listen on a Unix socket path, or ``host:port`` for TCP. Returns
+        the ``asyncio`` server; ``close`` shuts it down.
+        """
+        await self.start()
+        host, sep, port = address.rpartition(":")
+        if sep and port.isdigit():
+            server = await asyncio.start_server(self._handle, host or "127.0.0.1", int(port))
+        else:
+            _remove_stale_socket(address)
+            server = await asyncio.start_unix_server(self._handle, path=address)
+        self._servers.append(server)
+        logger.info(f"Routing service listening on {address}")
+        return server
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+        pending = set()
+
+        async def answer(line: bytes):
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get("id")
+                result = await self.route(request["source"], request["target"])
+                reply = {"id": request_id, "ok": True, "result": result}
+            except Exception as e:
+                reply = {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+            async with lock:
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # ---------- shutdown ----------
+
+    async def close(self):
+        """Stop listening, finish in-flight batches, fail queued requests."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Routing service closed"))
+
+        close = getattr(self.backend, "close", None)
+        if close is not None:
+            close()
+
+
+# =========================
+# SOCKET CLIENT
+# =========================
+
+class ServiceClient:
+    """Pipelined client for the socket API; replies are matched by ``id``."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, address: str = SERVICE_CONFIG["ADDRESS"]) -> "ServiceClient":
+        host, sep, port = address.rpartition(":")
+        if sep and port.isdigit():
+            reader, writer = await asyncio.open_connection(host or "127.0.0.1", int(port))
+        else:
+            reader, writer = await asyncio.open_unix_connection(address)
+        return cls(reader, writer)
+
+    async def route(self, source, target) -> Dict[str, Any]:
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self.writer.write(json.dumps({"id": request_id, "source": source, "target": target}).encode() + b"\n")
+        await self.writer.drain()
+        reply = await future
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    async def _listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._pending.pop(reply["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Routing service connection closed"))
+            self._pending.clear()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self._listener
+
+
+# =========================
+# ENTRY POINT
+# =========================
+
+def build_backend(kind: str = SERVICE_CONFIG["BACKEND"]):
+    """``router``: Day 2 SwarmRouter on its mesh; ``pool``: Day 4 workers on a snapshot."""
+    if kind == "router":
+        from day2_nexus_core import SwarmRouter, build_mesh
+
+        return RouterBackend(SwarmRouter(build_mesh()))
+
+    if kind == "pool":
+        import tempfile
+        from concurrent.futures import ProcessPoolExecutor
+
+        from nexus_snapshot import load_mesh
+        from parallel_engine_day4 import NEXUS_CONFIG, init_worker, prepare_snapshot
+
+        scratch = None if NEXUS_CONFIG["SNAPSHOT_PATH"] else tempfile.mkdtemp(prefix="nexus-mesh-")
+        snapshot = NEXUS_CONFIG["SNAPSHOT_PATH"] or os.path.join(scratch, "mesh")
+        prepare_snapshot(snapshot)
+        executor = ProcessPoolExecutor(
+            max_workers=NEXUS_CONFIG["WORKER_COUNT"],
+            initializer=init_worker,
+            initargs=(NEXUS_CONFIG["NODE_COUNT"], NEXUS_CONFIG["EDGE_PROBABILITY"],
+                      NEXUS_CONFIG["MESH_SEED"], NEXUS_CONFIG["LANDMARKS"], snapshot),
+        )
+        return PoolBackend(executor, load_mesh(snapshot).cities, scratch=scratch)
+
+    raise ValueError(f"Unknown service backend: {kind}")
+
+
+async def run_service(address: str = SERVICE_CONFIG["ADDRESS"]):
+    """Serve until SIGINT / SIGTERM."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    async with RoutingService(build_backend()) as service:
+        await service.serve(address)
+        await stop.wait()
+        logger.info(
+            f"Shutting down | {service.stats['requests']} requests in "
+            f"{service.stats['batches']} batches (max {service.stats['max_batch']})"
+        )
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(run_service(sys.argv[1] if len(sys.argv) > 1 else SERVICE_CONFIG["ADDRESS"]))
+    export_if_enabled()
@@ -0,0 +1,298 @@
+"""
+NEXUS CORE - MESH SNAPSHOTS
+
+Versioned on-disk mesh format, so processes attach to one topology
+instead of regenerating (or unpickling) it on every start.
+
+Pillars:
+1. One directory per snapshot: raw ``.npy`` buffers plus ``meta.json``
+2. Zero-copy attach: CSR arrays and edge columns are memory-mapped
+3. Copy-on-write maps, so live risk updates stay private to a process
+4. Generator parameters recorded, so stale snapshots are rebuilt
+
+Layout (``FORMAT_VERSION`` 1)::
+
+    meta.json                      format, version, n, m, names, params, ...
+    eu.npy ev.npy                  edge endpoints
+    distance.npy risk.npy cost.npy edge attribute columns
+    indptr.npy indices.npy slot_edge.npy   CSR adjacency (CSR meshes)
+    names_offsets.npy names_blob.npy       explicit city names (optional)
+    landmark_nodes.npy landmark_table.npy  ALT tables (optional)
+"""
+
+import os
+import json
+import shutil
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from nexus_mesh import CSR_ARRAYS, CSRMesh, Landmarks, NameTable
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+SNAPSHOT_CONFIG = {
+    "FORMAT": "nexus-mesh",
+    "FORMAT_VERSION": 1,
+    "PATH": os.getenv("NEXUS_SNAPSHOT_PATH", ""),   # root; one sub-directory per engine
+}
+
+logger = logging.getLogger("Nexus-Snapshot")
+
+
+# =========================
+# ARRAY DIRECTORIES
+# =========================
+
+def _check_replaceable(path: Path, fmt):
+    """Only an empty directory or one of our own snapshots may be replaced."""
+    if not path.exists():
+        return
+    if not path.is_dir():
+        raise FileExistsError(f"Refusing to replace {path}: not a directory")
+    if not any(path.iterdir()):
+        return
+    try:
+        existing = read_meta(path)
+    except (OSError, ValueError):
+        existing = None
+    if not isinstance(existing, dict) or existing.get("format") != fmt:
+        raise FileExistsError(
+            f"Refusing to replace {path}: not empty and not a {fmt!r} snapshot"
+        )
+
+
+def write_arrays(path, arrays: Dict[str, np.ndarray], meta: Dict) -> Path:
+    """
+    One ``.npy`` per array plus ``meta.json``, written to a sibling
+    directory and swapped in, so readers never see a partial snapshot.
+    An existing ``path`` is replaced only when it is empty or holds a
+    snapshot with the same ``meta["format"]``.
+    """
+    path = Path(path)
+    _check_replaceable(path, meta.get("format"))
+
+    tmp = path.with_name(path.name + ".tmp")
+    old = path.with_name(path.name + ".old")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name, array in arrays.items():
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(array))
+    (tmp / "meta.json").write_text(json.dumps(dict(meta, arrays=sorted(arrays)), indent=2))
+
+    # Rename the old snapshot aside, then the new one into place
+    if path.exists():
+        shutil.rmtree(old, ignore_errors=True)
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+    return path
+
+
+def read_meta(path) -> Optional[Dict]:
+    meta = Path(path) / "meta.json"
+    return json.loads(meta.read_text()) if meta.exists() else None
+
+
+def read_arrays(path, mmap: bool = True) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Attach to a directory written by ``write_arrays``. With ``mmap`` the
+    arrays are copy-on-write maps: pages come from the shared page cache
+    and writes stay private to the process.
+    """
+    path = Path(path)
+    meta = read_meta(path)
+    if meta is None:
+        raise FileNotFoundError(f"No snapshot at {path}")
+    arrays = {
+        name: np.load(path / f"{name}.npy", mmap_mode="c" if mmap else None)
+        for name in meta["arrays"]
+    }
+    return arrays, meta
+
+
+def engine_path(engine: str, root: str = SNAPSHOT_CONFIG["PATH"]) -> str:
+    """
+    Snapshot directory of one engine under the shared root, so engines
+    with different generator parameters never overwrite each other.
+    An empty root (snapshots off) stays empty.
+    """
+    return os.path.join(root, engine) if root else ""
+
+
+def _normalize(params: Optional[Dict]) -> Optional[Dict]:
+    # JSON round trip, so tuples compare equal to the lists read back
+    return None if params is None else json.loads(json.dumps(params))
+
+
+def _check_format(meta: Dict, path):
+    if meta.get("format") != SNAPSHOT_CONFIG["FORMAT"]:
+        raise ValueError(f"{path} is not a mesh snapshot")
+    if meta.get("version") != SNAPSHOT_CONFIG["FORMAT_VERSION"]:
+        raise ValueError(
+            f"Unsupported mesh snapshot version {meta.get('version')} at {path} "
+            f"(expected {SNAPSHOT_CONFIG['FORMAT_VERSION']})"
+        )
+
+
+# =========================
+# NAME TABLE
+# =========================
+
+def _encode_names(names: NameTable, arrays: Dict[str, np.ndarray]) -> Dict:
+    if names.names is None:
+        return {"kind": "format", "format": names.fmt, "offset": names.offset}
+    encoded = [str(name).encode() for name in names.names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    arrays["names_offsets"] = offsets
+    arrays["names_blob"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return {"kind": "explicit"}
+
+
+def _decode_names(n: int, spec: Dict, arrays: Dict[str, np.ndarray]) -> NameTable:
+    if spec["kind"] == "format":
+        return NameTable(n, spec["format"], spec["offset"])
+    blob = arrays["names_blob"].tobytes()
+    offsets = arrays["names_offsets"].tolist()
+    return NameTable(n, names=[blob[a:b].decode() for a, b in zip(offsets, offsets[1:])])
+
+
+# =========================
+# MESH SNAPSHOTS
+# =========================
+
+def save_mesh(mesh: CSRMesh, path, params: Optional[Dict] = None) -> Path:
+    """Write a CSR mesh (columns, adjacency, names, landmark tables)."""
+    arrays = {name: getattr(mesh, name) for name in CSR_ARRAYS}
+    meta = {
+        "format": SNAPSHOT_CONFIG["FORMAT"],
+        "version": SNAPSHOT_CONFIG["FORMAT_VERSION"],
+        "kind": "csr",
+        "n": mesh.number_of_nodes(),
+        "m": mesh.number_of_edges(),
+        "names": _encode_names(mesh.cities, arrays),
+        "params": _normalize(params),
+    }
+    if mesh.landmarks is not None:
+        arrays["landmark_nodes"] = mesh.landmarks.nodes
+        arrays["landmark_table"] = mesh.landmarks.table
+        meta["landmarks"] = {"weight": mesh.landmarks.weight, "slack": mesh.landmarks.slack}
+    return write_arrays(path, arrays, meta)
+
+
+def load_mesh(path, mmap: bool = True) -> CSRMesh:
+    """Attach a CSR mesh snapshot; no array is copied when ``mmap``."""
+    arrays, meta = read_arrays(path, mmap)
+    _check_format(meta, path)
+    if meta["kind"] != "csr":
+        raise ValueError(f"{path} holds a {meta['kind']} snapshot, not a CSR mesh")
+
+    n = meta["n"]
+    mesh = CSRMesh.from_arrays(n, arrays, _decode_names(n, meta["names"], arrays))
+    if "landmarks" in meta:
+        mesh.landmarks = Landmarks(arrays["landmark_nodes"], arrays["landmark_table"],
+                                   meta["landmarks"]["weight"], meta["landmarks"]["slack"])
+    return mesh
+
+
+def cached_mesh(path, params: Dict, generate: Callable[[], CSRMesh], mmap: bool = True) -> CSRMesh:
+    """
+    Attach the snapshot at ``path`` when it was written for ``params``;
+    otherwise ``generate()`` and save it there. Empty ``path`` always
+    generates.
+    """
+    if path:
+        meta = read_meta(path)
+        if meta is not None and meta.get("params") == _normalize(params):
+            return load_mesh(path, mmap)
+        if meta is not None:
+            logger.warning(f"Snapshot at {path} was built for other parameters; regenerating.")
+
+    mesh = generate()
+    if path:
+        save_mesh(mesh, path, params)
+        logger.info(f"Mesh snapshot written: {path}")
+    return mesh
+
+
+# =========================
+# GRAPH SNAPSHOTS (networkx engines)
+# =========================
+
+def save_graph(G, path, nodes, params: Optional[Dict] = None,
+               columns=("distance", "risk", "cost")) -> Path:
+    """
+    Edge-list snapshot of a networkx graph. ``nodes`` fixes the ID
+    order; integer-labelled graphs (``nodes == range(n)``) store no names.
+    """
+    nodes = list(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = list(G.edges(data=True))
+    columns = [c for c in columns if all(c in data for _, _, data in edges)]
+
+    arrays = {
+        "eu": np.fromiter((index[u] for u, _, _ in edges), np.int64, len(edges)),
+        "ev": np.fromiter((index[v] for _, v, _ in edges), np.int64, len(edges)),
+    }
+    for c in columns:
+        arrays[c] = np.fromiter((data[c] for _, _, data in edges), np.float64, len(edges))
+
+    integer = nodes == list(range(len(nodes)))
+    meta = {
+        "format": SNAPSHOT_CONFIG["FORMAT"],
+        "version": SNAPSHOT_CONFIG["FORMAT_VERSION"],
+        "kind": "graph",
+        "n": len(nodes),
+        "m": len(edges),
+        "columns": columns,
+        "names": {"kind": "ids"} if integer else _encode_names(NameTable(len(nodes), names=nodes), arrays),
+        "params": _normalize(params),
+    }
+    return write_arrays(path, arrays, meta)
+
+
+def load_graph(path):
+    """Rebuild the networkx graph; returns ``(G, nodes)`` in snapshot ID order."""
+    import networkx as nx
+
+    arrays, meta = read_arrays(path)
+    _check_format(meta, path)
+    n = meta["n"]
+    if meta["names"]["kind"] == "ids":
+        nodes = list(range(n))
+    else:
+        nodes = _decode_names(n, meta["names"], arrays)[:]
+
+    columns = meta.get("columns", ["distance", "risk", "cost"])
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(
+        (nodes[u], nodes[v], dict(zip(columns, values)))
+        for u, v, *values in zip(
+            arrays["eu"].tolist(), arrays["ev"].tolist(),
+            *(arrays[c].astype(np.float64).tolist() for c in columns),
+        )
+    )
+    return G, nodes
+
+
+def cached_graph(path, params: Dict, generate: Callable[[], Tuple[object, list]]):
+    """``cached_mesh`` for networkx engines: ``generate() -> (G, nodes)``."""
+    if path:
+        meta = read_meta(path)
+        if meta is not None and meta.get("params") == _normalize(params):
+            return load_graph(path)
+        if meta is not None:
+            logger.warning(f"Snapshot at {path} was built for other parameters; regenerating.")
+
+    G, nodes = generate()
+    if path:
+        save_graph(G, path, nodes, params)
+        logger.info(f"Graph snapshot written: {path}")
+    return G, nodes
@@ -0,0 +1,235 @@
+"""
+NEXUS CORE - SPATIAL INDEX
+
+Uniform-grid index over fleet positions for proximity queries.
+
+Pillars:
+1. Counting-sort grid: nodes ordered by cell, one offset per cell
+2. Per-step update re-sorting the previous order; grid re-fit only on drift
+3. Batched, vectorized radius and kNN queries returning index arrays
+"""
+
+import logging
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+SPATIAL_CONFIG = {
+    "OCCUPANCY": 8,          # target nodes per cell
+    "MARGIN": 0.1,           # box padding (share of span) absorbing drift
+    "REBUILD_FRACTION": 0.01,  # re-fit the grid once this share drifts outside it
+}
+
+logger = logging.getLogger("Nexus-Spatial")
+
+
+# =========================
+# GRID INDEX
+# =========================
+
+class GridIndex:
+    """
+    Uniform grid over an (n, 2) position array.
+
+    Cell ids are ``cx * gy + cy``, so each grid column is one contiguous
+    run of ``order``. Points drifting outside the fitted box are clamped
+    into edge cells: queries stay exact, only slower, until the next
+    re-fit. The index holds its own cell-sorted copy of the points, so
+    moving the source array does not corrupt it before ``update``.
+    """
+
+    def __init__(self, positions: Optional[np.ndarray] = None,
+                 occupancy: int = SPATIAL_CONFIG["OCCUPANCY"],
+                 margin: float = SPATIAL_CONFIG["MARGIN"],
+                 rebuild_fraction: float = SPATIAL_CONFIG["REBUILD_FRACTION"]):
+        self.occupancy = max(1, occupancy)
+        self.margin = margin
+        self.rebuild_fraction = rebuild_fraction
+        self.order: Optional[np.ndarray] = None
+        self.points: Optional[np.ndarray] = None
+        self.cell_start: Optional[np.ndarray] = None
+        self.stats = {"builds": 0, "updates": 0}
+        if positions is not None:
+            self.build(positions)
+
+    def __len__(self) -> int:
+        return 0 if self.order is None else len(self.order)
+
+    # ---------- construction ----------
+
+    def _fit(self, positions: np.ndarray):
+        n = len(positions)
+        lo = positions.min(axis=0).astype(np.float64)
+        hi = positions.max(axis=0).astype(np.float64)
+        pad = (hi - lo) * self.margin
+        lo, hi = lo - pad, hi + pad
+        span = np.maximum(hi - lo, 1e-9)
+
+        cells = max(1, n // self.occupancy)
+        size = max(float(np.sqrt(span[0] * span[1] / cells)), float(span.max()) / cells, 1e-9)
+
+        self.origin = lo
+        self.size = size
+        self.dims = tuple(int(d) for d in np.floor(span / size).astype(np.int64) + 1)
+
+    def _cell_coords(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+        scaled = (points - self.origin) / self.size
+        cx = np.floor(scaled[:, 0]).astype(np.int64)
+        cy = np.floor(scaled[:, 1]).astype(np.int64)
+        gx, gy = self.dims
+        outside = int(np.count_nonzero((cx < 0) | (cx >= gx) | (cy < 0) | (cy >= gy)))
+        np.clip(cx, 0, gx - 1, out=cx)
+        np.clip(cy, 0, gy - 1, out=cy)
+        return cx, cy, outside
+
+    def _finish(self, sorted_cells: np.ndarray, positions: np.ndarray):
+        gx, gy = self.dims
+        self.cell_start = np.zeros(gx * gy + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sorted_cells, minlength=gx * gy), out=self.cell_start[1:])
+        self.points = np.ascontiguousarray(positions[self.order])
+
+    def build(self, positions: np.ndarray) -> "GridIndex":
+        """Fit the grid to ``positions`` and sort every node into it."""
+        positions = np.asarray(positions)
+        if not len(positions):
+            raise ValueError("Cannot index an empty position array")
+
+        self._fit(positions)
+        cx, cy, _ = self._cell_coords(positions)
+        cells = cx * self.dims[1] + cy
+        self.order = np.argsort(cells, kind="stable")
+        self._finish(cells[self.order], positions)
+        self.stats["builds"] += 1
+        return self
+
+    def update(self, positions: np.ndarray) -> "GridIndex":
+        """
+        Re-index after the nodes moved.
+
+        Keys are recomputed in the previous cell order and re-sorted with
+        a stable (Timsort) sort, which runs near-linear when steps are
+        small relative to the cell size and costs no more than a build
+        otherwise. Falls back to ``build`` when the node count changes or
+        too many nodes left the fitted (padded) box.
+        """
+        positions = np.asarray(positions)
+        if self.order is None or len(positions) != len(self.order):
+            return self.build(positions)
+
+        moved = positions[self.order]
+        cx, cy, outside = self._cell_coords(moved)
+        if outside > self.rebuild_fraction * len(positions):
+            return self.build(positions)
+
+        cells = cx * self.dims[1] + cy
+        perm = np.argsort(cells, kind="stable")
+        self.order = self.order[perm]
+        self._finish(cells[perm], positions)
+        self.stats["updates"] += 1
+        return self
+
+    # ---------- queries ----------
+
+    def _candidates(self, centers: np.ndarray, radius: np.ndarray):
+        """
+        All (query, slot) pairs within ``radius``; slots index ``points``.
+        One vectorized pass per grid column offset.
+        """
+        gx, gy = self.dims
+        lo = np.floor((centers - radius[:, None] - self.origin) / self.size).astype(np.int64)
+        hi = np.floor((centers + radius[:, None] - self.origin) / self.size).astype(np.int64)
+        np.clip(lo[:, 0], 0, gx - 1, out=lo[:, 0])
+        np.clip(hi[:, 0], 0, gx - 1, out=hi[:, 0])
+        np.clip(lo[:, 1], 0, gy - 1, out=lo[:, 1])
+        np.clip(hi[:, 1], 0, gy - 1, out=hi[:, 1])
+
+        queries, slots, dist2 = [], [], []
+        for dx in range(int((hi[:, 0] - lo[:, 0]).max()) + 1):
+            col = lo[:, 0] + dx
+            live = np.flatnonzero(col <= hi[:, 0])
+            base = col[live] * gy
+            start = self.cell_start[base + lo[live, 1]]
+            stop = self.cell_start[base + hi[live, 1] + 1]
+            counts = stop - start
+            total = int(counts.sum())
+            if not total:
+                continue
+
+            # Expand [start, stop) ranges without a Python loop
+            q = np.repeat(live, counts)
+            slot = np.arange(total) + np.repeat(start - (np.cumsum(counts) - counts), counts)
+            d2 = ((self.points[slot] - centers[q]) ** 2).sum(axis=1)
+            keep = d2 <= radius[q] ** 2
+            queries.append(q[keep])
+            slots.append(slot[keep])
+            dist2.append(d2[keep])
+
+        if not queries:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+        return np.concatenate(queries), np.concatenate(slots), np.concatenate(dist2)
+
+    def radius(self, centers, r, return_distance: bool = False):
+        """
+        Nodes within ``r`` (scalar or per-query) of each center.
+
+        Returns CSR-style ``(offsets, indices)``: the hits of query ``i``
+        are ``indices[offsets[i]:offsets[i + 1]]``, nearest first. With
+        ``return_distance`` a matching distance array is appended.
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        r = np.broadcast_to(np.asarray(r, dtype=np.float64), (len(centers),))
+
+        q, slot, d2 = self._candidates(centers, r)
+        order = np.lexsort((d2, q))
+        offsets = np.zeros(len(centers) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(q, minlength=len(centers)), out=offsets[1:])
+
+        indices = self.order[slot[order]]
+        if return_distance:
+            return offsets, indices, np.sqrt(d2[order])
+        return offsets, indices
+
+    def knn(self, centers, k: int, return_distance: bool = False):
+        """
+        ``k`` nearest nodes per center as a (Q, k) index array, nearest
+        first. The search radius starts at the mean-density estimate
+        for ``k`` hits and doubles only for queries still short of ``k``.
+        """
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        k = min(int(k), len(self))
+        nq = len(centers)
+        indices = np.full((nq, k), -1, dtype=np.int64)
+        distances = np.full((nq, k), np.inf)
+        if not k:
+            return (indices, distances) if return_distance else indices
+
+        r = np.full(nq, self.size * max(np.sqrt(k / (np.pi * self.occupancy)), 0.5))
+        todo = np.arange(nq)
+        while len(todo):
+            q, slot, d2 = self._candidates(centers[todo], r[todo])
+            counts = np.bincount(q, minlength=len(todo))
+            done = counts >= k
+
+            sel = done[q]
+            q, slot, d2 = q[sel], slot[sel], d2[sel]
+            order = np.lexsort((d2, q))
+            q, slot, d2 = q[order], slot[order], d2[order]
+            first = np.zeros(len(todo) + 1, dtype=np.int64)
+            np.cumsum(counts * done, out=first[1:])
+            rank = np.arange(len(q)) - first[q]
+            top = rank < k
+
+            rows = todo[q[top]]
+            indices[rows, rank[top]] = self.order[slot[top]]
+            distances[rows, rank[top]] = np.sqrt(d2[top])
+
+            todo = todo[~done]
+            r[todo] *= 2
+
+        return (indices, distances) if return_distance else indices
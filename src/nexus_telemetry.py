@@ -0,0 +1,219 @@
+"""
+NEXUS CORE - COLUMNAR TELEMETRY STORE
+
+Fixed-capacity telemetry buffer shared by every engine.
+
+Pillars:
+1. Typed NumPy columns, preallocated once (no per-row dicts)
+2. Categorical columns stored as small int codes
+3. O(1) append, vectorized extend
+4. Zero-copy snapshot to pandas / Arrow
+5. Optional spill of full buffers to .npy or Parquet segments
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+# =========================
+# CONFIGURATION LAYER
+# =========================
+
+TELEMETRY_CONFIG = {
+    "CAPACITY": 100_000,
+    "SPILL_FORMAT": "npy",
+}
+
+logger = logging.getLogger("Nexus-Telemetry")
+
+
+# =========================
+# TELEMETRY RING
+# =========================
+
+class TelemetryRing:
+    """
+    Columnar ring buffer.
+
+    ``schema`` maps column name -> NumPy dtype. Columns listed in
+    ``categories`` hold int8 codes into the given label tuple; ``append``
+    accepts either the label or the code.
+
+    Without ``spill_dir`` the oldest rows are overwritten once the buffer
+    is full. With ``spill_dir`` a full buffer is flushed to a segment on
+    disk and reset, so the live buffer never wraps and snapshots stay
+    zero-copy.
+    """
+
+    def __init__(
+        self,
+        schema: Dict[str, object],
+        capacity: int = TELEMETRY_CONFIG["CAPACITY"],
+        categories: Optional[Dict[str, Sequence[str]]] = None,
+        spill_dir: Optional[str] = None,
+        spill_format: str = TELEMETRY_CONFIG["SPILL_FORMAT"],
+    ):
+        if spill_format not in ("npy", "parquet"):
+            raise ValueError(f"Unknown spill format: {spill_format}")
+
+        self.capacity = capacity
+        self.categories = {name: tuple(labels) for name, labels in (categories or {}).items()}
+        self._codes = {
+            name: {label: code for code, label in enumerate(labels)}
+            for name, labels in self.categories.items()
+        }
+        self.columns = {
+            name: np.empty(capacity, dtype=np.int8 if name in self.categories else dtype)
+            for name, dtype in schema.items()
+        }
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.spill_format = spill_format
+
+        self.total = 0      # rows ever written
+        self.start = 0      # rows already spilled or overwritten
+        self.segments = self._next_segment()
+
+    # ---------- writes ----------
+
+    def __len__(self) -> int:
+        return self.total - self.start
+
+    def _encode(self, name, value):
+        codes = self._codes.get(name)
+        if codes is None:
+            return value
+        if isinstance(value, str):
+            return codes[value]
+        if isinstance(value, (list, tuple)) or (isinstance(value, np.ndarray) and value.dtype.kind in "US"):
+            return np.array([codes.get(v, v) for v in value], dtype=np.int8)
+        return value
+
+    def append(self, **row):
+        """O(1) single-row write."""
+        if self.spill_dir is not None and len(self) == self.capacity:
+            self.spill()
+        i = self.total % self.capacity
+        for name, column in self.columns.items():
+            column[i] = self._encode(name, row[name])
+        self.total += 1
+        if len(self) > self.capacity:
+            self.start += 1
+
+    def extend(self, **values):
+        """Vectorized multi-row write; columns must share one length."""
+        n = len(next(iter(values.values())))
+        offset = 0
+        while offset < n:
+            if self.spill_dir is not None:
+                if len(self) == self.capacity:
+                    self.spill()
+                take = min(n - offset, self.capacity - len(self))
+            else:
+                # Only the newest `capacity` rows can survive
+                offset = max(offset, n - self.capacity)
+                take = n - offset
+
+            pos = (self.total + np.arange(take)) % self.capacity
+            for name, column in self.columns.items():
+                column[pos] = self._encode(name, np.asarray(values[name])[offset:offset + take])
+            self.total += take
+            self.start = max(self.start, self.total - self.capacity)
+            offset += take
+
+    # ---------- snapshots ----------
+
+    def snapshot(self) -> Dict[str, np.ndarray]:
+        """
+        Chronological column arrays. Zero-copy views while the buffer has
+        not wrapped (always the case with spilling); a reordered copy
+        otherwise.
+        """
+        n = len(self)
+        head = self.start % self.capacity
+        if head + n <= self.capacity:
+            return {name: column[head:head + n] for name, column in self.columns.items()}
+        order = (head + np.arange(n)) % self.capacity
+        return {name: column[order] for name, column in self.columns.items()}
+
+    def to_pandas(self):
+        import pandas as pd
+
+        data = {}
+        for name, values in self.snapshot().items():
+            labels = self.categories.get(name)
+            data[name] = values if labels is None else pd.Categorical.from_codes(values, labels)
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        arrays, names = [], []
+        for name, values in self.snapshot().items():
+            labels = self.categories.get(name)
+            if labels is None:
+                arrays.append(pa.array(values))
+            else:
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(values), pa.array(labels)))
+            names.append(name)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    # ---------- spill ----------
+
+    def _next_segment(self) -> int:
+        # Number after the highest segment already in spill_dir, so a
+        # reopened ring (e.g. after a restart) never collides with it
+        if self.spill_dir is None or not self.spill_dir.is_dir():
+            return 0
+        last = -1
+        for path in self.spill_dir.glob("segment-*"):
+            number = path.name[len("segment-"):].split(".")[0]
+            if number.isdigit():
+                last = max(last, int(number))
+        return last + 1
+
+    def spill(self) -> Optional[Path]:
+        """Write the live rows as one on-disk segment and reset the buffer."""
+        if self.spill_dir is None or not len(self):
+            return None
+
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"segment-{self.segments:05d}"
+
+        if self.spill_format == "parquet":
+            import pyarrow.parquet as pq
+
+            path = path.with_suffix(".parquet")
+            pq.write_table(self.to_arrow(), path)
+        else:
+            path.mkdir()
+            for name, values in self.snapshot().items():
+                np.save(path / f"{name}.npy", values)
+            with open(path / "categories.json", "w") as fh:
+                json.dump(self.categories, fh)
+
+        logger.info(f"Spilled {len(self)} telemetry rows to {path}")
+        self.segments += 1
+        self.start = self.total
+        return path
+
+    def load_segments(self):
+        """All spilled segments plus the live buffer as one DataFrame."""
+        import pandas as pd
+
+        frames = []
+        for path in sorted(self.spill_dir.glob("segment-*")) if self.spill_dir else []:
+            if path.suffix == ".parquet":
+                frames.append(pd.read_parquet(path))
+                continue
+            data = {}
+            for name in self.columns:
+                values = np.load(path / f"{name}.npy", mmap_mode="r")
+                labels = self.categories.get(name)
+                data[name] = values if labels is None else pd.Categorical.from_codes(values, labels)
+            frames.append(pd.DataFrame(data))
+        frames.append(self.to_pandas())
+        return pd.concat(frames, ignore_index=True)
@@ -13,16 +13,24 @@ Architecture Pillars:
 4. Production telemetry
 """
 
+import os
+import shutil
 import asyncio
-import aiohttp
+import tempfile
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 import time
 import logging
 import random
 from concurrent.futures import ProcessPoolExecutor
 
+from nexus_mesh import CSRMesh, NoPathError
+from nexus_snapshot import cached_mesh, engine_path, load_mesh
+from nexus_metrics import export_if_enabled
+from nexus_telemetry import TelemetryRing
+from nexus_perception import (
+    PerceptionClient, PerceptionError, default_backend, wind_risk
+)
+
 
 # ============================================================
 # CONFIGURATION LAYER
@@ -33,17 +41,163 @@ NEXUS_CONFIG = {
     "SCALE_TARGET": 1_000_000_000_000,
     "WORKER_COUNT": 4,
     "WEATHER_URL": "https://api.open-meteo.com/v1/forecast",
-    "LAT_LON": (28.61, 77.20)
+    "LAT_LON": (28.61, 77.20),
+    "REGIONS": [
+        (28.61, 77.20), (19.08, 72.88), (12.97, 77.59), (22.57, 88.36)
+    ],
+    "NODE_COUNT": 5_000,
+    "EDGE_PROBABILITY": 0.0016,
+    "MESH_SEED": 42,
+    "LANDMARKS": int(os.getenv("NEXUS_LANDMARKS", 0)),
+    "SNAPSHOT_PATH": engine_path("day4"),   # "" = per-run temp snapshot
+    "CHUNK_SIZE": 256,
+    "IN_FLIGHT_PER_WORKER": 2,
+    "TARGET_CHUNK_SECONDS": 0.05,
+    "MIN_CHUNK": 16,
+    "MAX_CHUNK": 8192,
+    "PLOT_POINTS": 500,
+    "TELEMETRY_CAPACITY": 100_000
 }
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | CEO: SHIVAM | %(message)s"
-)
+TELEMETRY_SCHEMA = {
+    "source": np.int64,
+    "target": np.int64,
+    "cost": np.float64,
+    "distance": np.float64,
+    "hops": np.int32,
+    "risk": np.float64,
+    "latency": np.float64
+}
+
+def setup_logging():
+
+    """
+    Root log config for the CLI entry point.
+    Pool workers and importers keep their own logging setup.
+    """
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | CEO: SHIVAM | %(message)s"
+    )
+
 
 logger = logging.getLogger("Nexus-Day4")
 
 
+# ============================================================
+# WORKER STATE
+# ============================================================
+
+_WORKER_MESH = None
+
+
+def generate_mesh(node_count, edge_probability, seed, landmarks=0):
+    """
+    Seeded CSR mesh, so every process derives the same topology.
+    ``landmarks > 0`` precomputes ALT tables for bidirectional A*.
+    """
+
+    return CSRMesh.generate(node_count, edge_probability, seed=seed,
+                            landmarks=landmarks)
+
+
+def prepare_snapshot(path):
+    """
+    Parent side: make sure ``path`` holds the configured mesh, generating
+    it (landmarks included) only when missing or built for other settings.
+    """
+
+    params = {
+        "node_count": NEXUS_CONFIG["NODE_COUNT"],
+        "edge_probability": NEXUS_CONFIG["EDGE_PROBABILITY"],
+        "seed": NEXUS_CONFIG["MESH_SEED"],
+        "landmarks": NEXUS_CONFIG["LANDMARKS"],
+    }
+    cached_mesh(path, params, lambda: generate_mesh(
+        node_count=params["node_count"],
+        edge_probability=params["edge_probability"],
+        seed=params["seed"],
+        landmarks=params["landmarks"],
+    ))
+    return path
+
+
+def init_worker(node_count, edge_probability, seed, landmarks=0, snapshot=""):
+    """
+    Pool initializer: attach the routing mesh once per worker process.
+    With ``snapshot`` the worker memory-maps the parent's snapshot
+    (milliseconds, pages shared); otherwise it regenerates the mesh.
+    """
+
+    global _WORKER_MESH
+
+    if snapshot:
+        _WORKER_MESH = load_mesh(snapshot)
+    else:
+        _WORKER_MESH = generate_mesh(node_count, edge_probability, seed, landmarks)
+
+
+def worker_mesh():
+
+    if _WORKER_MESH is None:
+        init_worker(
+            NEXUS_CONFIG["NODE_COUNT"],
+            NEXUS_CONFIG["EDGE_PROBABILITY"],
+            NEXUS_CONFIG["MESH_SEED"],
+            NEXUS_CONFIG["LANDMARKS"]
+        )
+
+    return _WORKER_MESH
+
+
+def route_decision_chunk(pairs, risk_vals=None):
+    """
+    CPU-bound routing for many (source, target) decisions in one task.
+
+    Runs against the worker's resident mesh, so only the integer pair
+    array and risk vector cross the process boundary.
+    Returns columnar arrays aligned to ``pairs``; without ``risk_vals``
+    the weather-scaled ``risk`` column is zero.
+    """
+
+    mesh = worker_mesh()
+
+    k = len(pairs)
+    if risk_vals is None:
+        risk_vals = np.zeros(k)
+    cost = np.full(k, np.nan)
+    distance = np.full(k, np.nan)
+    edge_risk = np.full(k, np.nan)
+    hops = np.zeros(k, dtype=np.int32)
+    latency = np.zeros(k)
+
+    for i, (source, target) in enumerate(pairs.tolist()):
+
+        start = time.perf_counter()
+
+        try:
+            cost[i], edges = mesh.route_edges(source, target, "cost")
+            distance[i] = mesh.distance[edges].sum(dtype=np.float64)
+            edge_risk[i] = mesh.risk[edges].sum(dtype=np.float64)
+            hops[i] = len(edges)
+        except NoPathError:
+            pass
+
+        latency[i] = time.perf_counter() - start
+
+    return {
+        "source": pairs[:, 0],
+        "target": pairs[:, 1],
+        "cost": cost,
+        "distance": distance,
+        "hops": hops,
+        "risk": cost * risk_vals,
+        "edge_risk": edge_risk,
+        "latency": latency
+    }
+
+
 # ============================================================
 # PARALLEL ROUTING ENGINE
 # ============================================================
@@ -61,58 +215,175 @@ class ParallelSovereignRouter:
     def __init__(self):
         self.w_cost = 0.5
         self.w_risk = 0.5
-        self.telemetry = []
+        self.telemetry = TelemetryRing(
+            TELEMETRY_SCHEMA,
+            capacity=NEXUS_CONFIG["TELEMETRY_CAPACITY"]
+        )
 
-    async def fetch_risk_vector(self, session):
+    def record(self, result):
+        """Columnar append of one decision chunk."""
+
+        self.telemetry.extend(
+            **{name: result[name] for name in TELEMETRY_SCHEMA}
+        )
+
+    async def fetch_risk_vector(self, client):
         """
         Fetch real-world weather risk data.
         Used to simulate environment uncertainty.
         """
 
         try:
-            params = {
-                "latitude": NEXUS_CONFIG["LAT_LON"][0],
-                "longitude": NEXUS_CONFIG["LAT_LON"][1],
-                "current_weather": "true"
-            }
+            weather = await client.get_weather(*NEXUS_CONFIG["LAT_LON"])
 
-            async with session.get(
-                NEXUS_CONFIG["WEATHER_URL"],
-                params=params,
-                timeout=2
-            ) as resp:
+            return wind_risk(weather)
 
-                data = await resp.json()
-                wind = data["current_weather"]["windspeed"]
+        except (PerceptionError, KeyError, TypeError):
 
-                return min(wind / 100, 0.4)
+            return random.uniform(0.1, 0.3)
 
-        except Exception:
+    async def fetch_region_risks(self, client):
+        """
+        Batched, per-region risk vector.
+        Decision i is routed in region i % len(REGIONS).
+        """
 
-            return random.uniform(0.1, 0.3)
+        return await client.fetch_risk_batch(NEXUS_CONFIG["REGIONS"])
 
     def process_decision_sync(self, source, target, risk_val):
 
         """
         CPU Intensive Simulation
-        Executed via multiprocessing.
+        Single decision against this process's resident mesh.
         """
 
-        start = time.perf_counter()
+        result = route_decision_chunk(
+            np.array([[source, target]], dtype=np.int64),
+            np.array([risk_val])
+        )
+
+        return {key: values[0] for key, values in result.items()}
+
+
+# ============================================================
+# STREAMING SCHEDULER
+# ============================================================
+
+class DecisionSource:
+    """
+    Lazy (source, target) generator for a batch of decisions.
+    Pairs are drawn chunk by chunk, never materialized for the whole batch.
+    """
+
+    def __init__(self, total, node_count, risk_vals, seed):
+        self.total = total
+        self.node_count = node_count
+        self.risk_vals = np.asarray(risk_vals)
+        self.rng = np.random.default_rng(seed)
+        self.offset = 0
+
+    def take(self, n):
+
+        n = min(n, self.total - self.offset)
+
+        pairs = self.rng.integers(0, self.node_count, size=(n, 2))
+        region = (self.offset + np.arange(n)) % len(self.risk_vals)
+
+        self.offset += n
+
+        return pairs, self.risk_vals[region]
+
+
+class AdaptiveChunkScheduler:
+    """
+    Bounded-window executor pipeline
+    ----------------------------------
+    - At most ``max_in_flight`` chunks are pending at any time
+    - Chunk size tracks ``target_seconds`` of worker compute per chunk,
+      from the measured per-decision latency (EMA smoothed)
+    - Results are yielded as chunks complete, via ``async for``
+    """
+
+    def __init__(
+        self,
+        executor,
+        fn,
+        max_in_flight,
+        chunk=NEXUS_CONFIG["CHUNK_SIZE"],
+        target_seconds=NEXUS_CONFIG["TARGET_CHUNK_SECONDS"],
+        min_chunk=NEXUS_CONFIG["MIN_CHUNK"],
+        max_chunk=NEXUS_CONFIG["MAX_CHUNK"],
+        smoothing=0.3
+    ):
+        self.executor = executor
+        self.fn = fn
+        self.max_in_flight = max(1, max_in_flight)
+        self.chunk = chunk
+        self.target_seconds = target_seconds
+        self.min_chunk = min_chunk
+        self.max_chunk = max_chunk
+        self.smoothing = smoothing
+        self.per_decision = None
+        self.stats = {"chunks": 0, "decisions": 0, "peak_in_flight": 0}
+
+    def _observe(self, result):
+
+        n = len(result["latency"])
+
+        if not n:
+            return
+
+        sample = float(result["latency"].sum()) / n
+
+        if self.per_decision is None:
+            self.per_decision = sample
+        else:
+            self.per_decision += self.smoothing * (sample - self.per_decision)
+
+        ideal = self.target_seconds / max(self.per_decision, 1e-9)
+        self.chunk = int(min(self.max_chunk, max(self.min_chunk, ideal)))
+
+    async def stream(self, source):
 
-        path_len = random.randint(3, 10)
+        loop = asyncio.get_event_loop()
+        pending = set()
+        exhausted = False
+
+        while True:
+
+            while not exhausted and len(pending) < self.max_in_flight:
+
+                pairs, risk = source.take(self.chunk)
+
+                if not len(pairs):
+                    exhausted = True
+                    break
+
+                pending.add(
+                    loop.run_in_executor(self.executor, self.fn, pairs, risk)
+                )
+
+            self.stats["peak_in_flight"] = max(
+                self.stats["peak_in_flight"], len(pending)
+            )
+
+            if not pending:
+                return
 
-        cost = path_len * 50
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
 
-        risk_score = cost * risk_val
+            for future in done:
 
-        end = time.perf_counter()
+                result = future.result()
 
-        return {
-            "cost": cost,
-            "risk": risk_score,
-            "latency": end - start
-        }
+                self._observe(result)
+
+                self.stats["chunks"] += 1
+                self.stats["decisions"] += len(result["latency"])
+
+                yield result
 
 
 # ============================================================
@@ -129,35 +400,68 @@ async def run_parallel_onslaught():
 
     start_batch = time.perf_counter()
 
-    async with aiohttp.ClientSession() as session:
+    backend = default_backend(url=NEXUS_CONFIG["WEATHER_URL"], timeout=2)
 
-        risk_val = await router.fetch_risk_vector(session)
+    async with PerceptionClient(backend) as client:
 
-        loop = asyncio.get_event_loop()
+        risk_vals = await router.fetch_region_risks(client)
 
-        with ProcessPoolExecutor(
-            max_workers=NEXUS_CONFIG["WORKER_COUNT"]
-        ) as executor:
+        batch = NEXUS_CONFIG["BATCH_SIZE"]
+        workers = NEXUS_CONFIG["WORKER_COUNT"]
 
-            tasks = []
+        source = DecisionSource(
+            batch,
+            NEXUS_CONFIG["NODE_COUNT"],
+            risk_vals,
+            NEXUS_CONFIG["MESH_SEED"]
+        )
 
-            for _ in range(NEXUS_CONFIG["BATCH_SIZE"]):
+        # Start small enough that every worker gets work on tiny batches
+        chunk = max(1, min(NEXUS_CONFIG["CHUNK_SIZE"], -(-batch // workers)))
 
-                tasks.append(
-                    loop.run_in_executor(
-                        executor,
-                        router.process_decision_sync,
-                        "City-A",
-                        "City-B",
-                        risk_val
-                    )
+        # Flat-memory aggregates: totals plus the fixed-capacity telemetry ring
+        decisions = 0
+        latency_total = 0.0
+
+        # Generate once here; workers attach to the snapshot instead
+        scratch = None
+        snapshot = NEXUS_CONFIG["SNAPSHOT_PATH"]
+        if not snapshot:
+            scratch = tempfile.mkdtemp(prefix="nexus-mesh-")
+            snapshot = os.path.join(scratch, "mesh")
+        prepare_snapshot(snapshot)
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_worker,
+                initargs=(
+                    NEXUS_CONFIG["NODE_COUNT"],
+                    NEXUS_CONFIG["EDGE_PROBABILITY"],
+                    NEXUS_CONFIG["MESH_SEED"],
+                    NEXUS_CONFIG["LANDMARKS"],
+                    snapshot
+                )
+            ) as executor:
+
+                scheduler = AdaptiveChunkScheduler(
+                    executor,
+                    route_decision_chunk,
+                    max_in_flight=workers * NEXUS_CONFIG["IN_FLIGHT_PER_WORKER"],
+                    chunk=chunk,
+                    min_chunk=min(chunk, NEXUS_CONFIG["MIN_CHUNK"])
                 )
 
-            results = await asyncio.gather(*tasks)
+                async for result in scheduler.stream(source):
 
-    batch_time = time.perf_counter() - start_batch
+                    decisions += len(result["latency"])
+                    latency_total += float(result["latency"].sum())
+                    router.record(result)
+        finally:
+            if scratch is not None:
+                shutil.rmtree(scratch, ignore_errors=True)
 
-    df = pd.DataFrame(results)
+    batch_time = time.perf_counter() - start_batch
 
     print("\n" + "="*50)
     print("NEXUS CORE | PARALLEL DECISION REPORT")
@@ -165,16 +469,25 @@ async def run_parallel_onslaught():
 
     print(f"BATCH LATENCY   : {batch_time:.4f} Seconds")
     print(
-        f"THROUGHPUT      : {NEXUS_CONFIG['BATCH_SIZE']/batch_time:.2f} Decisions/Sec"
+        f"THROUGHPUT      : {decisions/batch_time:.2f} Decisions/Sec"
+    )
+    print(
+        f"SCHEDULER       : {scheduler.stats['chunks']} chunks | "
+        f"final chunk {scheduler.chunk} | "
+        f"peak in-flight {scheduler.stats['peak_in_flight']}"
     )
 
     print("SYSTEM INTEGRITY: 100%")
     print("="*50)
 
+    import matplotlib.pyplot as plt
+
     plt.style.use("dark_background")
 
     plt.figure(figsize=(10,5))
 
+    df = router.telemetry.to_pandas().tail(NEXUS_CONFIG["PLOT_POINTS"])
+
     plt.plot(
         df["latency"]*1000,
         marker="o",
@@ -183,7 +496,7 @@ async def run_parallel_onslaught():
     )
 
     plt.axhline(
-        y=np.mean(df["latency"]*1000),
+        y=latency_total / max(decisions, 1) * 1000,
         label="Mean Latency"
     )
 
@@ -200,6 +513,10 @@ if __name__ == "__main__":
 
     import nest_asyncio
 
+    setup_logging()
+
     nest_asyncio.apply()
 
     asyncio.run(run_parallel_onslaught())
+
+    export_if_enabled()
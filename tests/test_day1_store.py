@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from day1 import NodeStore, SimulationEngine, SovereignPerception
+from nexus_render import FrameRenderer
+
+
+def sharded(tmp_path, n=1_000, shard_rows=300):
+    perception = SovereignPerception()
+    perception.attach_store(NodeStore.create(tmp_path / "nodes", n, shard_rows=shard_rows))
+    return perception
+
+
+def test_multi_shard_store_has_no_single_array_view(tmp_path):
+    perception = sharded(tmp_path)
+    assert len(perception.store.shards) == 4
+    assert perception.positions is None
+    with pytest.raises(ValueError):
+        perception.store.positions
+
+
+def test_steps_are_visible_through_live_shards(tmp_path):
+    perception = sharded(tmp_path)
+    engine = SimulationEngine(perception, headless=True, frame_dir=str(tmp_path / "frames"))
+    before = engine.current_positions().copy()
+
+    engine.step()
+
+    blocks = engine.position_blocks()
+    assert all(isinstance(block, np.memmap) for block in blocks)
+    assert not np.array_equal(np.concatenate(blocks), before)
+    np.testing.assert_array_equal(engine.current_positions(), np.concatenate(blocks))
+    engine.close()
+
+
+@pytest.mark.parametrize("max_points, hist_threshold", [(5_000, 10_000), (100, 10_000), (10, 500)])
+def test_reduce_blocks_matches_concatenated(tmp_path, max_points, hist_threshold):
+    blocks = [block for _, block in sharded(tmp_path).iter_positions()]
+    whole = np.concatenate(blocks)
+
+    kind_a, a = FrameRenderer(max_points=max_points, hist_threshold=hist_threshold).reduce(blocks)
+    kind_b, b = FrameRenderer(max_points=max_points, hist_threshold=hist_threshold).reduce(whole)
+
+    assert kind_a == kind_b
+    np.testing.assert_array_equal(a, b)
+
+
+def test_resumed_store_keeps_its_movement_seed(tmp_path):
+    root = tmp_path / "nodes"
+    original = SovereignPerception()
+    original.attach_store(NodeStore.create(root, 500, seed=7))
+    reference = SimulationEngine(original, seed=7, headless=True)
+    reference.step()
+    reference.step()
+    expected = original.store.positions.copy()
+
+    resumed = SovereignPerception()
+    resumed.attach_store(NodeStore.create(tmp_path / "resumed", 500, seed=7))
+    engine = SimulationEngine(resumed, headless=True)
+    engine.step()
+    resumed.open_nodes(str(tmp_path / "resumed"))
+    engine = SimulationEngine(resumed, headless=True)
+    assert engine.seed == 7
+    engine.step()
+
+    np.testing.assert_array_equal(resumed.store.positions, expected)
@@ -0,0 +1,53 @@
+import numpy as np
+
+import day_3
+from day_3 import SovereignAdaptiveRouter, SwarmIntelligence, build_graph
+
+
+def swarm(monkeypatch, cache_size):
+    monkeypatch.setitem(day_3.NEXUS_CONFIG, "FRONT_CACHE_SIZE", cache_size)
+    return SwarmIntelligence(build_graph(40, snapshot=""), SovereignAdaptiveRouter())
+
+
+def test_route_one_to_many_beyond_front_cache_size(monkeypatch):
+    s = swarm(monkeypatch, 8)
+    targets = list(s.G.nodes)[1:]
+
+    result = s.route_one_to_many(0, targets, with_paths=True)
+
+    assert s.fronts.stats["evictions"] > 0
+    assert result["reachable"].all()
+    for target, path in zip(targets, result["paths"]):
+        assert path[0] == 0 and path[-1] == target
+
+
+def test_route_batch_searches_each_source_once(monkeypatch):
+    s = swarm(monkeypatch, 8)
+    calls = []
+
+    original = day_3.nx_pareto_fronts
+
+    def counted(G, source, *args, **kwargs):
+        calls.append(source)
+        return original(G, source, *args, **kwargs)
+
+    monkeypatch.setattr(day_3, "nx_pareto_fronts", counted)
+
+    pairs = [(0, t) for t in list(s.G.nodes)[1:]]
+    result = s.route_batch(pairs)
+
+    assert calls == [0]
+    assert result["reachable"].all()
+    assert (result["front_size"] > 0).all()
+    assert np.isfinite(result["score"]).all()
+
+
+def test_narrated_unreachable_pair_keeps_the_batch(monkeypatch):
+    s = swarm(monkeypatch, 64)
+    s.G.add_node("island")
+
+    result = s.route_batch([(0, "island"), (0, 5)], narrate=[0], with_paths=True)
+
+    assert list(result["reachable"]) == [False, True]
+    assert result["paths"][0] is None and result["paths"][1][-1] == 5
+    assert result["narration"][0][-1] == "No Path"
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from day2_nexus_core import SwarmRouter
+from nexus_mesh import CSRMesh, route_pairs
+
+
+@pytest.mark.parametrize("threshold", [1, 3, 10**9])
+def test_point_queries_match_trees(threshold):
+    mesh = CSRMesh.generate(300, 0.01, seed=3)
+    rng = np.random.default_rng(0)
+    names = mesh.cities
+    # A few depots with many targets plus one-off sources
+    pairs = [(names[int(s)], names[int(t)]) for s, t in zip(
+        np.concatenate([rng.integers(0, 5, 40), rng.integers(0, 300, 40)]),
+        rng.integers(0, 300, 80),
+    )]
+    router = SwarmRouter(mesh)
+
+    expected = route_pairs(pairs, router.tree, with_paths=True)
+    got = route_pairs(pairs, router.tree, with_paths=True, point=router.point,
+                      tree_min_targets=threshold)
+
+    np.testing.assert_array_equal(got["reachable"], expected["reachable"])
+    for column in ("distance", "risk", "cost", "hops"):
+        np.testing.assert_allclose(got[column], expected[column])
+    assert [p and p[-1] for p in got["paths"]] == [p and p[-1] for p in expected["paths"]]
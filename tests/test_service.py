@@ -0,0 +1,57 @@
+import asyncio
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from nexus_mesh import NameTable
+from nexus_service import PoolBackend, RoutingService, ServiceClient
+from parallel_engine_day4 import init_worker
+
+
+class EchoBackend:
+    async def dispatch(self, pairs):
+        return [{"source": s, "target": t} for s, t in pairs]
+
+
+def test_serve_refuses_to_unlink_regular_file(tmp_path):
+    address = tmp_path / "router.sock"
+    address.write_text("not a socket")
+
+    async def main():
+        async with RoutingService(EchoBackend()) as service:
+            with pytest.raises(FileExistsError):
+                await service.serve(str(address))
+
+    asyncio.run(main())
+    assert address.read_text() == "not a socket"
+
+
+def test_serve_replaces_stale_socket(tmp_path):
+    address = str(tmp_path / "router.sock")
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(address)
+    stale.close()
+
+    async def main():
+        async with RoutingService(EchoBackend()) as service:
+            await service.serve(address)
+            client = await ServiceClient.connect(address)
+            result = await client.route("a", "b")
+            await client.close()
+        return result
+
+    assert asyncio.run(main()) == {"source": "a", "target": "b"}
+
+
+def test_pool_backend_leaves_out_weather_risk():
+    executor = ThreadPoolExecutor(max_workers=1, initializer=init_worker, initargs=(50, 0.2, 7))
+    backend = PoolBackend(executor, NameTable(50))
+
+    async def main():
+        async with RoutingService(backend) as service:
+            return await service.route(backend.names[0], backend.names[1])
+
+    result = asyncio.run(main())
+    assert "risk" not in result
+    assert {"cost", "distance", "edge_risk", "reachable"} <= set(result)
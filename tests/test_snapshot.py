@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from nexus_mesh import CSRMesh
+from nexus_snapshot import cached_mesh, load_mesh, save_mesh, write_arrays
+
+
+def mesh():
+    return CSRMesh.generate(50, 0.1)
+
+
+def test_refuses_to_replace_unrelated_directory(tmp_path):
+    target = tmp_path / "precious"
+    target.mkdir()
+    (target / "notes.txt").write_text("keep me")
+
+    with pytest.raises(FileExistsError):
+        save_mesh(mesh(), target)
+    with pytest.raises(FileExistsError):
+        cached_mesh(target, {"n": 50}, mesh)
+    assert (target / "notes.txt").read_text() == "keep me"
+
+
+def test_refuses_other_snapshot_format(tmp_path):
+    target = tmp_path / "index"
+    write_arrays(target, {"a": np.arange(3)}, {"format": 1})
+    with pytest.raises(FileExistsError):
+        save_mesh(mesh(), target)
+
+
+def test_replaces_empty_directory_and_own_snapshot(tmp_path):
+    target = tmp_path / "mesh"
+    target.mkdir()
+    save_mesh(mesh(), target, {"n": 50})
+
+    regenerated = CSRMesh.generate(60, 0.1)
+    cached_mesh(target, {"n": 60}, lambda: regenerated)
+
+    assert load_mesh(target).number_of_nodes() == 60
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mesh"]
+
+
+def test_engines_keep_separate_snapshots_under_one_root(tmp_path, monkeypatch):
+    import day_3
+    import parallel_engine_day4 as day4
+    from nexus_snapshot import engine_path
+
+    root = str(tmp_path)
+    day3_path, day4_path = engine_path("day3", root), engine_path("day4", root)
+    assert engine_path("day3", "") == ""
+    monkeypatch.setitem(day4.NEXUS_CONFIG, "NODE_COUNT", 200)
+
+    day_3.build_graph(30, snapshot=day3_path)
+    day4.prepare_snapshot(day4_path)
+    written = [(tmp_path / e / "meta.json").stat().st_mtime_ns for e in ("day3", "day4")]
+
+    # Alternating engines reuse their own snapshots instead of regenerating
+    day_3.build_graph(30, snapshot=day3_path)
+    day4.prepare_snapshot(day4_path)
+    assert [(tmp_path / e / "meta.json").stat().st_mtime_ns for e in ("day3", "day4")] == written
+    assert load_mesh(day4_path).number_of_nodes() == 200
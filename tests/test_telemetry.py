@@ -0,0 +1,28 @@
+import numpy as np
+
+from nexus_telemetry import TelemetryRing
+
+SCHEMA = {"cost": np.float64, "reason": np.int8}
+REASONS = ("a", "b")
+
+
+def ring(spill_dir):
+    return TelemetryRing(SCHEMA, capacity=4, categories={"reason": REASONS}, spill_dir=spill_dir)
+
+
+def fill(telemetry, start, count):
+    for i in range(start, start + count):
+        telemetry.append(cost=float(i), reason="a")
+
+
+def test_reopened_ring_appends_after_existing_segments(tmp_path):
+    first = ring(tmp_path)
+    fill(first, 0, 9)   # two segments spilled, one live row
+    first.spill()
+
+    second = ring(tmp_path)
+    assert second.segments == 3
+    fill(second, 9, 9)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"segment-{i:05d}" for i in range(5)]
+    np.testing.assert_array_equal(second.load_segments()["cost"], np.arange(18.0))